@@ -17,59 +17,73 @@ Repository: https://github.com/shrimpy8
 """
 
 # Import necessary libraries and modules
-from dotenv import load_dotenv
+from dotenv import find_dotenv, load_dotenv, set_key
 import os
-import gradio as gr
+import re
+import queue
+import atexit
+import asyncio
+import threading
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import traceback
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, AsyncIterator, TYPE_CHECKING
 
 # Import utilities
 from utils import (
-    load_config,
     retry_api_call,
     safe_api_call,
     init_global_rate_limiter,
     rate_limited
 )
 
-# Import redactor module
-from redactor import SensitiveInformationRedactor
+# The redactor (OpenAI SDK) and gradio are imported lazily where they are
+# first needed, so importing this module for non-UI use stays cheap
+if TYPE_CHECKING:
+    from redactor import SensitiveInformationRedactor
 
-# Load configuration
-config = load_config()
+# Settings snapshot, resolved once from config.yaml
+from settings import SETTINGS, AppSettings
 
 # Configure logging with rotation
-logging_config = config.get_logging_config()
+logging_settings = SETTINGS.logging
 logger = logging.getLogger(__name__)
 
 # Clear any existing handlers to avoid duplicates
 if logger.hasHandlers():
     logger.handlers.clear()
 
-logger.setLevel(getattr(logging, logging_config['level']))
+# Level is resolved once in SETTINGS; handlers stay at NOTSET and defer to the logger
+logger.setLevel(logging_settings.level)
 
 # Create formatters
-formatter = logging.Formatter(logging_config['format'])
+formatter = logging.Formatter(logging_settings.format)
+log_handlers: List[logging.Handler] = []
 
 # Console handler
-if logging_config['console']:
+if logging_settings.console:
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(getattr(logging, logging_config['level']))
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    log_handlers.append(console_handler)
 
 # File handler with rotation
-if logging_config['file_logging']:
+if logging_settings.file_logging:
     file_handler = RotatingFileHandler(
-        logging_config['file'],
-        maxBytes=logging_config['max_bytes'],
-        backupCount=logging_config['backup_count']
+        logging_settings.file,
+        maxBytes=logging_settings.max_bytes,
+        backupCount=logging_settings.backup_count
     )
-    file_handler.setLevel(getattr(logging, logging_config['level']))
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    log_handlers.append(file_handler)
+
+# Request handlers only enqueue records; a background listener thread does
+# the console and file I/O so logging never blocks on the log file lock
+if log_handlers:
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    log_listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+    log_listener.start()
+    atexit.register(log_listener.stop)
 
 # Prevent propagation to root logger
 logger.propagate = False
@@ -87,20 +101,172 @@ openai_api_key = os.getenv("OPENAI_API_KEY", "")
 if not openai_api_key:
     logger.warning("OpenAI API key not found in environment variables. Some functionality may be limited.")
 
-# Initialize rate limiting if enabled
-if config.is_rate_limiting_enabled():
-    init_global_rate_limiter(
-        max_requests_per_minute=config.get_max_requests_per_minute(),
-        max_tokens_per_minute=config.get_max_tokens_per_minute()
-    )
-    logger.info("Rate limiting initialized")
+# Initialize rate limiting; a disabled limiter passes every call straight through
+init_global_rate_limiter(
+    max_requests_per_minute=SETTINGS.max_requests_per_minute,
+    max_tokens_per_minute=SETTINGS.max_tokens_per_minute,
+    enabled=SETTINGS.rate_limiting_enabled
+)
+logger.info(f"Rate limiting initialized ({'enabled' if SETTINGS.rate_limiting_enabled else 'disabled'})")
 
-# Get category configuration from config
-CATEGORY_OPTIONS = config.get_category_options()
-CATEGORY_MAP = config.get_category_map()
+# Get category configuration from settings
+CATEGORY_OPTIONS: Tuple[str, ...] = SETTINGS.category_options
+CATEGORY_MAP = SETTINGS.category_map
+
+# Initial checkbox selection, resolved once (Gradio requires a list for value=)
+DEFAULT_CATEGORIES: List[str] = list(CATEGORY_OPTIONS) if SETTINGS.category_default_all else []
 
 logger.info(f"Loaded {len(CATEGORY_OPTIONS)} redaction categories from configuration")
 
+# UI status and error messages
+STATUS_REDACTING = "Redacting..."
+STATUS_PROCESSED = "Processed text and found {count} sensitive items."
+STATUS_BATCH_PROCESSED = "Processed {documents} documents and found {count} sensitive items."
+STATUS_NO_TEXT = "Please enter some text to redact."
+STATUS_NO_CATEGORIES = "Please select at least one category."
+ERROR_GENERIC = "An error occurred"
+ERROR_WITH_DETAIL = "An error occurred: {error}"
+ERROR_STATUS_WITH_DETAIL = "Error: {error}"
+ERROR_ENV_WRITE = "Failed to update .env file: {error}"
+
+# Shared redactor; created once and reused by every interface build
+_redactor: Optional['SensitiveInformationRedactor'] = None
+
+
+def get_redactor() -> 'SensitiveInformationRedactor':
+    """
+    Get the shared redactor instance, creating it on first use.
+
+    The redactor owns the model clients and their HTTP connection pools, so
+    rebuilding the interface (reloads, tests) reuses them instead of
+    reconnecting.
+
+    Returns:
+        Shared SensitiveInformationRedactor instance
+
+    Raises:
+        Exception: If model initialization fails
+    """
+    global _redactor
+    if _redactor is None:
+        from redactor import SensitiveInformationRedactor
+        _redactor = SensitiveInformationRedactor(openai_api_key=openai_api_key)
+        atexit.register(_redactor.close)
+    return _redactor
+
+
+# Environment file updated from the OpenAI Config tab
+ENV_FILE = ".env"
+
+# Serializes .env rewrites from concurrent API key updates
+_env_file_lock = threading.Lock()
+
+
+def save_api_key_to_env(api_key: str, env_path: Optional[str] = None) -> None:
+    """
+    Persist the OpenAI API key to the .env file.
+
+    Uses python-dotenv's set_key, which rewrites the file through a temporary
+    file and preserves any other variables already defined in it.
+
+    Args:
+        api_key: New OpenAI API key
+        env_path: Path of the .env file (uses the nearest existing .env from the
+            working directory, or ENV_FILE if there is none, when None)
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    if env_path is None:
+        env_path = find_dotenv(usecwd=True) or ENV_FILE
+
+    with _env_file_lock:
+        set_key(env_path, "OPENAI_API_KEY", api_key, quote_mode="never")
+
+
+# Documents in the Batch Redaction tab are separated by a line containing only this marker
+BATCH_DELIMITER = "---"
+BATCH_SPLIT_PATTERN = re.compile(rf"^\s*{re.escape(BATCH_DELIMITER)}\s*$", re.MULTILINE)
+
+
+# Help & About tab content, built once from the settings snapshot
+CATEGORY_BULLETS = "\n".join(f"- **{cat}**" for cat in CATEGORY_OPTIONS)
+
+HELP_MARKDOWN = f"""
+# {SETTINGS.ui_title}
+
+{SETTINGS.ui_description}
+
+## Features
+
+- **{len(CATEGORY_OPTIONS)} Redaction Categories**: Email, phone, SSN, credit cards, addresses, and more
+- **Production-Ready**: Comprehensive error handling, retry logic, rate limiting
+- **Configuration Management**: Customize via config.yaml without code changes
+- **OpenAI Integration**: Optional processing of redacted text with OpenAI
+
+## How to Use
+
+### 1. Redaction Tool Tab
+
+- **Enter Text**: Paste or type the text you want to analyze in the input box
+- **Select Categories**: Choose which types of sensitive information to detect
+- **Click "Redact Information"**: Process the text to identify and redact sensitive data; the redacted text streams in as the model generates it
+- **Review Output**:
+  - **JSON Output**: Detailed information about detected sensitive data
+  - **Redacted Text**: Your original text with sensitive information replaced by placeholders
+- **Submit to OpenAI** (optional): Process the redacted text with OpenAI; the response streams in as it is generated
+
+### 2. Batch Redaction Tab
+
+- **Enter Documents**: Paste several documents separated by a line containing only `---`
+- **Select Categories**: Choose which types of sensitive information to detect
+- **Click "Redact Batch"**: Documents are processed concurrently
+- **Review Output**: Each document's results are listed in input order
+
+### 3. OpenAI Config Tab
+
+- Enter your OpenAI API key
+- Click "Update API Key" to save the key
+- The key is stored in your local .env file
+
+## Redaction Categories
+
+{CATEGORY_BULLETS}
+
+## Troubleshooting
+
+- **JSON Parsing Errors**: The model may have returned invalid JSON. Try again or simplify your input.
+- **OpenAI Processing Fails**: Check your API key in the OpenAI Config tab
+- **Rate Limiting**: If you see delays, rate limiting is protecting your API quota
+- **Other Issues**: Check the application logs in `{logging_settings.file}`
+
+## Configuration
+
+All settings can be customized in `config.yaml`:
+- Model names and parameters
+- Retry logic settings
+- Rate limiting thresholds
+- Logging configuration
+- UI customization
+- Feature flags
+
+## Security & Privacy
+
+- All processing happens locally with your Ollama installation
+- OpenAI processing is optional and requires explicit API key configuration
+- Sensitive data logging is disabled by default
+- Error messages are sanitized to prevent information leakage
+- Rate limiting prevents API quota exhaustion
+
+## Version & Info
+
+- **Ollama Model**: {SETTINGS.ollama_model_name}
+- **OpenAI Model**: {SETTINGS.openai_model_name}
+- **Rate Limiting**: {'Enabled' if SETTINGS.rate_limiting_enabled else 'Disabled'}
+- **Log File**: {logging_settings.file}
+- **Configuration**: config.yaml
+"""
+
 
 def build_gradio_interface():
     """
@@ -108,6 +274,7 @@ def build_gradio_interface():
 
     Creates a multi-tab interface with:
     - Redaction Tool tab for detecting and redacting sensitive information
+    - Batch Redaction tab for redacting several documents at once (if enabled)
     - OpenAI Config tab for managing API keys
     - Help & About tab for documentation
 
@@ -117,35 +284,33 @@ def build_gradio_interface():
     Raises:
         Exception: If UI creation fails (logged and re-raised)
     """
-    # Create redactor instance with OpenAI API key
-    redactor = SensitiveInformationRedactor(openai_api_key=openai_api_key)
+    import gradio as gr
 
-    # Get UI configuration
-    ui_config = config.get_input_text_config()
-    output_config = config.get_output_text_config()
+    # Shared redactor instance (initialized with the OpenAI API key on first use)
+    redactor = get_redactor()
 
     logger.info("Building Gradio interface")
 
     # Build Gradio interface
-    with gr.Blocks(title=config.get_ui_title()) as demo:
+    with gr.Blocks(title=SETTINGS.ui_title) as demo:
         # Main redaction tab
         with gr.Tab("Redaction Tool"):
-            gr.Markdown(f"# {config.get_ui_title()}")
-            gr.Markdown(f"*{config.get_ui_description()}*")
+            gr.Markdown(f"# {SETTINGS.ui_title}")
+            gr.Markdown(f"*{SETTINGS.ui_description}*")
 
             # Input area
             with gr.Row():
                 with gr.Column(scale=3):
                     input_text = gr.Textbox(
                         label="Input Text",
-                        placeholder=ui_config.get('placeholder', 'Enter text to analyze...'),
-                        lines=ui_config.get('lines', 10)
+                        placeholder=SETTINGS.input_placeholder,
+                        lines=SETTINGS.input_lines
                     )
                 with gr.Column(scale=1):
                     category_selection = gr.CheckboxGroup(
                         CATEGORY_OPTIONS,
                         label="Select Categories to Detect and Redact",
-                        value=CATEGORY_OPTIONS if config.get_category_selection_default_all() else []
+                        value=DEFAULT_CATEGORIES
                     )
 
             # Redaction button
@@ -159,7 +324,7 @@ def build_gradio_interface():
                     redacted_text_display = gr.Textbox(
                         label="Redacted Text",
                         placeholder="Redacted text will appear here...",
-                        lines=output_config.get('lines', 10)
+                        lines=SETTINGS.output_lines
                     )
 
             # OpenAI submission area (only if feature is enabled)
@@ -167,67 +332,175 @@ def build_gradio_interface():
             openai_response = gr.Textbox(
                 label="OpenAI Response",
                 placeholder="Response from OpenAI will appear here...",
-                lines=output_config.get('lines', 10)
+                lines=SETTINGS.output_lines
             )
             status_msg = gr.Textbox(label="Status", visible=True)
 
             # Define functions for button click events
-            def on_redact_click(text: str, categories: List[str]) -> Tuple[Dict, str, str]:
-                """Handler for redact button clicks."""
+            async def on_redact_click(text: str, categories: List[str]) -> AsyncIterator[Tuple[Dict, str, str]]:
+                """Handler for redact button clicks; streams the redacted text as it is generated."""
+                # Validation failures are expected; answer them before entering the try block
+                if not text:
+                    yield {"error": "No text provided"}, "", STATUS_NO_TEXT
+                    return
+                if not categories:
+                    yield {"error": "No categories selected"}, text, STATUS_NO_CATEGORIES
+                    return
+
+                log = logger  # local binding for the hot path
                 try:
-                    if not text:
-                        return {"error": "No text provided"}, "", "Please enter some text to redact."
-                    if not categories:
-                        return {"error": "No categories selected"}, text, "Please select at least one category."
-
-                    result, redacted = redactor.identify_sensitive_information(
+                    status = STATUS_REDACTING
+                    # Identical (text, categories) requests are served from the redactor's cache
+                    async for result, redacted in redactor.astream_sensitive_information(
                         text, categories, category_map=CATEGORY_MAP
-                    )
-                    detected_count = len(result.get('detected_sensitive_data', []))
-                    status = f"Processed text and found {detected_count} sensitive items."
-
-                    return result, redacted, status
+                    ):
+                        if result is None:
+                            # Leave the JSON output untouched until the full result is parsed,
+                            # and send the status only with the first partial update
+                            yield gr.skip(), redacted, status
+                            status = gr.skip()
+                        else:
+                            detected_count = len(result.get('detected_sensitive_data', []))
+                            yield result, redacted, STATUS_PROCESSED.format(count=detected_count)
 
                 except Exception as e:
-                    tb = traceback.format_exc()
-                    logger.error(f"Error in redaction process: {str(e)}\n{tb}")
+                    log.exception("Error in redaction process")
 
-                    if config.should_sanitize_error_messages():
-                        return {"error": "An error occurred"}, "", "An error occurred during redaction."
+                    if SETTINGS.sanitize_errors:
+                        yield {"error": ERROR_GENERIC}, "", "An error occurred during redaction."
                     else:
-                        return {"error": str(e)}, "", f"An error occurred: {str(e)}"
+                        yield {"error": str(e)}, "", ERROR_WITH_DETAIL.format(error=e)
 
-            def on_openai_submit(redacted_text: str) -> Tuple[str, str]:
-                """Handler for OpenAI submit button clicks."""
-                try:
-                    if not redacted_text:
-                        return "No text to process.", "Please redact some text first."
+            async def on_openai_submit(redacted_text: str) -> AsyncIterator[Tuple[str, str]]:
+                """Handler for OpenAI submit button clicks; streams the response as it arrives."""
+                if not redacted_text:
+                    yield "No text to process.", "Please redact some text first."
+                    return
 
-                    result = redactor.submit_to_openai(redacted_text)
-                    return result, "Processed with OpenAI."
+                log = logger  # local binding for the hot path
+                try:
+                    response = ""
+                    async for response in redactor.astream_openai(redacted_text):
+                        yield response, "Receiving response from OpenAI..."
+                    yield response, "Processed with OpenAI."
 
                 except Exception as e:
-                    tb = traceback.format_exc()
-                    logger.error(f"Error in OpenAI submission: {str(e)}\n{tb}")
+                    log.exception("Error in OpenAI submission")
 
-                    if config.should_sanitize_error_messages():
-                        return "An error occurred.", "Error during OpenAI processing."
+                    if SETTINGS.sanitize_errors:
+                        yield f"{ERROR_GENERIC}.", "Error during OpenAI processing."
                     else:
-                        return f"An error occurred: {str(e)}", f"Error: {str(e)}"
+                        yield ERROR_WITH_DETAIL.format(error=e), ERROR_STATUS_WITH_DETAIL.format(error=e)
 
-            # Connect button click events to handlers
+            # Connect button click events to handlers (async handlers run on the
+            # event loop, so concurrent sessions overlap their model calls)
             redact_button.click(
                 fn=on_redact_click,
                 inputs=[input_text, category_selection],
-                outputs=[redacted_output, redacted_text_display, status_msg]
+                outputs=[redacted_output, redacted_text_display, status_msg],
+                api_name="redact",
+                concurrency_limit=SETTINGS.concurrency_limit,
+                concurrency_id="redact",
+                show_progress="minimal"
             )
 
             submit_button.click(
                 fn=on_openai_submit,
                 inputs=[redacted_text_display],
-                outputs=[openai_response, status_msg]
+                outputs=[openai_response, status_msg],
+                api_name="submit_to_openai",
+                concurrency_limit=SETTINGS.openai_concurrency_limit,
+                concurrency_id="submit_to_openai",
+                show_progress="minimal"
             )
 
+        # Batch redaction tab (only if feature is enabled)
+        if SETTINGS.batch_processing_enabled:
+            with gr.Tab("Batch Redaction"):
+                gr.Markdown("## Batch Redaction")
+                gr.Markdown(
+                    "Redact several documents at once. Separate documents with a line "
+                    f"containing only `{BATCH_DELIMITER}`."
+                )
+
+                with gr.Row():
+                    with gr.Column(scale=3):
+                        batch_input = gr.Textbox(
+                            label="Input Documents",
+                            placeholder=f"First document...\n{BATCH_DELIMITER}\nSecond document...",
+                            lines=SETTINGS.input_lines
+                        )
+                    with gr.Column(scale=1):
+                        batch_category_selection = gr.CheckboxGroup(
+                            CATEGORY_OPTIONS,
+                            label="Select Categories to Detect and Redact",
+                            value=DEFAULT_CATEGORIES
+                        )
+
+                batch_redact_button = gr.Button("Redact Batch", variant="primary")
+
+                with gr.Row():
+                    with gr.Column():
+                        batch_output = gr.JSON(label="Detailed JSON Output")
+                    with gr.Column():
+                        batch_text_display = gr.Textbox(
+                            label="Redacted Documents",
+                            placeholder="Redacted documents will appear here...",
+                            lines=SETTINGS.output_lines
+                        )
+                batch_status = gr.Textbox(label="Status", visible=True)
+
+                async def on_batch_redact_click(batch_text: str, categories: List[str]) -> Tuple[List[Dict], str, str]:
+                    """Handler for batch redact button clicks."""
+                    texts = [text.strip() for text in BATCH_SPLIT_PATTERN.split(batch_text or "")]
+                    texts = [text for text in texts if text]
+                    if not texts:
+                        return [{"error": "No text provided"}], "", STATUS_NO_TEXT
+                    if not categories:
+                        return [{"error": "No categories selected"}], "", STATUS_NO_CATEGORIES
+
+                    try:
+                        if SETTINGS.batch_strategy == "combined":
+                            # Several documents per prompt, prompts sent concurrently
+                            results = await redactor.aidentify_sensitive_information_batch(
+                                texts, categories, category_map=CATEGORY_MAP
+                            )
+                        else:
+                            # One request per document, sent concurrently
+                            results = await redactor.aidentify_batch(
+                                texts, categories, category_map=CATEGORY_MAP
+                            )
+                        detected_count = sum(
+                            len(result.get('detected_sensitive_data', [])) for result, _ in results
+                        )
+                        status = STATUS_BATCH_PROCESSED.format(documents=len(texts), count=detected_count)
+
+                        json_output = [
+                            {"document": index, **result}
+                            for index, (result, _) in enumerate(results, start=1)
+                        ]
+                        redacted_documents = f"\n{BATCH_DELIMITER}\n".join(redacted for _, redacted in results)
+
+                        return json_output, redacted_documents, status
+
+                    except Exception as e:
+                        logger.exception("Error in batch redaction process")
+
+                        if SETTINGS.sanitize_errors:
+                            return [{"error": ERROR_GENERIC}], "", "An error occurred during batch redaction."
+                        else:
+                            return [{"error": str(e)}], "", ERROR_WITH_DETAIL.format(error=e)
+
+                batch_redact_button.click(
+                    fn=on_batch_redact_click,
+                    inputs=[batch_input, batch_category_selection],
+                    outputs=[batch_output, batch_text_display, batch_status],
+                    api_name="redact_batch",
+                    # Shares the single-text redaction budget, since both hit Ollama
+                    concurrency_limit=SETTINGS.concurrency_limit,
+                    concurrency_id="redact"
+                )
+
         # OpenAI Configuration Tab
         with gr.Tab("OpenAI Config"):
             gr.Markdown("## OpenAI API Configuration")
@@ -245,21 +518,20 @@ def build_gradio_interface():
                 placeholder="Update status will appear here..."
             )
 
-            def update_api_key(new_api_key: str) -> str:
+            async def update_api_key(new_api_key: str) -> str:
                 """Handler for API key update button clicks."""
                 try:
                     # Validate key is not empty
                     if not new_api_key:
                         return "API Key cannot be empty."
 
-                    # Write to .env file
+                    # Write to .env file off the event loop
                     try:
-                        with open(".env", "w") as f:
-                            f.write(f"OPENAI_API_KEY={new_api_key}\n")
+                        await asyncio.to_thread(save_api_key_to_env, new_api_key)
                         logger.info(".env file updated with new API key")
                     except Exception as e:
                         logger.error(f"Failed to write to .env file: {str(e)}")
-                        return f"Failed to update .env file: {str(e)}"
+                        return ERROR_ENV_WRITE.format(error=e)
 
                     # Update environment variable
                     os.environ["OPENAI_API_KEY"] = new_api_key
@@ -268,16 +540,18 @@ def build_gradio_interface():
                     if not redactor.update_openai_api_key(new_api_key):
                         return "API Key saved but failed to update model. Check logs for details."
 
+                    # Drop responses cached before the key change
+                    redactor.clear_cache()
+
                     return "API Key updated successfully."
 
                 except Exception as e:
-                    tb = traceback.format_exc()
-                    logger.error(f"Error updating API key: {str(e)}\n{tb}")
+                    logger.exception("Error updating API key")
 
-                    if config.should_sanitize_error_messages():
+                    if SETTINGS.sanitize_errors:
                         return "An error occurred while updating the API key."
                     else:
-                        return f"An error occurred: {str(e)}"
+                        return ERROR_WITH_DETAIL.format(error=e)
 
             update_button.click(
                 fn=update_api_key,
@@ -287,76 +561,37 @@ def build_gradio_interface():
 
         # Help & About tab
         with gr.Tab("Help & About"):
-            gr.Markdown(f"""
-            # {config.get_ui_title()}
-
-            {config.get_ui_description()}
+            gr.Markdown(HELP_MARKDOWN)
 
-            ## Features
-
-            - **{len(CATEGORY_OPTIONS)} Redaction Categories**: Email, phone, SSN, credit cards, addresses, and more
-            - **Production-Ready**: Comprehensive error handling, retry logic, rate limiting
-            - **Configuration Management**: Customize via config.yaml without code changes
-            - **OpenAI Integration**: Optional processing of redacted text with OpenAI
-
-            ## How to Use
-
-            ### 1. Redaction Tool Tab
-
-            - **Enter Text**: Paste or type the text you want to analyze in the input box
-            - **Select Categories**: Choose which types of sensitive information to detect
-            - **Click "Redact Information"**: Process the text to identify and redact sensitive data
-            - **Review Output**:
-              - **JSON Output**: Detailed information about detected sensitive data
-              - **Redacted Text**: Your original text with sensitive information replaced by placeholders
-            - **Submit to OpenAI** (optional): Process the redacted text with OpenAI
-
-            ### 2. OpenAI Config Tab
-
-            - Enter your OpenAI API key
-            - Click "Update API Key" to save the key
-            - The key is stored in your local .env file
-
-            ## Redaction Categories
-
-            {chr(10).join([f"- **{cat}**" for cat in CATEGORY_OPTIONS])}
-
-            ## Troubleshooting
-
-            - **JSON Parsing Errors**: The model may have returned invalid JSON. Try again or simplify your input.
-            - **OpenAI Processing Fails**: Check your API key in the OpenAI Config tab
-            - **Rate Limiting**: If you see delays, rate limiting is protecting your API quota
-            - **Other Issues**: Check the application logs in `{logging_config['file']}`
-
-            ## Configuration
-
-            All settings can be customized in `config.yaml`:
-            - Model names and parameters
-            - Retry logic settings
-            - Rate limiting thresholds
-            - Logging configuration
-            - UI customization
-            - Feature flags
+    logger.info("Gradio interface built successfully")
+    return demo
 
-            ## Security & Privacy
 
-            - All processing happens locally with your Ollama installation
-            - OpenAI processing is optional and requires explicit API key configuration
-            - Sensitive data logging is disabled by default
-            - Error messages are sanitized to prevent information leakage
-            - Rate limiting prevents API quota exhaustion
+def check_ollama_parallelism(settings: AppSettings) -> bool:
+    """
+    Warn if more redactions can run at once than Ollama serves in parallel.
 
-            ## Version & Info
+    Ollama processes OLLAMA_NUM_PARALLEL requests per model at a time and
+    queues the rest, so a higher concurrency limit only adds waiting
+    requests inside Ollama.
 
-            - **Ollama Model**: {config.get_ollama_model_name()}
-            - **OpenAI Model**: {config.get_openai_model_name()}
-            - **Rate Limiting**: {'Enabled' if config.is_rate_limiting_enabled() else 'Disabled'}
-            - **Log File**: {logging_config['file']}
-            - **Configuration**: config.yaml
-            """)
+    Args:
+        settings: Application settings
 
-    logger.info("Gradio interface built successfully")
-    return demo
+    Returns:
+        False if the concurrency limit exceeds the known server parallelism, True otherwise
+    """
+    num_parallel = settings.ollama_num_parallel
+    if num_parallel is None:
+        logger.info(f"Ollama parallelism unknown; set OLLAMA_NUM_PARALLEL to at least {settings.concurrency_limit}")
+        return True
+    if settings.concurrency_limit > num_parallel:
+        logger.warning(
+            f"performance.concurrency_limit ({settings.concurrency_limit}) exceeds Ollama's "
+            f"OLLAMA_NUM_PARALLEL ({num_parallel}); extra requests will queue inside Ollama"
+        )
+        return False
+    return True
 
 
 def main():
@@ -372,25 +607,35 @@ def main():
     try:
         logger.info("=" * 60)
         logger.info("Starting Ollama Guardrail Application")
-        logger.info(f"Ollama Model: {config.get_ollama_model_name()}")
-        logger.info(f"OpenAI Model: {config.get_openai_model_name()}")
-        logger.info(f"Rate Limiting: {'Enabled' if config.is_rate_limiting_enabled() else 'Disabled'}")
-        logger.info(f"Logging Level: {config.get_logging_config()['level']}")
+        logger.info(f"Ollama Model: {SETTINGS.ollama_model_name}")
+        logger.info(f"OpenAI Model: {SETTINGS.openai_model_name}")
+        logger.info(f"Rate Limiting: {'Enabled' if SETTINGS.rate_limiting_enabled else 'Disabled'}")
+        logger.info(f"Logging Level: {SETTINGS.logging.level_name}")
         logger.info(f"Categories: {len(CATEGORY_OPTIONS)}")
         logger.info("=" * 60)
+        check_ollama_parallelism(SETTINGS)
 
         # Build and launch Gradio interface
         demo = build_gradio_interface()
         logger.info("Gradio interface built successfully")
 
-        # Get server configuration
-        server_config = config.get_server_config()
+        # Load the Ollama model while the server starts, so the first
+        # redaction does not pay the model load time
+        if SETTINGS.ollama_warmup:
+            threading.Thread(target=get_redactor().warmup, name="ollama-warmup", daemon=True).start()
+
+        # Queue events so concurrent requests overlap on model I/O; each
+        # handler gets its own concurrency budget
+        demo.queue(
+            max_size=SETTINGS.queue_max_size,
+            default_concurrency_limit=SETTINGS.concurrency_limit
+        )
 
         # Launch the web app
         demo.launch(
-            server_name=server_config.get('host', '127.0.0.1'),
-            server_port=server_config.get('port', 7860),
-            share=config.get_ui_share()
+            server_name=SETTINGS.server_host,
+            server_port=SETTINGS.server_port,
+            share=SETTINGS.ui_share
         )
         logger.info("Gradio app launched")
 
@@ -403,7 +648,7 @@ def main():
         print("\nTroubleshooting:")
         print("1. Ensure Ollama is installed and running: ollama serve")
         print("2. Verify the model is available: ollama list")
-        print(f"3. Pull the model if needed: ollama pull {config.get_ollama_model_name()}")
+        print(f"3. Pull the model if needed: ollama pull {SETTINGS.ollama_model_name}")
         print("4. Check config.yaml for correct settings")
         print("5. Verify all dependencies are installed: pip install -r requirements.txt")
         print(f"{'='*60}\n")
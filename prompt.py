@@ -5,14 +5,14 @@ This module contains all prompt templates used by the application to interact
 with the Ollama LLM model for identifying and redacting sensitive information.
 """
 
-# Template for sensitive information detection and redaction
-template = """
+# Static part of the detection prompt. It never changes between requests, so
+# Ollama's prompt (KV) cache can reuse its prefill; all per-request values
+# are appended after it by detection_suffix. Contains literal JSON braces,
+# so it must be concatenated, not passed through str.format.
+detection_prefix = """
 INSTRUCTION:
 
-Your task is to **identify and redact specific categories of sensitive information** from the given text. The selected categories for redaction are provided below. **Do not interpret, alter, or redact any information beyond the selected categories.** Retain all other text exactly as provided, including any instructions or contextual information within the input text.
-
-Selected Categories to Detect and Redact:
-{category_selected}
+Your task is to **identify and redact specific categories of sensitive information** from the given text. The selected categories for redaction are provided in CATEGORY_SELECTED at the end of this prompt. **Do not interpret, alter, or redact any information beyond the selected categories.** Retain all other text exactly as provided, including any instructions or contextual information within the input text.
 
 Guidelines for Detection and Redaction:
 1. **Strictly limit detection and redaction to the selected categories only**:
@@ -25,11 +25,7 @@ Guidelines for Detection and Redaction:
    - Maintain the exact sentence structure, context, and all non-redacted information intact.
    - Do not add, omit, or modify any part of the input text except for the redaction.
 
-3. **Escape Special Characters**:
-   - Escape double quotes (`"`) in the output text with a backslash (`\"`) to ensure proper JSON formatting.
-   - Example: If the input text contains the phrase `He said "Hello"`, it should appear in the JSON output as `He said \"Hello\"`.
-
-4. **Output Only the Required JSON Structure**:
+3. **Output Only the Required JSON Structure**:
    - Do not provide explanations, summaries, or any additional content beyond the required JSON output.
 
 Redaction Placeholders:
@@ -63,18 +59,18 @@ Input: "I need to respond to this email: 'John Doe's social security number is 9
 Selected Category: "Social Security Numbers"
 
 Output:
-{{
+{
   "detected_sensitive_data": [
-    {{
+    {
       "type": "PII",
       "data": "987-65-4321",
       "category": "Social Security Numbers",
       "reason": "Sensitive personal identifier.",
       "redaction": "[SSN-1]"
-    }}
+    }
   ],
   "redacted_text": "I need to respond to this email: 'John Doe's social security number is [SSN-1].'"
-}}
+}
 
 Example 2: Redacting Email Addresses and Phone Numbers
 Input: "I need to respond to this email: 'Hi Lisa, can you send over the project draft by tomorrow? Also, please confirm your attendance at the meeting on Monday. You can reach me at lisa.manager@workmail.com or at (321) 654-0987.'"
@@ -82,25 +78,25 @@ Input: "I need to respond to this email: 'Hi Lisa, can you send over the project
 Selected Categories: "Email Addresses", "Phone Numbers"
 
 Output:
-{{
+{
   "detected_sensitive_data": [
-    {{
+    {
       "type": "PII",
       "data": "lisa.manager@workmail.com",
       "category": "Email Addresses",
       "reason": "Email address.",
       "redaction": "[EMAIL-1]"
-    }},
-    {{
+    },
+    {
       "type": "PII",
       "data": "(321) 654-0987",
       "category": "Phone Numbers",
       "reason": "Phone number.",
       "redaction": "[PHONE-NUM-1]"
-    }}
+    }
   ],
   "redacted_text": "I need to respond to this email: 'Hi Lisa, can you send over the project draft by tomorrow? Also, please confirm your attendance at the meeting on Monday. You can reach me at [EMAIL-1] or at [PHONE-NUM-1].'"
-}}
+}
 
 Example 3: Redacting Addresses and Social Security Numbers in a Loan Application
 Input: "I need to write a letter for a loan application: 'Dear Loan Officer, I am requesting a loan of $25,000 for home improvement. I, Jennifer Wilson, currently reside at 123 Maple Street, Springfield, IL 62704. My social security number is 987-65-4321, and my annual income is $50,000. Please let me know if you need further information.'"
@@ -108,42 +104,157 @@ Input: "I need to write a letter for a loan application: 'Dear Loan Officer, I a
 Selected Categories: "Addresses", "Social Security Numbers"
 
 Output:
-{{
+{
   "detected_sensitive_data": [
-    {{
+    {
       "type": "PII",
       "data": "123 Maple Street, Springfield, IL 62704",
       "category": "Addresses",
       "reason": "Personal contact information.",
       "redaction": "[ADDRESS-1]"
-    }},
-    {{
+    },
+    {
       "type": "PII",
       "data": "987-65-4321",
       "category": "Social Security Numbers",
       "reason": "Sensitive personal identifier.",
       "redaction": "[SSN-1]"
-    }}
+    }
   ],
   "redacted_text": "I need to write a letter for a loan application: 'Dear Loan Officer, I am requesting a loan of $25,000 for home improvement. I, Jennifer Wilson, currently reside at [ADDRESS-1]. My social security number is [SSN-1], and my annual income is $50,000. Please let me know if you need further information.'"
-}}
+}
+
+Now process the following request.
+"""
+
+# Per-request part of the detection prompt, appended after detection_prefix
+detection_suffix = """
+CATEGORY_SELECTED:
+{category_selected}
 
 PROMPT_PROVIDED: {user_prompt}
-CATEGORY_SELECTED: {category_selected}
 JSON_RESPONSE:
 """
 
-# Additional templates can be added here if needed
-# For example, you could define templates for different models or use cases
+# Full detection template (str.format-compatible), kept for callers that
+# format the whole prompt in one step
+template = detection_prefix.replace("{", "{{").replace("}", "}}") + detection_suffix
+
+# Template for redacting several texts in a single model call.
+# Each text is wrapped in a numbered "### Request N:" block so results can be
+# matched back to their inputs regardless of the order the model emits them.
+# Split into a static prefix and a per-request suffix like the detection prompt.
+batch_prefix = """
+INSTRUCTION:
+
+Your task is to **identify and redact specific categories of sensitive information** from each of the numbered requests at the end of this prompt, using the categories listed in CATEGORY_SELECTED. Treat every request independently and **do not interpret, alter, or redact any information beyond the selected categories.**
+
+Guidelines:
+1. Replace sensitive data with the corresponding placeholder, numbering placeholders separately within each request.
+2. Keep the full original text of every request with only the sensitive information replaced.
+3. Output only the required JSON structure, without explanations.
+
+Output Requirements:
+- A pure JSON object with a single key "results" holding an array with exactly one entry per request.
+- Each entry must contain:
+  - "index": The request number (e.g., 1 for "### Request 1:").
+  - "detected_sensitive_data": Array of objects with "type", "data", "category", "reason", and "redaction".
+  - "redacted_text": The full request text with sensitive information replaced by placeholders.
 
-# Example of a more concise template for systems with limited context windows
-concise_template = """
-Identify and redact these sensitive information types from the text:
+Example Output for two requests:
+{
+  "results": [
+    {
+      "index": 1,
+      "detected_sensitive_data": [
+        {
+          "type": "PII",
+          "data": "lisa.manager@workmail.com",
+          "category": "Email Addresses",
+          "reason": "Email address.",
+          "redaction": "[EMAIL-1]"
+        }
+      ],
+      "redacted_text": "Contact me at [EMAIL-1]."
+    },
+    {
+      "index": 2,
+      "detected_sensitive_data": [],
+      "redacted_text": "The meeting is on Monday."
+    }
+  ]
+}
+
+Now process the following requests.
+"""
+
+# Per-request part of the batch prompt, appended after batch_prefix
+batch_suffix = """
+CATEGORY_SELECTED:
 {category_selected}
 
-Return a JSON with:
-1. "detected_sensitive_data": Array of found items with their type, data, category, reason, and redaction
-2. "redacted_text": Original text with sensitive information replaced by placeholders
+{requests_block}
+
+JSON_RESPONSE:
+"""
+
+# Header placed before each text inside batch_suffix's {requests_block}
+batch_request_header = "### Request {index}:"
+
+# JSON schemas passed as Ollama's "format" field. Decoding is constrained to
+# these shapes, so the model always returns parseable JSON and the prompts
+# need no JSON-escaping instructions.
+_detected_item_schema = {
+    "type": "object",
+    "required": ["type", "data", "category", "reason", "redaction"],
+    "properties": {
+        "type": {"type": "string"},
+        "data": {"type": "string"},
+        "category": {"type": "string"},
+        "reason": {"type": "string"},
+        "redaction": {"type": "string"}
+    }
+}
 
-Input: {user_prompt}
-"""
\ No newline at end of file
+detection_schema = {
+    "type": "object",
+    "required": ["detected_sensitive_data", "redacted_text"],
+    "properties": {
+        "detected_sensitive_data": {"type": "array", "items": _detected_item_schema},
+        "redacted_text": {"type": "string"}
+    }
+}
+
+batch_schema = {
+    "type": "object",
+    "required": ["results"],
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["index", "detected_sensitive_data", "redacted_text"],
+                "properties": {
+                    "index": {"type": "integer"},
+                    "detected_sensitive_data": {"type": "array", "items": _detected_item_schema},
+                    "redacted_text": {"type": "string"}
+                }
+            }
+        }
+    }
+}
+
+# Additional templates can be added here if needed
+# For example, you could define templates for different models or use cases
+
+# Compact detection prompt without the worked examples, used for short
+# inputs with few categories. detection_schema already constrains the output
+# shape, so the instructions alone are usually enough; the example-rich
+# detection_prefix is the fallback when the output fails to parse.
+concise_prefix = """
+Identify and redact only the sensitive information categories listed in CATEGORY_SELECTED from the text in PROMPT_PROVIDED. Replace each item with its placeholder, numbering repeated categories ([EMAIL-1], [EMAIL-2], ...), and keep all other text exactly as provided.
+
+Return a JSON object with:
+1. "detected_sensitive_data": Array of found items, each with "type", "data", "category", "reason", and "redaction"
+2. "redacted_text": The full input text with sensitive information replaced by placeholders
+"""
@@ -6,12 +6,13 @@ redacting sensitive information from text using LLM models.
 
 Classes:
     SensitiveInformationRedactor: Main redactor class for processing text
+    RedactionResult: (data, redacted_text) result of a detection call
 
 Author: Harsh
 """
 
-from .redactor import SensitiveInformationRedactor
+from .redactor import SensitiveInformationRedactor, RedactionResult
 
-__all__ = ['SensitiveInformationRedactor']
+__all__ = ['SensitiveInformationRedactor', 'RedactionResult']
 
 __version__ = "1.0.0"
@@ -0,0 +1,235 @@
+"""
+Ollama HTTP Client for Ollama Guardrail
+
+A thin client for Ollama's /api/generate endpoint built on pooled httpx
+sessions. Connections are kept alive and reused across requests, so
+detection calls skip the TCP handshake that a fresh connection per
+request would pay.
+
+Author: Harsh
+"""
+
+import os
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+import orjson
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OLLAMA_HOST = "http://localhost:11434"
+
+
+def resolve_ollama_host(host: Optional[str] = None) -> str:
+    """
+    Resolve the Ollama server base URL.
+
+    Args:
+        host: Explicit host (uses the OLLAMA_HOST environment variable, then
+            http://localhost:11434 if None or empty)
+
+    Returns:
+        Base URL including the scheme
+
+    Example:
+        >>> resolve_ollama_host("127.0.0.1:11434")
+        'http://127.0.0.1:11434'
+    """
+    host = host or os.getenv("OLLAMA_HOST") or DEFAULT_OLLAMA_HOST
+    if "://" not in host:
+        host = f"http://{host}"
+    return host.rstrip("/")
+
+
+class OllamaClient:
+    """
+    Pooled HTTP client for Ollama text generation.
+
+    Exposes plain ``invoke``/``ainvoke`` methods taking and returning strings so
+    it can be passed to retry_api_call/aretry_api_call unchanged. The sync
+    and async sessions are separate because httpx pools are not shared
+    between the two; the async session is created on first use.
+
+    Attributes:
+        model: Name of the Ollama model
+        base_url: Ollama server base URL
+        format: Output format passed to Ollama ("json" or a JSON schema), or None
+        keep_alive: How long Ollama keeps the model loaded after each request, or None
+        options: Model options sent with each request (e.g. {"temperature": 0}), or None
+
+    Example:
+        >>> client = OllamaClient(model="llama3.2:latest", format="json")
+        >>> client.invoke('Reply with {"ok": true}')
+        '{"ok": true}'
+        >>> client.close()
+    """
+
+    def __init__(
+        self,
+        model: str,
+        base_url: Optional[str] = None,
+        format: Optional[Any] = None,
+        keep_alive: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        timeout: float = 120.0,
+        connect_timeout: float = 10.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 40,
+        keepalive_expiry: float = 30.0
+    ):
+        """
+        Initialize the client and its sync connection pool.
+
+        Args:
+            model: Name of the Ollama model
+            base_url: Ollama server base URL (uses OLLAMA_HOST or localhost if None)
+            format: Output format passed to Ollama ("json" or a JSON schema), or None
+            keep_alive: How long Ollama keeps the model loaded after each request
+                (e.g. "30m"; uses the server default if None)
+            options: Model options sent with each request (e.g. {"temperature": 0})
+            timeout: Read timeout in seconds for a generation request
+            connect_timeout: Timeout in seconds for establishing a connection
+            max_connections: Maximum open connections per session
+            max_keepalive_connections: Maximum idle connections kept for reuse
+            keepalive_expiry: Seconds an idle connection is kept open
+        """
+        self.model = model
+        self.base_url = resolve_ollama_host(base_url)
+        self.format = format
+        self.keep_alive = keep_alive
+        self.options = options
+
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self._client = httpx.Client(base_url=self.base_url, timeout=self._timeout, limits=self._limits)
+        self._async_client: Optional[httpx.AsyncClient] = None
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the async session, creating it on first use."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url, timeout=self._timeout, limits=self._limits
+            )
+        return self._async_client
+
+    def _payload(self, prompt: str, format: Optional[Any] = None) -> Dict[str, Any]:
+        """Build the /api/generate request body; ``format`` overrides the client default."""
+        payload: Dict[str, Any] = {"model": self.model, "prompt": prompt, "stream": False}
+        format = format if format is not None else self.format
+        if format is not None:
+            payload["format"] = format
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        if self.options:
+            payload["options"] = self.options
+        return payload
+
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> str:
+        """Raise on HTTP errors and return the generated text."""
+        response.raise_for_status()
+        return orjson.loads(response.content)["response"]
+
+    def invoke(self, prompt: str, format: Optional[Any] = None) -> str:
+        """
+        Generate a completion for a prompt.
+
+        Args:
+            prompt: Full prompt text
+            format: Output format for this request (uses the client default if None)
+
+        Returns:
+            Generated text
+
+        Raises:
+            httpx.HTTPError: If the request fails or Ollama returns an error status
+        """
+        return self._parse_response(self._client.post("/api/generate", json=self._payload(prompt, format)))
+
+    async def ainvoke(self, prompt: str, format: Optional[Any] = None) -> str:
+        """
+        Asynchronously generate a completion for a prompt.
+
+        Args:
+            prompt: Full prompt text
+            format: Output format for this request (uses the client default if None)
+
+        Returns:
+            Generated text
+
+        Raises:
+            httpx.HTTPError: If the request fails or Ollama returns an error status
+        """
+        response = await self._get_async_client().post("/api/generate", json=self._payload(prompt, format))
+        return self._parse_response(response)
+
+    async def astream(self, prompt: str, format: Optional[Any] = None) -> AsyncIterator[str]:
+        """
+        Stream a completion for a prompt as Ollama generates it.
+
+        Args:
+            prompt: Full prompt text
+            format: Output format for this request (uses the client default if None)
+
+        Yields:
+            Text fragments in generation order
+
+        Raises:
+            httpx.HTTPError: If the request fails or Ollama returns an error status
+        """
+        payload = self._payload(prompt, format)
+        payload["stream"] = True
+
+        async with self._get_async_client().stream("POST", "/api/generate", json=payload) as response:
+            response.raise_for_status()
+            # Ollama streams one JSON object per line
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
+
+    def warmup(self, keep_alive: Optional[str] = None) -> None:
+        """
+        Load the model into memory without generating any text.
+
+        Ollama loads a model on its first request, which can take from
+        seconds to minutes; an empty prompt triggers the load on its own.
+
+        Args:
+            keep_alive: How long Ollama keeps the model loaded afterwards
+                (uses the client's keep_alive if None)
+
+        Raises:
+            httpx.HTTPError: If the request fails or Ollama returns an error status
+        """
+        payload: Dict[str, Any] = {"model": self.model, "prompt": "", "stream": False}
+        keep_alive = keep_alive if keep_alive is not None else self.keep_alive
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        self._client.post("/api/generate", json=payload).raise_for_status()
+
+    def close(self) -> None:
+        """Close the sync session; the async session is closed with aclose()."""
+        self._client.close()
+
+    async def aclose(self) -> None:
+        """Close both sessions."""
+        self._client.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def __enter__(self) -> 'OllamaClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,134 @@
+"""
+OpenAI Chat Client for Ollama Guardrail
+
+A thin wrapper around the official OpenAI SDK's chat completions API. It
+exposes the same ``invoke``/``ainvoke``/``astream`` string interface as
+OllamaClient, so a single prompt goes straight to the SDK without building
+message objects or running callback managers.
+
+The SDK is imported when the first client is created, since importing it
+takes longer than the rest of the redactor package combined.
+
+Author: Harsh
+"""
+
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class OpenAIClient:
+    """
+    Chat completions client for a single OpenAI model.
+
+    The sync and async SDK clients can be given pooled httpx sessions, so
+    rebuilding the client (e.g. after an API key change) keeps the open
+    connections.
+
+    Attributes:
+        model: Name of the OpenAI model
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate, or None for the model default
+
+    Example:
+        >>> client = OpenAIClient(model="gpt-3.5-turbo", api_key="sk-...")
+        >>> client.invoke("Say hello")
+        'Hello!'
+    """
+
+    def __init__(
+        self,
+        model: str,
+        api_key: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        timeout: float = 60.0,
+        http_client: Optional[httpx.Client] = None,
+        http_async_client: Optional[httpx.AsyncClient] = None
+    ):
+        """
+        Initialize the sync and async SDK clients.
+
+        Args:
+            model: Name of the OpenAI model
+            api_key: OpenAI API key
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate (uses the model default if None)
+            timeout: Request timeout in seconds
+            http_client: Pooled sync session (the SDK creates one if None)
+            http_async_client: Pooled async session (the SDK creates one if None)
+        """
+        import openai
+
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+
+        self._client = openai.OpenAI(api_key=api_key, timeout=timeout, http_client=http_client)
+        self._async_client = openai.AsyncOpenAI(
+            api_key=api_key, timeout=timeout, http_client=http_async_client
+        )
+
+    def _request(self, prompt: str) -> Dict[str, Any]:
+        """Build the chat completions arguments for a single user message."""
+        request: Dict[str, Any] = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": self.temperature,
+        }
+        if self.max_tokens is not None:
+            request["max_tokens"] = self.max_tokens
+        return request
+
+    def invoke(self, prompt: str) -> str:
+        """
+        Generate a reply to a prompt.
+
+        Args:
+            prompt: Full prompt text
+
+        Returns:
+            Reply text (empty if the model returned no content)
+
+        Raises:
+            openai.OpenAIError: If the request fails
+        """
+        response = self._client.chat.completions.create(**self._request(prompt))
+        return response.choices[0].message.content or ""
+
+    async def ainvoke(self, prompt: str) -> str:
+        """
+        Asynchronously generate a reply to a prompt.
+
+        Args:
+            prompt: Full prompt text
+
+        Returns:
+            Reply text (empty if the model returned no content)
+
+        Raises:
+            openai.OpenAIError: If the request fails
+        """
+        response = await self._async_client.chat.completions.create(**self._request(prompt))
+        return response.choices[0].message.content or ""
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Stream a reply to a prompt as it is generated.
+
+        Args:
+            prompt: Full prompt text
+
+        Yields:
+            Non-empty text fragments in generation order
+
+        Raises:
+            openai.OpenAIError: If the request fails
+        """
+        stream = await self._async_client.chat.completions.create(**self._request(prompt), stream=True)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
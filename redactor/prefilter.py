@@ -0,0 +1,216 @@
+"""
+Regex Pre-filter for Ollama Guardrail
+
+Cheap candidate checks run before the LLM is called. Structured categories
+(emails, phone numbers, SSNs, card numbers, dates) can only be present if
+some digit or "@" pattern appears in the text; when none of the selected
+categories has a candidate, the model call can be skipped entirely.
+
+The candidate patterns are deliberately permissive: a false positive only
+costs the LLM call that would have happened anyway, while a false negative
+would let sensitive data through unredacted.
+
+For emails, phone numbers, SSNs and card numbers, stricter patterns also
+allow optional deterministic redaction: those categories are replaced
+without the model, which then only handles the remaining categories (or
+is skipped when none remain).
+
+Selected categories are scanned in a single pass with one combined
+alternation pattern per category selection, compiled once and memoized.
+
+Author: Harsh
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Pattern, Tuple
+
+# Candidate pattern sources keyed by category name. Flags are inline so the
+# sources can be combined into a single alternation.
+CANDIDATE_PATTERN_SOURCES: Dict[str, str] = {
+    "Email Addresses": r"[\w.+-]+@[\w-]+\.[\w.-]+",
+    # Seven or more digits, allowing common separators and a leading "+"
+    "Phone Numbers": r"\d(?:[\s().+-]*\d){6,}",
+    "Social Security Numbers": r"\b\d{3}[\s-]?\d{2}[\s-]?\d{4}\b",
+    # 13-19 digits, optionally grouped with spaces or dashes
+    "Credit Card Numbers": r"\d(?:[\s-]?\d){12,18}",
+    # Numeric dates, four-digit years, or month names
+    "Dates of Birth": (
+        r"\d{1,4}[/.-]\d{1,2}[/.-]\d{1,4}|\b(?:19|20)\d{2}\b"
+        r"|(?i:\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b)"
+    ),
+}
+
+# Precise pattern sources used for deterministic redaction, in match
+# priority order (SSNs and card numbers before the looser phone pattern)
+STRUCTURED_PATTERN_SOURCES: Dict[str, str] = {
+    "Email Addresses": r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,}\b",
+    "Social Security Numbers": r"\b\d{3}-\d{2}-\d{4}\b",
+    "Credit Card Numbers": r"\b\d(?:[ -]?\d){12,18}\b",
+    "Phone Numbers": r"(?<![\w+])(?:\+?1[\s.-]?)?(?:\(\d{3}\)|\d{3})[\s.-]?\d{3}[\s.-]?\d{4}\b",
+}
+
+# Trailing index of a "[NAME-1]" style placeholder
+_PLACEHOLDER_INDEX = re.compile(r"\d+\]$")
+
+# Detection metadata for deterministic results, matching the prompt's output format
+_STRUCTURED_DETAILS: Dict[str, Tuple[str, str]] = {
+    "Email Addresses": ("PII", "Email address."),
+    "Social Security Numbers": ("PII", "Sensitive personal identifier."),
+    "Credit Card Numbers": ("Financial", "Payment card number."),
+    "Phone Numbers": ("PII", "Phone number."),
+}
+
+
+@lru_cache(maxsize=64)
+def _combined_pattern(categories: Tuple[str, ...], structured: bool = False) -> Pattern:
+    """
+    Compile one alternation covering the given categories.
+
+    Each category becomes a named group ``c<position>`` so a match can be
+    traced back to its category via ``match.lastgroup``.
+    """
+    sources = STRUCTURED_PATTERN_SOURCES if structured else CANDIDATE_PATTERN_SOURCES
+    return re.compile("|".join(
+        f"(?P<c{position}>{sources[category]})" for position, category in enumerate(categories)
+    ))
+
+
+def _selection_key(categories: Iterable[str], sources: Dict[str, str]) -> Tuple[str, ...]:
+    """Return the selected categories that have a pattern, in pattern priority order."""
+    selected = set(categories)
+    return tuple(category for category in sources if category in selected)
+
+
+def needs_model(text: str, categories: Iterable[str]) -> bool:
+    """
+    Check whether the LLM must be called for this text.
+
+    Args:
+        text: Input text
+        categories: Selected category names
+
+    Returns:
+        False only if every selected category is pre-filterable and none has a candidate
+
+    Example:
+        >>> needs_model("The meeting is on Monday.", ["Email Addresses", "Phone Numbers"])
+        False
+    """
+    categories = list(categories)
+    if any(category not in CANDIDATE_PATTERN_SOURCES for category in categories):
+        return True
+    key = _selection_key(categories, CANDIDATE_PATTERN_SOURCES)
+    return bool(key) and _combined_pattern(key).search(text) is not None
+
+
+def partition_categories(categories: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """
+    Split a selection into regex-redactable and model-only categories.
+
+    Args:
+        categories: Selected category names
+
+    Returns:
+        Tuple of (categories with a structured pattern, remaining categories), in selection order
+
+    Example:
+        >>> partition_categories(["Email Addresses", "Medical Information"])
+        (['Email Addresses'], ['Medical Information'])
+    """
+    local: List[str] = []
+    model: List[str] = []
+    for category in categories:
+        (local if category in STRUCTURED_PATTERN_SOURCES else model).append(category)
+    return local, model
+
+
+def can_redact_locally(categories: Iterable[str]) -> bool:
+    """
+    Check whether every selected category can be redacted without the LLM.
+
+    Args:
+        categories: Selected category names
+
+    Returns:
+        True if all categories have a structured pattern and at least one is selected
+    """
+    local, model = partition_categories(categories)
+    return bool(local) and not model
+
+
+def _luhn_valid(number: str) -> bool:
+    """Check a digit string with the Luhn checksum used by payment cards."""
+    total = 0
+    for position, digit in enumerate(reversed(number)):
+        value = int(digit)
+        if position % 2 == 1:
+            value = value * 2 - 9 if value > 4 else value * 2
+        total += value
+    return total % 10 == 0
+
+
+def _numbered_placeholder(placeholder: str, index: int) -> str:
+    """Renumber a "[NAME-1]" style placeholder to "[NAME-<index>]"."""
+    return _PLACEHOLDER_INDEX.sub(f"{index}]", placeholder)
+
+
+def redact_structured(
+    text: str,
+    categories: Iterable[str],
+    category_map: Dict[str, str]
+) -> Tuple[Dict, str]:
+    """
+    Redact structured categories with regular expressions instead of the LLM.
+
+    Placeholders are numbered per category in order of first appearance, and
+    repeated values reuse their placeholder. Card-number candidates must pass
+    the Luhn check. All matches are replaced in a single re.sub pass, so the
+    cost stays linear in the text length however many matches there are.
+
+    Args:
+        text: Input text
+        categories: Selected category names (all must satisfy can_redact_locally)
+        category_map: Mapping of category names to placeholder patterns
+
+    Returns:
+        Tuple of (JSON output dict in the prompt's format, redacted text string)
+
+    Example:
+        >>> result, redacted = redact_structured(
+        ...     "Mail a@example.com", ["Email Addresses"], {"Email Addresses": "[EMAIL-1]"}
+        ... )
+        >>> redacted
+        'Mail [EMAIL-1]'
+    """
+    key = _selection_key(categories, STRUCTURED_PATTERN_SOURCES)
+    detected: List[Dict[str, str]] = []
+    placeholders: Dict[Tuple[str, str], str] = {}
+    counts: Dict[str, int] = {}
+
+    def replace(match: re.Match) -> str:
+        category = key[int(match.lastgroup[1:])]
+        value = match.group()
+        if category == "Credit Card Numbers" and not _luhn_valid(re.sub(r"\D", "", value)):
+            return value
+
+        placeholder = placeholders.get((category, value))
+        if placeholder is None:
+            counts[category] = counts.get(category, 0) + 1
+            placeholder = _numbered_placeholder(
+                category_map.get(category, f"[{category.upper()}-1]"), counts[category]
+            )
+            placeholders[(category, value)] = placeholder
+
+            data_type, reason = _STRUCTURED_DETAILS[category]
+            detected.append({
+                "type": data_type,
+                "data": value,
+                "category": category,
+                "reason": reason,
+                "redaction": placeholder
+            })
+        return placeholder
+
+    redacted_text = _combined_pattern(key, structured=True).sub(replace, text) if key else text
+    return {"detected_sensitive_data": detected, "redacted_text": redacted_text}, redacted_text
@@ -5,6 +5,7 @@ Core redaction functionality for detecting and redacting sensitive information
 from text using Ollama LLM for detection and OpenAI for optional processing.
 
 This module provides production-ready redaction with:
+- Sync and async (asyncio) APIs
 - Retry logic with exponential backoff
 - Rate limiting for API calls
 - Comprehensive error handling
@@ -14,20 +15,208 @@ Author: Harsh
 """
 
 import os
-import json
+import asyncio
 import logging
-from typing import List, Dict, Tuple, Optional
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import List, Dict, Tuple, Optional, AsyncIterator, Iterator, NamedTuple
 
-from langchain_ollama.llms import OllamaLLM
-from langchain_openai import ChatOpenAI
+import httpx
+import orjson
 
-from utils import retry_api_call, rate_limited, load_config
+from utils import (
+    retry_api_call, aretry_api_call, hashable_args, is_transient_error, rate_limited, load_config,
+    LRUCache, response_cache_key, dedupe_texts
+)
 import prompt
+from .ollama_client import OllamaClient
+from .openai_client import OpenAIClient
+from .prefilter import needs_model, can_redact_locally, partition_categories, redact_structured
 
 logger = logging.getLogger(__name__)
 config = load_config()
 
 
+class _StreamingStringField:
+    """
+    Incrementally decode one string field of a JSON object as it streams in.
+
+    Only the not-yet-decoded tail of the response is kept and scanned, so a
+    long response costs O(n) in total instead of re-scanning the whole
+    buffer for every fragment.
+
+    Example:
+        >>> field = _StreamingStringField("redacted_text")
+        >>> field.feed('{"redacted_text": "Hel')
+        'Hel'
+        >>> field.feed('lo [EMAIL-1]"}')
+        'Hello [EMAIL-1]'
+    """
+
+    def __init__(self, key: str):
+        self._marker = f'"{key}"'
+        self._pending = ""      # raw text not yet consumed
+        self._started = False   # whether the opening quote has been seen
+        self._parts: List[str] = []
+        self.closed = False
+
+    def feed(self, fragment: str) -> Optional[str]:
+        """
+        Add a fragment of the response.
+
+        Returns:
+            The value decoded so far if this fragment extended it, otherwise None
+        """
+        if self.closed:
+            return None
+        self._pending += fragment
+
+        if not self._started and not self._find_value_start():
+            return None
+
+        raw_end, self.closed = self._decodable_end()
+        if raw_end == 0:
+            return None
+        self._parts.append(orjson.loads(f'"{self._pending[:raw_end]}"'))
+        self._pending = self._pending[raw_end:]
+        return "".join(self._parts)
+
+    def _find_value_start(self) -> bool:
+        """Drop everything up to the value's opening quote; returns True once found."""
+        marker = self._pending.find(self._marker)
+        if marker == -1:
+            # Keep just enough text for a marker split across fragments
+            self._pending = self._pending[-len(self._marker):]
+            return False
+        colon = self._pending.find(":", marker + len(self._marker))
+        start = self._pending.find('"', colon + 1) if colon != -1 else -1
+        if start == -1:
+            self._pending = self._pending[marker:]
+            return False
+        self._pending = self._pending[start + 1:]
+        self._started = True
+        return True
+
+    def _decodable_end(self) -> Tuple[int, bool]:
+        """Return (length of the decodable raw prefix, whether the closing quote was reached)."""
+        pending = self._pending
+        position = 0
+        while position < len(pending):
+            char = pending[position]
+            if char == '"':
+                return position, True
+            if char != "\\":
+                position += 1
+                continue
+            # Stop before an escape sequence that has not fully arrived
+            if position + 1 >= len(pending):
+                break
+            if pending[position + 1] != "u":
+                position += 2
+                continue
+            # A high surrogate (\uD800-\uDBFF) needs its low-surrogate escape to decode
+            lead = pending[position + 2:position + 4].lower()
+            width = 12 if len(lead) == 2 and lead[0] == "d" and lead[1] in "89ab" else 6
+            if position + width > len(pending):
+                break
+            position += width
+        return position, False
+
+
+def _log_failure(message: str, error: BaseException) -> None:
+    """
+    Log a failed request as a one-line error.
+
+    The traceback is only formatted when debug logging is enabled, since
+    formatting it on every failure is costly when a misconfigured endpoint
+    makes every request fail.
+    """
+    logger.error(f"{message}: {type(error).__name__}: {error}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"{message} traceback", exc_info=error)
+
+
+async def _aopen_stream(astream, prompt: str) -> Tuple[AsyncIterator[str], Optional[str]]:
+    """
+    Start a model stream and wait for its first fragment.
+
+    Connection errors, error statuses and model loading failures surface
+    before anything is yielded, so opening the stream this way lets the
+    caller retry them with aretry_api_call.
+
+    Returns:
+        The stream and its first fragment (None if the stream was empty)
+    """
+    stream = astream(prompt)
+    try:
+        return stream, await stream.__anext__()
+    except StopAsyncIteration:
+        return stream, None
+    except BaseException:
+        await stream.aclose()
+        raise
+
+
+@lru_cache(maxsize=64)
+def _detection_prompt_parts(category_selected: str, concise: bool = False) -> Tuple[str, str]:
+    """
+    Split the detection prompt around the user text for one category selection.
+
+    Memoized so the multi-KB head (static instructions plus categories) is
+    built once per selection; each request only concatenates its text.
+    ``concise`` selects the prompt without worked examples.
+    """
+    prefix = prompt.concise_prefix if concise else prompt.detection_prefix
+    head, tail = prompt.detection_suffix.split("{user_prompt}")
+    return prefix + head.format(category_selected=category_selected), tail
+
+
+@lru_cache(maxsize=64)
+def _batch_prompt_parts(category_selected: str) -> Tuple[str, str]:
+    """
+    Split the batch prompt around the requests block for one category selection.
+
+    Memoized like _detection_prompt_parts, so each batch only concatenates
+    its (possibly large) requests block instead of running str.format over it.
+    """
+    head, tail = prompt.batch_suffix.split("{requests_block}")
+    return prompt.batch_prefix + head.format(category_selected=category_selected), tail
+
+
+# "### Request {index}:" split around its index
+_REQUEST_HEADER_HEAD, _REQUEST_HEADER_TAIL = prompt.batch_request_header.split("{index}")
+
+
+class RedactionResult(NamedTuple):
+    """
+    Result of a detection call.
+
+    A tuple subclass, so ``result, redacted = ...`` unpacking and indexing
+    work as with a plain ``(dict, str)`` tuple.
+
+    Attributes:
+        data: JSON output dict with "detected_sensitive_data" and "redacted_text",
+            or with "error" if detection failed (None for partial streaming results)
+        redacted_text: Redacted text ("" if detection failed)
+    """
+
+    data: Optional[Dict]
+    redacted_text: str
+
+
+@dataclass
+class _BatchPlan:
+    """Per-call state of a combined batch: results so far and the chunks still to send."""
+
+    results: List[Optional[RedactionResult]]
+    mapping: List[int]
+    chunks: List[List[int]] = field(default_factory=list)
+    categories_str: str = ""
+    model_texts: Dict[int, str] = field(default_factory=dict)
+    local_results: Dict[int, Optional[Dict]] = field(default_factory=dict)
+    cache_keys: Dict[int, str] = field(default_factory=dict)
+
+
 class SensitiveInformationRedactor:
     """
     A class to handle the redaction of sensitive information using LLM models.
@@ -40,8 +229,8 @@ class SensitiveInformationRedactor:
     All operations include retry logic, rate limiting, and comprehensive error handling.
 
     Attributes:
-        ollama_model (OllamaLLM): Ollama model for sensitive information detection
-        openai_model (ChatOpenAI): OpenAI model for processing redacted text (optional)
+        ollama_model (OllamaClient): Pooled Ollama client for sensitive information detection (created on first use)
+        openai_model (OpenAIClient): OpenAI client for processing redacted text (optional, created on first use)
 
     Example:
         >>> redactor = SensitiveInformationRedactor()
@@ -57,57 +246,132 @@ class SensitiveInformationRedactor:
         self,
         ollama_model_name: Optional[str] = None,
         openai_model_name: Optional[str] = None,
-        openai_api_key: Optional[str] = None
+        openai_api_key: Optional[str] = None,
+        max_concurrency: Optional[int] = None
     ):
         """
         Initialize the redactor with specified LLM models.
 
+        Models and their HTTP sessions are created on first use, so startup
+        does not wait on either provider.
+
         Args:
             ollama_model_name: Name of the Ollama model (uses config default if None)
             openai_model_name: Name of the OpenAI model (uses config default if None)
             openai_api_key: OpenAI API key (uses environment variable if None)
-
-        Raises:
-            Exception: If model initialization fails
+            max_concurrency: Maximum in-flight requests per aidentify_batch call (uses config default if None)
         """
         # Use config defaults if not specified
-        ollama_model_name = ollama_model_name or config.get_ollama_model_name()
-        openai_model_name = openai_model_name or config.get_openai_model_name()
+        ollama_model_name = ollama_model_name or config.ollama_model_name
+        openai_model_name = openai_model_name or config.openai_model_name
 
         # Get API key from parameter or environment
         if openai_api_key is None:
             openai_api_key = os.getenv("OPENAI_API_KEY", "")
 
-        try:
-            # Initialize Ollama model
-            self.ollama_model = OllamaLLM(model=ollama_model_name)
-            logger.info(f"Initialized Ollama model: {ollama_model_name}")
-
-            # Initialize OpenAI model if API key is available
-            if openai_api_key:
-                self.openai_model = ChatOpenAI(
-                    model=openai_model_name,
-                    api_key=openai_api_key,
-                    temperature=config.get_openai_temperature(),
-                    max_tokens=config.get_openai_max_tokens(),
-                    timeout=config.get_openai_timeout()
-                )
-                logger.info(f"Initialized OpenAI model: {openai_model_name}")
-            else:
-                self.openai_model = None
-                logger.warning("OpenAI model not initialized due to missing API key")
+        self.ollama_model_name = ollama_model_name
+        self.openai_model_name = openai_model_name
+        self._openai_api_key = openai_api_key
+
+        if not openai_api_key:
+            logger.warning("OpenAI model not available due to missing API key")
+
+        self.max_concurrency = max_concurrency or config.get_batch_concurrency()
+        self.update_config()
+
+        # Bounds concurrent async model calls; created on first async use
+        self._async_semaphore: Optional[asyncio.Semaphore] = None
+
+        # Deterministic response caches keyed by model, categories and text
+        self._detection_cache = LRUCache(maxsize=config.get_redaction_cache_size())
+        self._openai_cache = LRUCache(maxsize=config.get_openai_cache_size())
+
+        # Placeholder patterns per (category map, selection)
+        self._formats_cache = LRUCache(maxsize=1024)
+
+    def update_config(self) -> None:
+        """
+        Re-read the configuration values used on every request.
+
+        Called once by __init__ so the request path reads plain attributes
+        instead of walking the configuration; call again after the
+        configuration has been reloaded.
+        """
+        self._category_map = config.category_map
+        self._retry_config = config.get_retry_config()
+        self._retry_kwargs = {
+            'max_attempts': self._retry_config['max_attempts'],
+            'min_wait': self._retry_config['min_wait'],
+            'max_wait': self._retry_config['max_wait'],
+            'retry_on': is_transient_error,
+            'jitter': 'full'
+        }
+        self._sanitize_errors = config.should_sanitize_error_messages()
+        self._log_sensitive_data = config.should_log_sensitive_data()
+        self._openai_instruction_prefix = config.get_openai_instruction_prefix()
+        self._prefilter_enabled = config.is_prefilter_enabled()
+        self._deterministic_redaction = config.is_deterministic_redaction_enabled()
+        self._concise_max_chars = config.get_concise_prompt_max_chars()
+        self._concise_max_categories = config.get_concise_prompt_max_categories()
+
+    @cached_property
+    def ollama_model(self) -> OllamaClient:
+        """Pooled Ollama client, created on first use."""
+        model = OllamaClient(
+            model=self.ollama_model_name,
+            base_url=config.get_ollama_host(),
+            format=prompt.detection_schema,
+            keep_alive=config.get_ollama_keep_alive(),
+            options={"temperature": config.get_ollama_temperature()},
+            timeout=config.get_ollama_timeout(),
+            **config.get_ollama_connection_pool()
+        )
+        logger.info(f"Initialized Ollama model: {self.ollama_model_name}")
+        return model
+
+    @cached_property
+    def openai_model(self) -> Optional[OpenAIClient]:
+        """OpenAI model, created on first use (None without an API key)."""
+        if not self._openai_api_key:
+            return None
+        model = self._build_openai_model(self._openai_api_key)
+        logger.info(f"Initialized OpenAI model: {self.openai_model_name}")
+        return model
+
+    @cached_property
+    def _openai_sessions(self) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        """
+        Pooled HTTP sessions for OpenAI, shared by every OpenAIClient
+        this redactor creates so API key updates keep connections warm.
+        """
+        limits = httpx.Limits(**config.get_openai_connection_pool())
+        return httpx.Client(limits=limits), httpx.AsyncClient(limits=limits)
+
+    def warmup(self) -> bool:
+        """
+        Load the Ollama model ahead of the first redaction.
 
+        Failures are logged rather than raised, so an unreachable Ollama
+        server does not prevent startup.
+
+        Returns:
+            True if the model was loaded, False otherwise
+        """
+        try:
+            self.ollama_model.warmup()
         except Exception as e:
-            logger.error(f"Error initializing models: {str(e)}")
-            raise
+            logger.warning(f"Ollama model warm-up failed: {str(e)}")
+            return False
+        logger.info(f"Warmed up Ollama model: {self.ollama_model_name}")
+        return True
 
-    @rate_limited(max_calls=60, period=60)
+    @rate_limited(max_calls=60, period=60, name="ollama")
     def identify_sensitive_information(
         self,
         text: str,
         categories: List[str],
         category_map: Optional[Dict[str, str]] = None
-    ) -> Tuple[Dict, str]:
+    ) -> RedactionResult:
         """
         Process input text to identify and redact sensitive information.
 
@@ -120,7 +384,7 @@ class SensitiveInformationRedactor:
             category_map: Mapping of category names to placeholder patterns (uses config default if None)
 
         Returns:
-            Tuple of (JSON output dict, redacted text string)
+            RedactionResult of (JSON output dict, redacted text string)
 
         Raises:
             None - All exceptions are caught and returned as error dicts
@@ -132,81 +396,740 @@ class SensitiveInformationRedactor:
             >>>     ["Email Addresses"]
             >>> )
         """
-        # Use config default if category_map not provided
-        if category_map is None:
-            category_map = config.get_category_map()
+        invalid = self._validate_detection_input(text, categories)
+        if invalid is not None:
+            return invalid
+
+        try:
+            skipped = self._local_result(text, categories, category_map)
+            if skipped is not None:
+                return skipped
+
+            cache_key, cached = self._get_cached_detection(text, categories, category_map)
+            if cached is not None:
+                return cached
+
+            model_text, model_categories, local = self._split_local_redaction(text, categories, category_map)
+
+            # Call the Ollama model with retry logic, falling back to the
+            # full prompt if the concise prompt's output does not parse
+            for formatted_prompt in self._detection_prompts(model_text, model_categories, category_map):
+                # Identical requests from concurrent sessions share one model call
+                output = retry_api_call(
+                    self.ollama_model.invoke,
+                    formatted_prompt,
+                    collapse_key=hashable_args(self.ollama_model.invoke, formatted_prompt),
+                    **self._retry_kwargs
+                )
+                result = self._parse_detection_output(output)
+                if "error" not in result.data:
+                    break
 
-        # Input validation
+            return self._cache_detection(cache_key, self._merge_local_detection(local, result))
+
+        except Exception as e:
+            return self._detection_error(e)
+
+    @rate_limited(max_calls=60, period=60, name="ollama")
+    async def aidentify_sensitive_information(
+        self,
+        text: str,
+        categories: List[str],
+        category_map: Optional[Dict[str, str]] = None
+    ) -> RedactionResult:
+        """
+        Async version of identify_sensitive_information.
+
+        Awaits the Ollama model instead of blocking the calling thread, so
+        concurrent redaction requests overlap their network I/O. The number
+        of in-flight model calls is bounded by performance.max_concurrent_requests.
+
+        Args:
+            text: Input text to analyze for sensitive information
+            categories: List of category names to detect and redact
+            category_map: Mapping of category names to placeholder patterns (uses config default if None)
+
+        Returns:
+            RedactionResult of (JSON output dict, redacted text string)
+
+        Raises:
+            None - All exceptions are caught and returned as error dicts
+
+        Example:
+            >>> redactor = SensitiveInformationRedactor()
+            >>> result, redacted = await redactor.aidentify_sensitive_information(
+            >>>     "My email is john@example.com",
+            >>>     ["Email Addresses"]
+            >>> )
+        """
+        invalid = self._validate_detection_input(text, categories)
+        if invalid is not None:
+            return invalid
+
+        try:
+            skipped = self._local_result(text, categories, category_map)
+            if skipped is not None:
+                return skipped
+
+            cache_key, cached = self._get_cached_detection(text, categories, category_map)
+            if cached is not None:
+                return cached
+
+            model_text, model_categories, local = self._split_local_redaction(text, categories, category_map)
+
+            # Call the Ollama model with retry logic, falling back to the
+            # full prompt if the concise prompt's output does not parse
+            for formatted_prompt in self._detection_prompts(model_text, model_categories, category_map):
+                async with self._get_async_semaphore():
+                    # Identical requests from concurrent sessions share one model call
+                    output = await aretry_api_call(
+                        self.ollama_model.ainvoke,
+                        formatted_prompt,
+                        collapse_key=hashable_args(self.ollama_model.ainvoke, formatted_prompt),
+                        **self._retry_kwargs
+                    )
+                result = self._parse_detection_output(output)
+                if "error" not in result.data:
+                    break
+
+            return self._cache_detection(cache_key, self._merge_local_detection(local, result))
+
+        except Exception as e:
+            return self._detection_error(e)
+
+    @rate_limited(max_calls=60, period=60, name="ollama")
+    async def astream_sensitive_information(
+        self,
+        text: str,
+        categories: List[str],
+        category_map: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[RedactionResult]:
+        """
+        Stream redaction of sensitive information as the model generates it.
+
+        While the response is streaming, each yielded value is ``(None, partial
+        redacted text)``; the last value is the same ``RedactionResult(JSON output dict,
+        redacted text)`` returned by aidentify_sensitive_information.
+        Failures before the first fragment (connection errors, error statuses,
+        a model still loading) are retried like aidentify_sensitive_information;
+        once a partial result has been shown, a failure is not retried.
+
+        Args:
+            text: Input text to analyze for sensitive information
+            categories: List of category names to detect and redact
+            category_map: Mapping of category names to placeholder patterns (uses config default if None)
+
+        Yields:
+            (None, partial redacted text) while streaming, then (JSON output dict, redacted text)
+
+        Raises:
+            None - All exceptions are caught and yielded as error dicts
+
+        Example:
+            >>> redactor = SensitiveInformationRedactor()
+            >>> async for result, redacted in redactor.astream_sensitive_information(
+            ...     "My email is john@example.com", ["Email Addresses"]
+            ... ):
+            ...     print(redacted)
+        """
+        invalid = self._validate_detection_input(text, categories)
+        if invalid is not None:
+            yield invalid
+            return
+
+        try:
+            skipped = self._local_result(text, categories, category_map)
+            if skipped is not None:
+                yield skipped
+                return
+
+            cache_key, cached = self._get_cached_detection(text, categories, category_map)
+            if cached is not None:
+                yield cached
+                return
+
+            model_text, model_categories, local = self._split_local_redaction(text, categories, category_map)
+
+            # A concise-prompt stream whose output does not parse is
+            # replaced by a second stream with the full prompt
+            for formatted_prompt in self._detection_prompts(model_text, model_categories, category_map):
+                fragments: List[str] = []
+                redacted_field = _StreamingStringField("redacted_text")
+                async with self._get_async_semaphore():
+                    # Failures before the first fragment are retried; once
+                    # partial output has been shown, a failure is final
+                    stream, fragment = await aretry_api_call(
+                        _aopen_stream, self.ollama_model.astream, formatted_prompt, **self._retry_kwargs
+                    )
+                    try:
+                        while fragment is not None:
+                            fragments.append(fragment)
+                            partial = redacted_field.feed(fragment)
+                            if partial:
+                                yield RedactionResult(None, partial)
+                            try:
+                                fragment = await stream.__anext__()
+                            except StopAsyncIteration:
+                                fragment = None
+                    finally:
+                        await stream.aclose()
+                result = self._parse_detection_output("".join(fragments))
+                if "error" not in result.data:
+                    break
+
+            yield self._cache_detection(cache_key, self._merge_local_detection(local, result))
+
+        except Exception as e:
+            yield self._detection_error(e)
+
+    def _get_async_semaphore(self) -> asyncio.Semaphore:
+        """Return the semaphore bounding concurrent async model calls."""
+        if self._async_semaphore is None:
+            self._async_semaphore = asyncio.Semaphore(config.get_max_concurrent_requests())
+        return self._async_semaphore
+
+    def _validate_detection_input(self, text: str, categories: List[str]) -> Optional[RedactionResult]:
+        """Return an error result for invalid detection input, or None if the input is valid."""
         if not text:
             logger.warning("Empty text provided for sensitive information detection")
-            return {"error": "No text provided"}, ""
+            return RedactionResult({"error": "No text provided"}, "")
 
         if not categories:
             logger.warning("No categories selected for redaction")
-            return {"error": "No categories selected"}, text
+            return RedactionResult({"error": "No categories selected"}, text)
+
+        return None
+
+    def _local_result(
+        self,
+        text: str,
+        categories: List[str],
+        category_map: Optional[Dict[str, str]]
+    ) -> Optional[RedactionResult]:
+        """Return a result computed without the model, or None if the model is needed."""
+        if self._prefilter_enabled and not needs_model(text, categories):
+            logger.info("No candidate matches for the selected categories, skipping model call")
+            return RedactionResult({"detected_sensitive_data": [], "redacted_text": text}, text)
+
+        if self._deterministic_redaction and can_redact_locally(categories):
+            logger.info("Redacting structured categories locally, skipping model call")
+            if category_map is None:
+                category_map = self._category_map
+            return RedactionResult(*redact_structured(text, categories, category_map))
+
+        return None
+
+    def _split_local_redaction(
+        self,
+        text: str,
+        categories: List[str],
+        category_map: Optional[Dict[str, str]]
+    ) -> Tuple[str, List[str], Optional[Dict]]:
+        """
+        Redact regex-matchable categories before the model call.
+
+        With deterministic redaction enabled, emails, phone numbers, SSNs and
+        card numbers are replaced locally, and the model only sees the
+        pre-redacted text and the remaining categories.
+
+        Returns:
+            Tuple of (text for the model, categories for the model, local JSON output dict or None)
+        """
+        if not self._deterministic_redaction:
+            return text, categories, None
+
+        local_categories, model_categories = partition_categories(categories)
+        if not local_categories or not model_categories:
+            return text, categories, None
+
+        if category_map is None:
+            category_map = self._category_map
+        local, redacted_text = redact_structured(text, local_categories, category_map)
+        logger.info(f"Redacted {len(local_categories)} structured categories locally")
+        return redacted_text, model_categories, local
+
+    @staticmethod
+    def _merge_local_detection(local: Optional[Dict], result: RedactionResult) -> RedactionResult:
+        """Prepend locally detected items to the model's result; errors are returned unchanged."""
+        if local is None or "error" in result.data:
+            return result
+        merged = dict(result.data)
+        merged["detected_sensitive_data"] = (
+            local["detected_sensitive_data"] + list(merged.get("detected_sensitive_data", []))
+        )
+        return RedactionResult(merged, result.redacted_text)
+
+    def _formats_for(
+        self,
+        categories: List[str],
+        category_map: Optional[Dict[str, str]]
+    ) -> Tuple[Tuple[str, ...], str]:
+        """
+        Resolve the placeholder patterns for the selected categories.
+
+        Memoized per (category map, selection): the selection comes from a
+        small closed set, so the lookups and the joined string are built once.
+
+        Returns:
+            Tuple of (placeholder patterns, newline-separated patterns for the prompt)
+        """
+        # Use config default if category_map not provided
+        if category_map is None:
+            category_map = self._category_map
+
+        selection = tuple(categories)
+        key = (id(category_map), selection)
+        cached = self._formats_cache.get(key)
+        # The entry holds a reference to its map, so a matching id is the same map
+        if cached is not None and cached[0] is category_map:
+            return cached[1]
+
+        # Warned once per selection, since the result is memoized below
+        unknown = [cat for cat in selection if cat not in category_map]
+        if unknown:
+            logger.warning(f"Ignoring categories without a placeholder: {unknown}")
+
+        formats = tuple(category_map[cat] for cat in selection if cat in category_map)
+        resolved = (formats, "\n".join(formats))
+        self._formats_cache.set(key, (category_map, resolved))
+        return resolved
+
+    def _get_cached_detection(
+        self,
+        text: str,
+        categories: List[str],
+        category_map: Optional[Dict[str, str]]
+    ) -> Tuple[str, Optional[RedactionResult]]:
+        """Return the detection cache key and the cached result for it, if any."""
+        cache_key = response_cache_key(
+            self.ollama_model_name, text, self._formats_for(categories, category_map)[0]
+        )
+        cached = self._detection_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Returning cached detection result")
+            result, redacted_text = cached
+            return cache_key, RedactionResult(dict(result), redacted_text)
+        return cache_key, None
+
+    def _cache_detection(self, cache_key: str, result: RedactionResult) -> RedactionResult:
+        """Cache a successful detection result and return it unchanged."""
+        if "error" not in result.data:
+            self._detection_cache.set(cache_key, RedactionResult(dict(result.data), result.redacted_text))
+        return result
+
+    def _use_concise_prompt(self, text: str, categories: List[str]) -> bool:
+        """Check whether the input is short enough for the prompt without worked examples."""
+        return len(text) < self._concise_max_chars and len(categories) <= self._concise_max_categories
+
+    def _detection_prompts(
+        self,
+        text: str,
+        categories: List[str],
+        category_map: Optional[Dict[str, str]]
+    ) -> Iterator[str]:
+        """
+        Yield the detection prompts to try in order.
+
+        Short inputs get the concise prompt first; the full prompt with worked
+        examples follows and is only built if the caller asks for it.
+        """
+        if self._use_concise_prompt(text, categories):
+            yield self._build_detection_prompt(text, categories, category_map, concise=True)
+            logger.warning("Concise prompt output did not parse, retrying with the full prompt")
+        yield self._build_detection_prompt(text, categories, category_map)
+
+    def _build_detection_prompt(
+        self,
+        text: str,
+        categories: List[str],
+        category_map: Optional[Dict[str, str]],
+        concise: bool = False
+    ) -> str:
+        """Format the detection prompt (optionally the concise one) for the given text and categories."""
+        # Get formatting for selected categories
+        _, categories_str = self._formats_for(categories, category_map)
+
+        logger.info(f"Processing text for {len(categories)} categories")
+        logger.debug(f"Categories: {categories}")
+
+        # Static prefix first and per-request values last, so the model
+        # server's prompt cache can reuse the prefix across requests
+        head, tail = _detection_prompt_parts(categories_str, concise)
+        return head + text + tail
 
+    def _parse_detection_output(self, output: str) -> RedactionResult:
+        """Parse the model's JSON output into (JSON output dict, redacted text string)."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Raw Ollama output: {output[:200]}...")  # Log first 200 chars
+
+        # Parse JSON output from the model
         try:
-            # Get formatting for selected categories
-            selected_formats = [category_map[cat] for cat in categories if cat in category_map]
-            categories_str = "\n".join(selected_formats)
-
-            # Format the prompt template with user text and selected categories
-            formatted_prompt = prompt.template.format(
-                category_selected=categories_str,
-                user_prompt=text
-            )
+            parsed_output = orjson.loads(output)
+            redacted_text = parsed_output.get("redacted_text", "")
+            detected_count = len(parsed_output.get('detected_sensitive_data', []))
+
+            logger.info(f"Successfully parsed model output, detected {detected_count} sensitive items")
+
+            # Log sensitive data only if configured to do so (WARNING: disable for production)
+            if self._log_sensitive_data:
+                logger.debug(f"Detected sensitive data: {parsed_output.get('detected_sensitive_data', [])}")
+
+            return RedactionResult(parsed_output, redacted_text)
+
+        except orjson.JSONDecodeError as e:
+            # Schema-constrained decoding makes this rare; it still guards
+            # against servers that ignore the "format" field
+            logger.error(f"Failed to parse model output as JSON: {str(e)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Raw output: {output}")
+
+            error_msg = "Failed to parse output as JSON. The model may not have produced valid JSON format."
+            if self._sanitize_errors:
+                # Return sanitized error for security
+                return RedactionResult({"error": error_msg}, "")
+            else:
+                # Return detailed error for debugging
+                return RedactionResult({"error": error_msg, "raw_output": output}, "")
+
+    def _detection_error(self, e: Exception) -> RedactionResult:
+        """Log a detection failure and build the (sanitized) error result."""
+        _log_failure("Error in sensitive information detection", e)
+
+        error_msg = "An error occurred during sensitive information detection."
+        if self._sanitize_errors:
+            return RedactionResult({"error": error_msg}, "")
+        else:
+            return RedactionResult({"error": f"{error_msg} Details: {str(e)}"}, "")
+
+    def identify_sensitive_information_batch(
+        self,
+        texts: List[str],
+        categories: List[str],
+        category_map: Optional[Dict[str, str]] = None,
+        max_batch_size: Optional[int] = None
+    ) -> List[RedactionResult]:
+        """
+        Identify and redact sensitive information in several texts at once.
+
+        Texts are grouped into batches of at most ``max_batch_size`` and each
+        batch is sent to the Ollama model as a single prompt with numbered
+        "### Request N:" blocks, so N texts cost roughly N / max_batch_size
+        model round-trips instead of N.
+
+        Args:
+            texts: Input texts to analyze for sensitive information
+            categories: List of category names to detect and redact
+            category_map: Mapping of category names to placeholder patterns (uses config default if None)
+            max_batch_size: Maximum texts per model call (uses config default if None)
+
+        Returns:
+            List of RedactionResult (JSON output dict, redacted text string) in the same order as ``texts``
+
+        Raises:
+            None - All exceptions are caught and returned as per-text error dicts
+
+        Example:
+            >>> redactor = SensitiveInformationRedactor()
+            >>> results = redactor.identify_sensitive_information_batch(
+            ...     ["My email is john@example.com", "Call me at 555-123-4567"],
+            ...     ["Email Addresses", "Phone Numbers"]
+            ... )
+        """
+        invalid = self._validate_batch_input(texts, categories)
+        if invalid is not None:
+            return invalid
+
+        plan = self._plan_batch(texts, categories, category_map, max_batch_size)
+        for chunk in plan.chunks:
+            chunk_results = self._process_batch_chunk([plan.model_texts[i] for i in chunk], plan.categories_str)
+            self._store_batch_results(plan, chunk, chunk_results)
+
+        return self._scatter_results(plan.results, plan.mapping)
+
+    async def aidentify_sensitive_information_batch(
+        self,
+        texts: List[str],
+        categories: List[str],
+        category_map: Optional[Dict[str, str]] = None,
+        max_batch_size: Optional[int] = None
+    ) -> List[RedactionResult]:
+        """
+        Async version of identify_sensitive_information_batch.
+
+        The batched prompts are sent concurrently, with up to
+        ``max_concurrency`` in flight at once, so N texts take roughly
+        N / (max_batch_size * max_concurrency) model round-trips of wall time.
+
+        Args:
+            texts: Input texts to analyze for sensitive information
+            categories: List of category names to detect and redact
+            category_map: Mapping of category names to placeholder patterns (uses config default if None)
+            max_batch_size: Maximum texts per model call (uses config default if None)
+
+        Returns:
+            List of RedactionResult (JSON output dict, redacted text string) in the same order as ``texts``
+
+        Raises:
+            None - All exceptions are caught and returned as per-text error dicts
+
+        Example:
+            >>> redactor = SensitiveInformationRedactor()
+            >>> results = await redactor.aidentify_sensitive_information_batch(
+            ...     ["My email is john@example.com", "Call me at 555-123-4567"],
+            ...     ["Email Addresses", "Phone Numbers"]
+            ... )
+        """
+        invalid = self._validate_batch_input(texts, categories)
+        if invalid is not None:
+            return invalid
+
+        plan = self._plan_batch(texts, categories, category_map, max_batch_size)
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def process(chunk: List[int]) -> None:
+            async with semaphore:
+                chunk_results = await self._aprocess_batch_chunk(
+                    [plan.model_texts[i] for i in chunk], plan.categories_str
+                )
+            self._store_batch_results(plan, chunk, chunk_results)
+
+        await asyncio.gather(*(process(chunk) for chunk in plan.chunks))
+        return self._scatter_results(plan.results, plan.mapping)
+
+    async def aidentify_batch(
+        self,
+        texts: List[str],
+        categories: List[str],
+        category_map: Optional[Dict[str, str]] = None
+    ) -> List[RedactionResult]:
+        """
+        Identify and redact sensitive information in several texts concurrently.
+
+        Each text is sent as its own detection request; up to ``max_concurrency``
+        requests are in flight at once, so a batch takes roughly
+        len(texts) / max_concurrency model round-trips of wall time.
+
+        Args:
+            texts: Input texts to analyze for sensitive information
+            categories: List of category names to detect and redact
+            category_map: Mapping of category names to placeholder patterns (uses config default if None)
+
+        Returns:
+            List of RedactionResult (JSON output dict, redacted text string) in the same order as ``texts``
+
+        Raises:
+            None - All exceptions are caught and returned as per-text error dicts
+
+        Example:
+            >>> redactor = SensitiveInformationRedactor(max_concurrency=8)
+            >>> results = await redactor.aidentify_batch(
+            ...     ["My email is john@example.com", "Call me at 555-123-4567"],
+            ...     ["Email Addresses", "Phone Numbers"]
+            ... )
+        """
+        if not texts:
+            logger.warning("Empty batch provided for sensitive information detection")
+            return []
+
+        # Duplicate texts share one model call and are fanned back out at the end
+        unique_texts, mapping = dedupe_texts(texts)
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def detect(text: str) -> RedactionResult:
+            async with semaphore:
+                return await self.aidentify_sensitive_information(text, categories, category_map)
 
-            logger.info(f"Processing text for {len(categories)} categories")
-            logger.debug(f"Categories: {categories}")
+        logger.info(
+            f"Processing {len(unique_texts)} texts concurrently (max {self.max_concurrency} in flight, "
+            f"{len(texts) - len(unique_texts)} duplicates skipped)"
+        )
+
+        outcomes = await asyncio.gather(*(detect(text) for text in unique_texts), return_exceptions=True)
+        results = [
+            self._detection_error(outcome) if isinstance(outcome, Exception) else outcome
+            for outcome in outcomes
+        ]
+        return self._scatter_results(results, mapping)
+
+    @staticmethod
+    def _scatter_results(results: List[RedactionResult], mapping: List[int]) -> List[RedactionResult]:
+        """Fan results for unique texts back out to every original position."""
+        # Each position gets its own dict so callers can annotate results independently
+        return [RedactionResult(dict(results[index].data), results[index].redacted_text) for index in mapping]
+
+    def _validate_batch_input(self, texts: List[str], categories: List[str]) -> Optional[List[RedactionResult]]:
+        """Return the results for an invalid batch, or None if the batch is valid."""
+        if not texts:
+            logger.warning("Empty batch provided for sensitive information detection")
+            return []
+
+        if not categories:
+            logger.warning("No categories selected for batch redaction")
+            return [RedactionResult({"error": "No categories selected"}, text) for text in texts]
+
+        return None
+
+    def _plan_batch(
+        self,
+        texts: List[str],
+        categories: List[str],
+        category_map: Optional[Dict[str, str]],
+        max_batch_size: Optional[int]
+    ) -> _BatchPlan:
+        """
+        Answer what can be answered without the model and chunk the rest.
+
+        Duplicate texts are collapsed, empty texts and texts the pre-filter
+        rules out are answered locally, and cached texts come from the
+        detection cache; only the remaining texts are split into chunks.
+        """
+        # Use config defaults if not provided
+        if max_batch_size is None:
+            max_batch_size = config.get_max_batch_size()
+        max_batch_size = max(1, max_batch_size)
+
+        # Duplicate texts share one model call and are fanned back out at the end
+        unique_texts, mapping = dedupe_texts(texts)
+        plan = _BatchPlan(results=[None] * len(unique_texts), mapping=mapping)
+
+        selected_formats, _ = self._formats_for(categories, category_map)
+
+        pending = []
+        model_categories = categories
+        for position, text in enumerate(unique_texts):
+            if not text:
+                plan.results[position] = RedactionResult({"error": "No text provided"}, "")
+                continue
+
+            skipped = self._local_result(text, categories, category_map)
+            if skipped is not None:
+                plan.results[position] = skipped
+                continue
+
+            plan.cache_keys[position] = response_cache_key(self.ollama_model_name, text, selected_formats)
+            cached = self._detection_cache.get(plan.cache_keys[position])
+            if cached is not None:
+                plan.results[position] = RedactionResult(dict(cached[0]), cached[1])
+            else:
+                plan.model_texts[position], model_categories, plan.local_results[position] = (
+                    self._split_local_redaction(text, categories, category_map)
+                )
+                pending.append(position)
+
+        _, plan.categories_str = self._formats_for(model_categories, category_map)
+        plan.chunks = [pending[start:start + max_batch_size] for start in range(0, len(pending), max_batch_size)]
+
+        logger.info(
+            f"Processing batch of {len(pending)} texts in {len(plan.chunks)} prompts for {len(categories)} "
+            f"categories ({len(texts) - len(unique_texts)} duplicates skipped)"
+        )
+        return plan
+
+    def _store_batch_results(
+        self,
+        plan: _BatchPlan,
+        chunk: List[int],
+        chunk_results: List[RedactionResult]
+    ) -> None:
+        """Merge local detections into one chunk's results, cache them and store them in the plan."""
+        for position, result in zip(chunk, chunk_results):
+            result = self._merge_local_detection(plan.local_results[position], result)
+            plan.results[position] = self._cache_detection(plan.cache_keys[position], result)
+
+    @rate_limited(max_calls=60, period=60, name="ollama")
+    def _process_batch_chunk(self, texts: List[str], categories_str: str) -> List[RedactionResult]:
+        """
+        Send one batch of texts to the Ollama model and split the response.
 
-            # Call the Ollama model with retry logic
-            retry_config = config.get_retry_config()
+        Args:
+            texts: Non-empty texts that fit in a single batched prompt
+            categories_str: Newline-separated placeholder patterns for the selected categories
+
+        Returns:
+            List of RedactionResult (JSON output dict, redacted text string) in the same order as ``texts``
+        """
+        try:
             output = retry_api_call(
                 self.ollama_model.invoke,
-                formatted_prompt,
-                max_attempts=retry_config['max_attempts'],
-                min_wait=retry_config['min_wait'],
-                max_wait=retry_config['max_wait']
+                self._build_batch_prompt(texts, categories_str),
+                format=prompt.batch_schema,
+                **self._retry_kwargs
             )
+            return self._parse_batch_output(output, len(texts))
 
-            logger.debug(f"Raw Ollama output: {output[:200]}...")  # Log first 200 chars
+        except Exception as e:
+            return self._batch_error(e, len(texts))
 
-            # Parse JSON output from the model
-            try:
-                parsed_output = json.loads(output)
-                redacted_text = parsed_output.get("redacted_text", "")
-                detected_count = len(parsed_output.get('detected_sensitive_data', []))
+    @rate_limited(max_calls=60, period=60, name="ollama")
+    async def _aprocess_batch_chunk(self, texts: List[str], categories_str: str) -> List[RedactionResult]:
+        """Async version of _process_batch_chunk."""
+        try:
+            async with self._get_async_semaphore():
+                output = await aretry_api_call(
+                    self.ollama_model.ainvoke,
+                    self._build_batch_prompt(texts, categories_str),
+                    format=prompt.batch_schema,
+                    **self._retry_kwargs
+                )
+            return self._parse_batch_output(output, len(texts))
 
-                logger.info(f"Successfully parsed model output, detected {detected_count} sensitive items")
+        except Exception as e:
+            return self._batch_error(e, len(texts))
 
-                # Log sensitive data only if configured to do so (WARNING: disable for production)
-                if config.should_log_sensitive_data():
-                    logger.debug(f"Detected sensitive data: {parsed_output.get('detected_sensitive_data', [])}")
+    @staticmethod
+    def _build_batch_prompt(texts: List[str], categories_str: str) -> str:
+        """Format the batched prompt with one numbered block per text."""
+        # Number each request so results can be matched back by index
+        requests_block = "\n\n".join(
+            f"{_REQUEST_HEADER_HEAD}{index}{_REQUEST_HEADER_TAIL}\n{text}"
+            for index, text in enumerate(texts, start=1)
+        )
+        head, tail = _batch_prompt_parts(categories_str)
+        return head + requests_block + tail
 
-                return parsed_output, redacted_text
+    def _parse_batch_output(self, output: str, count: int) -> List[RedactionResult]:
+        """Split the model's batched JSON output into one result per request."""
+        try:
+            parsed_output = orjson.loads(output)
+            entries = parsed_output.get("results", []) if isinstance(parsed_output, dict) else parsed_output
+            by_index = {
+                entry.get("index"): entry for entry in entries
+                if isinstance(entry, dict)
+            }
+        except (orjson.JSONDecodeError, AttributeError, TypeError) as e:
+            logger.error(f"Failed to parse batch output as JSON: {str(e)}")
+            error_msg = "Failed to parse output as JSON. The model may not have produced valid JSON format."
+            return [RedactionResult({"error": error_msg}, "") for _ in range(count)]
 
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse model output as JSON: {str(e)}")
-                logger.debug(f"Raw output: {output}")
+        results = []
+        for index in range(1, count + 1):
+            entry = by_index.get(index)
+            if entry is None:
+                logger.warning(f"Batch output is missing a result for request {index}")
+                results.append(RedactionResult({"error": "The model did not return a result for this text."}, ""))
+                continue
 
-                error_msg = "Failed to parse output as JSON. The model may not have produced valid JSON format."
-                if config.should_sanitize_error_messages():
-                    # Return sanitized error for security
-                    return {"error": error_msg}, ""
-                else:
-                    # Return detailed error for debugging
-                    return {"error": error_msg, "raw_output": output}, ""
+            entry.pop("index", None)
+            results.append(RedactionResult(entry, entry.get("redacted_text", "")))
 
-        except Exception as e:
-            logger.error(f"Error in sensitive information detection: {str(e)}", exc_info=True)
+        detected_count = sum(len(result.get('detected_sensitive_data', [])) for result, _ in results)
+        logger.info(f"Successfully parsed batch output, detected {detected_count} sensitive items")
 
-            error_msg = "An error occurred during sensitive information detection."
-            if config.should_sanitize_error_messages():
-                return {"error": error_msg}, ""
-            else:
-                return {"error": f"{error_msg} Details: {str(e)}"}, ""
+        if self._log_sensitive_data:
+            logger.debug(f"Detected sensitive data: {[result.get('detected_sensitive_data', []) for result, _ in results]}")
+
+        return results
+
+    def _batch_error(self, e: Exception, count: int) -> List[RedactionResult]:
+        """Log a batch failure and build one (sanitized) error result per request."""
+        _log_failure("Error in batch sensitive information detection", e)
 
-    @rate_limited(max_calls=60, period=60)
+        error_msg = "An error occurred during sensitive information detection."
+        if not self._sanitize_errors:
+            error_msg = f"{error_msg} Details: {str(e)}"
+        return [RedactionResult({"error": error_msg}, "") for _ in range(count)]
+
+    @rate_limited(max_calls=60, period=60, name="openai")
     def submit_to_openai(self, redacted_text: str) -> str:
         """
         Submit redacted text to OpenAI for processing.
@@ -224,50 +1147,239 @@ class SensitiveInformationRedactor:
             >>> redactor = SensitiveInformationRedactor()
             >>> response = redactor.submit_to_openai("My email is [EMAIL-1]")
         """
-        # Input validation
-        if not redacted_text:
-            logger.warning("Empty text provided for OpenAI processing")
-            return "No text provided for processing."
-
-        if not self.openai_model:
-            logger.error("OpenAI model not available - missing API key")
-            return "OpenAI processing is not available. Please add an API key in the OpenAI Config tab."
+        unavailable = self._validate_openai_input(redacted_text)
+        if unavailable is not None:
+            return unavailable
 
         try:
-            # Prepare the instruction with redacted text
-            instruction_prefix = config.get_openai_instruction_prefix()
-            final_prompt = instruction_prefix + redacted_text
+            final_prompt = self._build_openai_prompt(redacted_text)
 
-            logger.info("Submitting redacted text to OpenAI")
-            logger.debug(f"Prompt length: {len(final_prompt)} characters")
+            cache_key = response_cache_key(self.openai_model_name, final_prompt)
+            cached = self._openai_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Returning cached OpenAI response")
+                return cached
 
             # Call the OpenAI model with retry logic
-            retry_config = config.get_retry_config()
             response = retry_api_call(
                 self.openai_model.invoke,
                 final_prompt,
-                max_attempts=retry_config['max_attempts'],
-                min_wait=retry_config['min_wait'],
-                max_wait=retry_config['max_wait']
+                **self._retry_kwargs
             )
 
-            # Extract content from response
-            if hasattr(response, 'content'):
-                logger.info("Successfully received response from OpenAI")
-                logger.debug(f"Response length: {len(response.content)} characters")
-                return response.content
+            return self._cache_openai_content(cache_key, response)
+
+        except Exception as e:
+            return self._openai_error(e)
+
+    @rate_limited(max_calls=60, period=60, name="openai")
+    async def asubmit_to_openai(self, redacted_text: str) -> str:
+        """
+        Async version of submit_to_openai.
+
+        Args:
+            redacted_text: Redacted text to submit to OpenAI
+
+        Returns:
+            Response from OpenAI model or error message
+
+        Raises:
+            None - All exceptions are caught and returned as error strings
+
+        Example:
+            >>> redactor = SensitiveInformationRedactor()
+            >>> response = await redactor.asubmit_to_openai("My email is [EMAIL-1]")
+        """
+        unavailable = self._validate_openai_input(redacted_text)
+        if unavailable is not None:
+            return unavailable
+
+        try:
+            final_prompt = self._build_openai_prompt(redacted_text)
+
+            cache_key = response_cache_key(self.openai_model_name, final_prompt)
+            cached = self._openai_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Returning cached OpenAI response")
+                return cached
+
+            # Call the OpenAI model with retry logic
+            async with self._get_async_semaphore():
+                response = await aretry_api_call(
+                    self.openai_model.ainvoke,
+                    final_prompt,
+                    **self._retry_kwargs
+                )
+
+            return self._cache_openai_content(cache_key, response)
+
+        except Exception as e:
+            return self._openai_error(e)
+
+    @rate_limited(max_calls=60, period=60, name="openai")
+    async def astream_openai(self, redacted_text: str) -> AsyncIterator[str]:
+        """
+        Stream the OpenAI response for redacted text as it is generated.
+
+        Each yielded value is the response accumulated so far, so callers can
+        display it directly. Streams are not retried, since a partial response
+        may already have been shown.
+
+        Args:
+            redacted_text: Redacted text to submit to OpenAI
+
+        Yields:
+            Accumulated response text, or a single error message
+
+        Raises:
+            None - All exceptions are caught and yielded as error strings
+
+        Example:
+            >>> redactor = SensitiveInformationRedactor()
+            >>> async for partial in redactor.astream_openai("My email is [EMAIL-1]"):
+            >>>     print(partial)
+        """
+        unavailable = self._validate_openai_input(redacted_text)
+        if unavailable is not None:
+            yield unavailable
+            return
+
+        try:
+            final_prompt = self._build_openai_prompt(redacted_text)
+
+            cache_key = response_cache_key(self.openai_model_name, final_prompt)
+            cached = self._openai_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Returning cached OpenAI response")
+                yield cached
+                return
+
+            response = ""
+            async with self._get_async_semaphore():
+                async for fragment in self.openai_model.astream(final_prompt):
+                    response += fragment
+                    yield response
+
+            if response:
+                logger.info("Successfully streamed response from OpenAI")
+                logger.debug(f"Response length: {len(response)} characters")
+                self._openai_cache.set(cache_key, response)
             else:
                 logger.warning("No content in OpenAI response")
-                return "No response content available."
+                yield "No response content available."
 
         except Exception as e:
-            logger.error(f"Error in OpenAI processing: {str(e)}", exc_info=True)
+            yield self._openai_error(e)
 
-            error_msg = "An error occurred while processing with OpenAI."
-            if config.should_sanitize_error_messages():
-                return error_msg
-            else:
-                return f"{error_msg} Details: {str(e)}"
+    def _validate_openai_input(self, redacted_text: str) -> Optional[str]:
+        """Return a message if the text cannot be sent to OpenAI, or None if it can."""
+        if not redacted_text:
+            logger.warning("Empty text provided for OpenAI processing")
+            return "No text provided for processing."
+
+        if not self.openai_model:
+            logger.error("OpenAI model not available - missing API key")
+            return "OpenAI processing is not available. Please add an API key in the OpenAI Config tab."
+
+        return None
+
+    def _build_openai_prompt(self, redacted_text: str) -> str:
+        """Prepend the configured instruction to the redacted text."""
+        final_prompt = self._openai_instruction_prefix + redacted_text
+
+        logger.info("Submitting redacted text to OpenAI")
+        logger.debug(f"Prompt length: {len(final_prompt)} characters")
+
+        return final_prompt
+
+    def _cache_openai_content(self, cache_key: str, response: str) -> str:
+        """Cache and return a non-empty OpenAI response, or a placeholder message if empty."""
+        if not response:
+            logger.warning("No content in OpenAI response")
+            return "No response content available."
+
+        logger.info("Successfully received response from OpenAI")
+        logger.debug(f"Response length: {len(response)} characters")
+        self._openai_cache.set(cache_key, response)
+        return response
+
+    def _openai_error(self, e: Exception) -> str:
+        """Log an OpenAI failure and build the (sanitized) error message."""
+        _log_failure("Error in OpenAI processing", e)
+
+        error_msg = "An error occurred while processing with OpenAI."
+        if self._sanitize_errors:
+            return error_msg
+        else:
+            return f"{error_msg} Details: {str(e)}"
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Response cache statistics.
+
+        Returns:
+            Dictionary with hit and miss counts for the detection and OpenAI caches
+        """
+        return {
+            "detection_cache_hits": self._detection_cache.hits,
+            "detection_cache_misses": self._detection_cache.misses,
+            "openai_cache_hits": self._openai_cache.hits,
+            "openai_cache_misses": self._openai_cache.misses,
+        }
+
+    def clear_cache(self) -> None:
+        """Clear the detection and OpenAI response caches."""
+        self._detection_cache.clear()
+        self._openai_cache.clear()
+        logger.info("Response caches cleared")
+
+    def close(self) -> None:
+        """
+        Close the pooled sync Ollama and OpenAI HTTP connections that were opened.
+
+        The clients are dropped, so the next request opens fresh sessions.
+        Use aclose() from async code to also close the async sessions.
+        """
+        ollama_model = self.__dict__.pop('ollama_model', None)
+        if ollama_model is not None:
+            ollama_model.close()
+        sessions = self._drop_openai_sessions()
+        if sessions is not None:
+            sessions[0].close()
+
+    async def aclose(self) -> None:
+        """Close every pooled Ollama and OpenAI HTTP connection that was opened, sync and async."""
+        ollama_model = self.__dict__.pop('ollama_model', None)
+        if ollama_model is not None:
+            await ollama_model.aclose()
+        sessions = self._drop_openai_sessions()
+        if sessions is not None:
+            http_client, http_async_client = sessions
+            http_client.close()
+            await http_async_client.aclose()
+
+    def _drop_openai_sessions(self) -> Optional[Tuple[httpx.Client, httpx.AsyncClient]]:
+        """Forget the OpenAI sessions and the model bound to them; returns the sessions if opened."""
+        sessions = self.__dict__.pop('_openai_sessions', None)
+        if sessions is not None:
+            self.__dict__.pop('openai_model', None)
+        return sessions
+
+    def _build_openai_model(self, api_key: str) -> OpenAIClient:
+        """Create an OpenAI client on the shared HTTP sessions and remember its key."""
+        http_client, http_async_client = self._openai_sessions
+        model = OpenAIClient(
+            model=self.openai_model_name,
+            api_key=api_key,
+            temperature=config.get_openai_temperature(),
+            max_tokens=config.get_openai_max_tokens(),
+            timeout=config.get_openai_timeout(),
+            http_client=http_client,
+            http_async_client=http_async_client
+        )
+        self._openai_api_key = api_key
+        return model
 
     def update_openai_api_key(self, new_api_key: str) -> bool:
         """
@@ -288,14 +1400,12 @@ class SensitiveInformationRedactor:
                 logger.warning("Attempted to update with empty API key")
                 return False
 
-            # Update the OpenAI model
-            self.openai_model = ChatOpenAI(
-                model=config.get_openai_model_name(),
-                api_key=new_api_key,
-                temperature=config.get_openai_temperature(),
-                max_tokens=config.get_openai_max_tokens(),
-                timeout=config.get_openai_timeout()
-            )
+            if self.openai_model is not None and new_api_key == self._openai_api_key:
+                logger.info("OpenAI API key unchanged; keeping the existing model")
+                return True
+
+            # Update the OpenAI model; it reuses the pooled HTTP sessions
+            self.openai_model = self._build_openai_model(new_api_key)
             logger.info("OpenAI model updated with new API key")
             return True
 
@@ -0,0 +1,178 @@
+"""
+Application Settings Snapshot
+
+Resolves the values the Gradio application needs from config.yaml once, at
+import time, into immutable dataclasses. Handlers and UI construction read
+plain attributes (e.g. SETTINGS.ui_title, SETTINGS.sanitize_errors) instead
+of walking the configuration dictionaries on every call.
+
+Author: Harsh
+"""
+
+import logging
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from utils import load_config
+from utils.config_loader import ConfigLoader
+
+
+@dataclass(frozen=True, slots=True)
+class LoggingSettings:
+    """
+    Resolved logging configuration.
+
+    Attributes:
+        level_name: Logging level name from config (e.g. "INFO")
+        level: Numeric logging level resolved from level_name
+        format: Log record format string
+        file: Path of the rotating log file
+        console: Whether to log to the console
+        file_logging: Whether to log to the rotating file
+        max_bytes: Maximum log file size before rotation
+        backup_count: Number of rotated log files to keep
+    """
+
+    level_name: str
+    level: int
+    format: str
+    file: str
+    console: bool
+    file_logging: bool
+    max_bytes: int
+    backup_count: int
+
+    @classmethod
+    def from_dict(cls, logging_config: Mapping) -> 'LoggingSettings':
+        """
+        Build logging settings from the config's logging section.
+
+        Args:
+            logging_config: Dictionary returned by ConfigLoader.get_logging_config()
+
+        Returns:
+            LoggingSettings instance
+        """
+        level_name = str(logging_config.get('level', 'INFO')).upper()
+        return cls(
+            level_name=level_name,
+            level=getattr(logging, level_name, logging.INFO),
+            format=logging_config.get('format', '%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
+            file=logging_config.get('file', 'app.log'),
+            console=logging_config.get('console', True),
+            file_logging=logging_config.get('file_logging', True),
+            max_bytes=logging_config.get('max_bytes', 10485760),
+            backup_count=logging_config.get('backup_count', 5)
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class AppSettings:
+    """
+    Immutable snapshot of the settings used by the Gradio application.
+
+    Example:
+        >>> from settings import SETTINGS
+        >>> SETTINGS.ui_title
+        'Sensitive Information Redaction Tool'
+    """
+
+    # Models
+    ollama_model_name: str
+    openai_model_name: str
+    ollama_warmup: bool
+    ollama_num_parallel: Optional[int]
+
+    # Rate limiting
+    rate_limiting_enabled: bool
+    max_requests_per_minute: int
+    max_tokens_per_minute: int
+
+    # Logging
+    logging: LoggingSettings
+
+    # Request queueing
+    queue_max_size: int
+    concurrency_limit: int
+    openai_concurrency_limit: int
+
+    # UI
+    ui_title: str
+    ui_description: str
+    ui_share: bool
+    server_host: str
+    server_port: int
+    input_lines: int
+    input_placeholder: str
+    output_lines: int
+    category_default_all: bool
+
+    # Redaction categories
+    category_options: Tuple[str, ...]
+    category_map: Mapping[str, str]
+
+    # Security and features
+    sanitize_errors: bool
+    batch_processing_enabled: bool
+    batch_strategy: str
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader) -> 'AppSettings':
+        """
+        Resolve all application settings from a ConfigLoader.
+
+        Args:
+            config: Loaded configuration
+
+        Returns:
+            AppSettings instance
+        """
+        server_config = config.get_server_config()
+        input_config = config.get_input_text_config()
+        output_config = config.get_output_text_config()
+
+        return cls(
+            ollama_model_name=config.ollama_model_name,
+            openai_model_name=config.openai_model_name,
+            ollama_warmup=config.should_warmup_ollama_model(),
+            ollama_num_parallel=config.get_ollama_num_parallel(),
+            rate_limiting_enabled=config.is_rate_limiting_enabled(),
+            max_requests_per_minute=config.get_max_requests_per_minute(),
+            max_tokens_per_minute=config.get_max_tokens_per_minute(),
+            logging=LoggingSettings.from_dict(config.get_logging_config()),
+            queue_max_size=config.get_queue_max_size(),
+            concurrency_limit=config.get_concurrency_limit(),
+            openai_concurrency_limit=config.get_openai_concurrency_limit(),
+            ui_title=config.ui_title,
+            ui_description=config.get_ui_description(),
+            ui_share=config.get_ui_share(),
+            server_host=server_config.get('host', '127.0.0.1'),
+            server_port=server_config.get('port', 7860),
+            input_lines=input_config.get('lines', 10),
+            input_placeholder=input_config.get('placeholder', 'Enter text to analyze...'),
+            output_lines=output_config.get('lines', 10),
+            category_default_all=config.get_category_selection_default_all(),
+            category_options=config.category_options,
+            category_map=MappingProxyType(config.category_map),
+            sanitize_errors=config.should_sanitize_error_messages(),
+            batch_processing_enabled=config.is_batch_processing_enabled(),
+            batch_strategy=config.get_batch_strategy()
+        )
+
+
+def load_settings(config: Optional[ConfigLoader] = None) -> AppSettings:
+    """
+    Build an AppSettings snapshot.
+
+    Args:
+        config: Loaded configuration (uses load_config() if None)
+
+    Returns:
+        AppSettings instance
+    """
+    return AppSettings.from_config(config if config is not None else load_config())
+
+
+# Snapshot taken once at import time
+SETTINGS = load_settings()
@@ -8,154 +8,162 @@ Author: Harsh
 
 import os
 import sys
-import tempfile
 import pytest
+import orjson
+import yaml
 from pathlib import Path
-from unittest.mock import Mock, MagicMock
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock, patch
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 
-@pytest.fixture
-def temp_config_file():
-    """Create a temporary config.yaml file for testing."""
-    config_content = """
-models:
-  ollama:
-    name: "llama3.2:latest"
-    timeout: 120
-  openai:
-    name: "gpt-3.5-turbo"
-    timeout: 60
-    temperature: 0.7
-    max_tokens: 2000
-
-retry:
-  max_attempts: 3
-  min_wait: 2
-  max_wait: 10
-  multiplier: 2
-
-rate_limiting:
-  enabled: true
-  max_requests_per_minute: 60
-  max_tokens_per_minute: 90000
-
-logging:
-  level: "INFO"
-  format: "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-  file: "app.log"
-  console: true
-  file_logging: true
-  max_bytes: 10485760
-  backup_count: 5
-
-ui:
-  title: "Sensitive Information Redaction Tool"
-  description: "Identify and redact sensitive information from text"
-  theme: "default"
-  share: false
-  server:
-    port: 7860
-    host: "127.0.0.1"
-  components:
-    input_text:
-      lines: 10
-      placeholder: "Enter text to analyze..."
-    output_text:
-      lines: 10
-    category_selection:
-      default_all: false
-
-categories:
-  enabled:
-    - name: "Email Addresses"
-      placeholder: "[EMAIL-{index}]"
-      description: "Redact email addresses"
-    - name: "Phone Numbers"
-      placeholder: "[PHONE-{index}]"
-      description: "Redact phone numbers"
-
-openai_processing:
-  instruction_prefix: "Process the following text:\\n"
-  enable_automatic_submit: false
-
-security:
-  validate_api_key_on_startup: true
-  sanitize_error_messages: true
-  log_sensitive_data: false
-
-features:
-  batch_processing: false
-  custom_rules: false
-  export_results: true
-  api_mode: false
-"""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        f.write(config_content)
-        temp_path = f.name
-
-    yield temp_path
-
-    # Cleanup
-    if os.path.exists(temp_path):
-        os.remove(temp_path)
+# Test configuration; the single source of truth for config-dependent tests.
+# Fixtures and tests must not mutate it (patch ConfigLoader getters instead).
+CONFIG_DICT = {
+    'models': {
+        'ollama': {'name': 'llama3.2:latest', 'timeout': 120},
+        'openai': {'name': 'gpt-3.5-turbo', 'timeout': 60, 'temperature': 0.7, 'max_tokens': 2000},
+    },
+    'retry': {'max_attempts': 3, 'min_wait': 2, 'max_wait': 10, 'multiplier': 2},
+    'rate_limiting': {'enabled': True, 'max_requests_per_minute': 60, 'max_tokens_per_minute': 90000},
+    'logging': {
+        'level': 'INFO',
+        'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        'file': 'app.log',
+        'console': True,
+        'file_logging': True,
+        'max_bytes': 10485760,
+        'backup_count': 5,
+    },
+    'ui': {
+        'title': 'Sensitive Information Redaction Tool',
+        'description': 'Identify and redact sensitive information from text',
+        'theme': 'default',
+        'share': False,
+        'server': {'port': 7860, 'host': '127.0.0.1'},
+        'components': {
+            'input_text': {'lines': 10, 'placeholder': 'Enter text to analyze...'},
+            'output_text': {'lines': 10},
+            'category_selection': {'default_all': False},
+        },
+    },
+    'categories': {
+        'enabled': [
+            {'name': 'Email Addresses', 'placeholder': '[EMAIL-{index}]', 'description': 'Redact email addresses'},
+            {'name': 'Phone Numbers', 'placeholder': '[PHONE-{index}]', 'description': 'Redact phone numbers'},
+        ],
+    },
+    'openai_processing': {
+        'instruction_prefix': 'Process the following text:\n',
+        'enable_automatic_submit': False,
+    },
+    'performance': {
+        'batch_strategy': 'combined',
+        'batch_concurrency': 3,
+        'max_batch_size': 4,
+        'max_concurrent_requests': 10,
+        'queue_max_size': 20,
+        'concurrency_limit': 4,
+        'openai_concurrency_limit': 2,
+        'prefilter_enabled': False,
+        'deterministic_redaction': True,
+        'concise_prompt_max_chars': 512,
+        'concise_prompt_max_categories': 2,
+        'redaction_cache_size': 16,
+        'openai_cache_size': 8,
+    },
+    'security': {
+        'validate_api_key_on_startup': True,
+        'sanitize_error_messages': True,
+        'log_sensitive_data': False,
+    },
+    'features': {
+        'batch_processing': False,
+        'custom_rules': False,
+        'export_results': True,
+        'api_mode': False,
+    },
+}
+
+
+@pytest.fixture(scope="session")
+def temp_config_file(tmp_path_factory):
+    """Write CONFIG_DICT to a config.yaml file once per test session."""
+    path = tmp_path_factory.mktemp("config") / "config.yaml"
+    with open(path, 'w') as f:
+        yaml.dump(CONFIG_DICT, f, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper))
+    return str(path)
 
 
 @pytest.fixture
-def temp_env_file():
+def temp_env_file(tmp_path):
     """Create a temporary .env file for testing."""
-    env_content = "OPENAI_API_KEY=test-key-123\n"
+    path = tmp_path / ".env"
+    path.write_text("OPENAI_API_KEY=test-key-123\n")
+    return str(path)
 
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.env', delete=False) as f:
-        f.write(env_content)
-        temp_path = f.name
 
-    yield temp_path
+# Default detection response, serialized once
+MOCK_OLLAMA_RESPONSE = orjson.dumps({
+    "redacted_text": "Test [EMAIL-1]",
+    "detected_sensitive_data": [{"type": "email", "value": "test@example.com", "placeholder": "[EMAIL-1]"}]
+}).decode()
 
-    # Cleanup
-    if os.path.exists(temp_path):
-        os.remove(temp_path)
+
+@pytest.fixture(scope="session")
+def make_mock_ollama():
+    """
+    Provide a factory for mock Ollama models.
+
+    Each call returns a fresh MagicMock whose invoke() returns the given
+    response dict as JSON (the default detection response if None).
+    """
+    def make(response_json: Optional[Dict[str, Any]] = None) -> MagicMock:
+        mock = MagicMock()
+        mock.invoke.return_value = (
+            MOCK_OLLAMA_RESPONSE if response_json is None else orjson.dumps(response_json).decode()
+        )
+        return mock
+    return make
 
 
 @pytest.fixture
-def mock_ollama_model():
+def mock_ollama_model(make_mock_ollama):
     """Create a mock Ollama model for testing."""
-    mock = MagicMock()
-    mock.invoke.return_value = '{"redacted_text": "Test [EMAIL-1]", "detected_sensitive_data": [{"type": "email", "value": "test@example.com", "placeholder": "[EMAIL-1]"}]}'
-    return mock
+    return make_mock_ollama()
 
 
 @pytest.fixture
 def mock_openai_model():
     """Create a mock OpenAI model for testing."""
     mock = MagicMock()
-    response = Mock()
-    response.content = "This is a test response from OpenAI"
-    mock.invoke.return_value = response
+    mock.invoke.return_value = "This is a test response from OpenAI"
     return mock
 
 
-@pytest.fixture
+# Sample fixtures are shared by the whole session, so they are immutable
+@pytest.fixture(scope="session")
 def sample_text():
     """Provide sample text for testing redaction."""
     return "My email is john.doe@example.com and my phone is 555-123-4567"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_categories():
     """Provide sample categories for testing."""
-    return ["Email Addresses", "Phone Numbers"]
+    return ("Email Addresses", "Phone Numbers")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_category_map():
     """Provide sample category map for testing."""
-    return {
+    return MappingProxyType({
         "Email Addresses": "[EMAIL-1]",
         "Phone Numbers": "[PHONE-1]"
-    }
+    })
 
 
 @pytest.fixture(autouse=True)
@@ -167,6 +175,41 @@ def reset_config_singleton():
     ConfigLoader._instance = None
 
 
+@pytest.fixture(autouse=True)
+def reset_global_rate_limiter():
+    """Reset the global rate limiter between tests so test order does not matter."""
+    import utils.rate_limiter
+    utils.rate_limiter._global_limiter = None
+    yield
+    utils.rate_limiter._global_limiter = None
+
+
+@pytest.fixture(autouse=True)
+def reset_retry_state():
+    """Forget circuit breakers, attempt history, cached results and stats between tests so one test's calls do not affect another."""
+    import utils.retry_utils
+    utils.retry_utils._breakers.clear()
+    utils.retry_utils._stale_results.clear()
+    utils.retry_utils._response_cache.clear()
+    utils.retry_utils.reset_retry_stats()
+    utils.retry_utils._attempt_windows.clear()
+    yield
+    utils.retry_utils._breakers.clear()
+    utils.retry_utils._stale_results.clear()
+    utils.retry_utils._response_cache.clear()
+    utils.retry_utils.reset_retry_stats()
+    utils.retry_utils._attempt_windows.clear()
+
+
+@pytest.fixture(autouse=True)
+def refill_named_buckets():
+    """Refill the named rate_limited buckets (e.g. "ollama") so calls in one test do not throttle the next."""
+    import utils.rate_limiter
+    for bucket in utils.rate_limiter._named_limiters.values():
+        bucket._tokens = float(bucket.capacity)
+    yield
+
+
 @pytest.fixture(autouse=True)
 def clean_env():
     """Clean environment variables before and after tests."""
@@ -177,6 +220,34 @@ def clean_env():
     os.environ.update(original_env)
 
 
+class FakeClock:
+    """Controllable monotonic clock; sleeping advances it instead of waiting."""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward without sleeping."""
+        self.now += seconds
+
+    def sleep(self, seconds: float) -> None:
+        """Record a sleep and advance the clock by its length."""
+        self.sleeps.append(seconds)
+        self.now += max(0.0, seconds)
+
+
+@pytest.fixture
+def fake_clock():
+    """Replace the rate limiter clock and time.sleep with a FakeClock."""
+    clock = FakeClock()
+    with patch('utils.rate_limiter._monotonic', clock), patch('time.sleep', clock.sleep):
+        yield clock
+
+
 @pytest.fixture
 def mock_logger():
     """Create a mock logger for testing."""
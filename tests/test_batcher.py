@@ -0,0 +1,118 @@
+"""
+Unit Tests for Request Batcher
+
+Tests for grouping concurrent submissions into batch function calls.
+
+Author: Harsh
+"""
+
+import pytest
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.batcher import PromptBatcher
+
+
+@pytest.mark.unit
+class TestPromptBatcher:
+    """Test suite for PromptBatcher class."""
+
+    def test_single_item_round_trip(self):
+        """Test that a lone submission is dispatched after the delay."""
+        with PromptBatcher(lambda items: [item.upper() for item in items], max_delay_ms=1) as batcher:
+            assert batcher.batched_invoke("hello") == "HELLO"
+
+    def test_concurrent_items_share_a_batch(self):
+        """Test that items queued together are passed to one batch call in order."""
+        batches = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def batch_fn(items):
+            batches.append(list(items))
+            started.set()
+            release.wait(timeout=5)
+            return [item * 2 for item in items]
+
+        with PromptBatcher(batch_fn, max_batch_size=10, max_delay_ms=1) as batcher:
+            # The first batch blocks the worker while the rest queue up
+            first = batcher.submit(0)
+            started.wait(timeout=5)
+            futures = [batcher.submit(i) for i in range(1, 6)]
+            release.set()
+
+            assert first.result(timeout=5) == 0
+            assert [future.result(timeout=5) for future in futures] == [2, 4, 6, 8, 10]
+
+        assert batches == [[0], [1, 2, 3, 4, 5]]
+
+    def test_batches_respect_max_size(self):
+        """Test that no batch call receives more than max_batch_size items."""
+        batches = []
+        batcher = PromptBatcher(lambda items: batches.append(len(items)) or list(items), max_batch_size=3)
+        futures = [batcher.submit(i) for i in range(8)]
+        batcher.close()
+
+        assert [future.result() for future in futures] == list(range(8))
+        assert max(batches) <= 3
+        assert sum(batches) == 8
+
+    def test_batch_failure_reaches_every_caller(self):
+        """Test that an exception from the batch function is raised for each item in the group."""
+        def batch_fn(items):
+            raise ConnectionError("backend down")
+
+        batcher = PromptBatcher(batch_fn, max_delay_ms=50)
+        futures = [batcher.submit(i) for i in range(3)]
+        batcher.close()
+
+        for future in futures:
+            with pytest.raises(ConnectionError, match="backend down"):
+                future.result()
+
+    def test_base_exception_does_not_kill_worker(self):
+        """Test that a BaseException fails its group and later submissions are still processed."""
+        calls = []
+
+        def batch_fn(items):
+            calls.append(list(items))
+            if len(calls) == 1:
+                raise KeyboardInterrupt
+            return [item * 2 for item in items]
+
+        with PromptBatcher(batch_fn, max_delay_ms=1) as batcher:
+            with pytest.raises(KeyboardInterrupt):
+                batcher.submit(1).result(timeout=5)
+            assert batcher.submit(2).result(timeout=5) == 4
+
+    def test_wrong_result_count_is_an_error(self):
+        """Test that a batch function returning too few results fails the group."""
+        batcher = PromptBatcher(lambda items: items[:-1], max_delay_ms=50)
+        futures = [batcher.submit(i) for i in range(2)]
+        batcher.close()
+
+        for future in futures:
+            with pytest.raises(ValueError, match="1 results for 2 items"):
+                future.result()
+
+    def test_many_threads(self):
+        """Test that results reach the right callers under concurrent submission."""
+        with PromptBatcher(lambda items: [f"r{item}" for item in items], max_batch_size=4) as batcher:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(batcher.batched_invoke, range(40)))
+
+        assert results == [f"r{i}" for i in range(40)]
+
+    def test_submit_after_close_rejected(self):
+        """Test that a closed batcher refuses new items."""
+        batcher = PromptBatcher(lambda items: list(items))
+        batcher.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            batcher.submit("late")
+
+    def test_invalid_settings_rejected(self):
+        """Test that non-positive batch sizes and negative delays are rejected."""
+        with pytest.raises(ValueError, match="max_batch_size"):
+            PromptBatcher(lambda items: items, max_batch_size=0)
+        with pytest.raises(ValueError, match="max_delay_ms"):
+            PromptBatcher(lambda items: items, max_delay_ms=-1)
@@ -0,0 +1,166 @@
+"""
+Unit Tests for Result Cache
+
+Tests for the thread-safe LRU cache and cache key helpers.
+
+Author: Harsh
+"""
+
+import pytest
+import threading
+from utils.cache import LRUCache, response_cache_key, dedupe_texts
+
+
+@pytest.mark.unit
+class TestLRUCache:
+    """Test suite for LRUCache class."""
+
+    def test_set_and_get(self):
+        """Test storing and retrieving a value."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert len(cache) == 1
+
+    def test_missing_key_returns_default(self):
+        """Test that missing keys return the default value."""
+        cache = LRUCache(maxsize=2)
+
+        assert cache.get("missing") is None
+        assert cache.get("missing", "fallback") == "fallback"
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_overwrite_existing_key(self):
+        """Test that setting an existing key replaces its value."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("a", 2)
+
+        assert cache.get("a") == 2
+        assert len(cache) == 1
+
+    def test_zero_maxsize_disables_caching(self):
+        """Test that maxsize=0 never stores values."""
+        cache = LRUCache(maxsize=0)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_hit_and_miss_counters(self):
+        """Test that hits and misses are counted."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_clear(self):
+        """Test that clear removes all entries and resets counters."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.hits == 0
+
+    def test_concurrent_access(self):
+        """Test that concurrent writers never exceed maxsize."""
+        cache = LRUCache(maxsize=50)
+
+        def writer(offset):
+            for i in range(200):
+                cache.set(offset + i, i)
+                cache.get(offset + i // 2)
+
+        threads = [threading.Thread(target=writer, args=(n * 1000,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(cache) == 50
+
+
+@pytest.mark.unit
+class TestResponseCacheKey:
+    """Test suite for response_cache_key."""
+
+    def test_key_is_blake2b_hex_digest(self):
+        """Test that keys are fixed-size hex digests regardless of text size."""
+        key = response_cache_key("model", "x" * 100000, ["A"])
+
+        assert len(key) == 32
+        int(key, 16)
+
+    def test_deterministic(self):
+        """Test that identical inputs produce identical keys."""
+        assert response_cache_key("model", "t", ["A"]) == response_cache_key("model", "t", ["A"])
+
+    def test_category_order_ignored(self):
+        """Test that category order does not affect the key."""
+        assert response_cache_key("model", "t", ["B", "A"]) == response_cache_key("model", "t", ["A", "B"])
+
+    def test_different_text_different_key(self):
+        """Test that different texts produce different keys."""
+        assert response_cache_key("model", "t1", ["A"]) != response_cache_key("model", "t2", ["A"])
+
+    def test_different_model_different_key(self):
+        """Test that the model name is part of the key."""
+        assert response_cache_key("m1", "t", ["A"]) != response_cache_key("m2", "t", ["A"])
+
+    def test_unencodable_text_falls_back(self):
+        """Test that text orjson cannot encode still produces a stable key."""
+        text = "bad \ud800 surrogate"
+
+        assert response_cache_key("model", text) == response_cache_key("model", text)
+        assert response_cache_key("model", text) != response_cache_key("model", "bad surrogate")
+
+    def test_categories_optional(self):
+        """Test keys for texts without categories."""
+        assert response_cache_key("model", "t") == response_cache_key("model", "t", [])
+
+
+@pytest.mark.unit
+class TestDedupeTexts:
+    """Test suite for dedupe_texts."""
+
+    def test_collapses_duplicates(self):
+        """Test that duplicates map to the first occurrence."""
+        unique, mapping = dedupe_texts(["a", "b", "a", "c", "b"])
+
+        assert unique == ["a", "b", "c"]
+        assert mapping == [0, 1, 0, 2, 1]
+
+    def test_no_duplicates(self):
+        """Test that distinct texts are kept in order."""
+        unique, mapping = dedupe_texts(["x", "y"])
+
+        assert unique == ["x", "y"]
+        assert mapping == [0, 1]
+
+    def test_empty_input(self):
+        """Test that an empty list produces empty results."""
+        assert dedupe_texts([]) == ([], [])
+
+    def test_scatter_round_trip(self):
+        """Test that the mapping reconstructs the original list."""
+        texts = ["one", "", "two", "", "one"]
+        unique, mapping = dedupe_texts(texts)
+
+        assert [unique[i] for i in mapping] == texts
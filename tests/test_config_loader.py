@@ -8,8 +8,11 @@ Author: Harsh
 
 import pytest
 import os
+import threading
+import time
 import yaml
-from utils.config_loader import ConfigLoader, load_config
+from unittest.mock import patch
+from utils.config_loader import ConfigLoader, load_config, _flatten, _parse_config_file
 
 
 @pytest.mark.unit
@@ -23,6 +26,30 @@ class TestConfigLoader:
 
         assert config1 is config2, "ConfigLoader should be a singleton"
 
+    def test_concurrent_construction_loads_once(self, temp_config_file):
+        """Test that threads constructing the singleton together parse the file once."""
+        start = threading.Barrier(8)
+        instances = []
+
+        def slow_parse(*args):
+            time.sleep(0.05)
+            return {'models': {'ollama': {'name': 'threaded'}}}
+
+        def construct():
+            start.wait()
+            instances.append(ConfigLoader(temp_config_file))
+
+        with patch('utils.config_loader._parse_config_file', side_effect=slow_parse) as mock_parse:
+            threads = [threading.Thread(target=construct) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert mock_parse.call_count == 1
+        assert all(instance is instances[0] for instance in instances)
+        assert instances[0].get_ollama_model_name() == 'threaded'
+
     def test_load_config_convenience_function(self, temp_config_file):
         """Test the load_config convenience function."""
         config = load_config(temp_config_file)
@@ -43,6 +70,59 @@ class TestConfigLoader:
         with pytest.raises(yaml.YAMLError):
             ConfigLoader(str(invalid_config))
 
+    def test_unchanged_file_parsed_once(self, tmp_path):
+        """Test that reloading an unchanged file reuses the parsed YAML but not the dict."""
+        config_file = tmp_path / "cached.yaml"
+        config_file.write_text("performance:\n  max_batch_size: 5\n")
+
+        first = ConfigLoader(str(config_file))
+        first.config['performance']['max_batch_size'] = 99
+        ConfigLoader._instance = None
+        misses = _parse_config_file.cache_info().misses
+        second = ConfigLoader(str(config_file))
+
+        assert _parse_config_file.cache_info().misses == misses
+        assert second.get_max_batch_size() == 5
+
+    def test_config_flattened_to_dotted_keys(self, temp_config_file):
+        """Test that sections and values are indexed by their dotted path."""
+        config = ConfigLoader(temp_config_file)
+
+        assert config._flat['models.ollama.name'] == config.config['models']['ollama']['name']
+        assert config._flat['retry'] is config.config['retry']
+        assert 'models.ollama.missing' not in config._flat
+
+    def test_flatten_nested_dict(self):
+        """Test flattening keeps every level and does not descend into lists."""
+        flat = _flatten({'a': {'b': {'c': 1}, 'd': [{'e': 2}]}})
+
+        assert flat == {
+            'a': {'b': {'c': 1}, 'd': [{'e': 2}]},
+            'a.b': {'c': 1},
+            'a.b.c': 1,
+            'a.d': [{'e': 2}]
+        }
+
+    def test_empty_file_uses_defaults(self, tmp_path):
+        """Test that an empty config file falls back to every default."""
+        config_file = tmp_path / "empty.yaml"
+        config_file.write_text("")
+
+        assert ConfigLoader(str(config_file)).get_ollama_timeout() == 120
+
+    def test_modified_file_parsed_again(self, tmp_path):
+        """Test that editing the file invalidates the cached parse."""
+        config_file = tmp_path / "edited.yaml"
+        config_file.write_text("performance:\n  max_batch_size: 5\n")
+        ConfigLoader(str(config_file))
+        ConfigLoader._instance = None
+
+        config_file.write_text("performance:\n  max_batch_size: 12\n")
+        stat = os.stat(config_file)
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert ConfigLoader(str(config_file)).get_max_batch_size() == 12
+
 
 @pytest.mark.unit
 class TestModelConfiguration:
@@ -58,6 +138,32 @@ class TestModelConfiguration:
         config = ConfigLoader(temp_config_file)
         assert config.get_ollama_timeout() == 120
 
+    def test_ollama_num_parallel_from_environment(self, temp_config_file, monkeypatch):
+        """Test that the server parallelism falls back to OLLAMA_NUM_PARALLEL."""
+        config = ConfigLoader(temp_config_file)
+
+        monkeypatch.delenv('OLLAMA_NUM_PARALLEL', raising=False)
+        assert config.get_ollama_num_parallel() is None
+
+        monkeypatch.setenv('OLLAMA_NUM_PARALLEL', '4')
+        assert config.get_ollama_num_parallel() == 4
+
+        monkeypatch.setenv('OLLAMA_NUM_PARALLEL', 'many')
+        assert config.get_ollama_num_parallel() is None
+
+    def test_ollama_num_parallel_from_config(self, tmp_path, monkeypatch):
+        """Test that models.ollama.num_parallel takes precedence over the environment."""
+        config_file = tmp_path / "parallel.yaml"
+        config_file.write_text("models:\n  ollama:\n    num_parallel: 2\n")
+        monkeypatch.setenv('OLLAMA_NUM_PARALLEL', '8')
+
+        assert ConfigLoader(str(config_file)).get_ollama_num_parallel() == 2
+
+    def test_get_ollama_temperature_default(self, temp_config_file):
+        """Test that Ollama decoding defaults to temperature 0."""
+        config = ConfigLoader(temp_config_file)
+        assert config.get_ollama_temperature() == 0.0
+
     def test_get_openai_model_name(self, temp_config_file):
         """Test getting OpenAI model name."""
         config = ConfigLoader(temp_config_file)
@@ -221,6 +327,22 @@ class TestCategoryConfiguration:
         assert "Email Addresses" in options
         assert "Phone Numbers" in options
 
+    def test_category_properties_are_cached(self, temp_config_file):
+        """Test that category options and map are built once and reused."""
+        config = ConfigLoader(temp_config_file)
+
+        assert config.category_options is config.get_category_options()
+        assert config.category_map is config.get_category_map()
+        assert config.category_options == ("Email Addresses", "Phone Numbers")
+
+    def test_cached_properties_match_getters(self, temp_config_file):
+        """Test that cached properties return the same values as the getters."""
+        config = ConfigLoader(temp_config_file)
+
+        assert config.ui_title == config.get_ui_title()
+        assert config.ollama_model_name == config.get_ollama_model_name()
+        assert config.openai_model_name == config.get_openai_model_name()
+
 
 @pytest.mark.unit
 class TestOpenAIProcessingConfiguration:
@@ -239,6 +361,154 @@ class TestOpenAIProcessingConfiguration:
         assert config.is_auto_submit_enabled() is False
 
 
+@pytest.mark.unit
+class TestPerformanceConfiguration:
+    """Test suite for performance configuration methods."""
+
+    def test_get_max_batch_size(self, temp_config_file):
+        """Test getting max batch size."""
+        config = ConfigLoader(temp_config_file)
+        assert config.get_max_batch_size() == 4
+
+    def test_missing_max_batch_size_default(self, tmp_path):
+        """Test default max batch size when not in config."""
+        minimal_config = tmp_path / "minimal.yaml"
+        minimal_config.write_text("performance: {}")
+
+        config = ConfigLoader(str(minimal_config))
+        assert config.get_max_batch_size() == 8
+
+    def test_ollama_connection_defaults(self, temp_config_file):
+        """Test default Ollama host and connection pool settings."""
+        config = ConfigLoader(temp_config_file)
+        assert config.get_ollama_host() is None
+        assert config.get_ollama_connection_pool() == {
+            'max_connections': 100,
+            'max_keepalive_connections': 40,
+            'keepalive_expiry': 30.0
+        }
+
+    def test_ollama_warmup_defaults(self, temp_config_file):
+        """Test that warm-up is enabled with a 30 minute keep_alive by default."""
+        config = ConfigLoader(temp_config_file)
+        assert config.should_warmup_ollama_model() is True
+        assert config.get_ollama_keep_alive() == '30m'
+
+    def test_openai_connection_defaults(self, temp_config_file):
+        """Test default OpenAI connection pool settings."""
+        config = ConfigLoader(temp_config_file)
+        assert config.get_openai_connection_pool() == {
+            'max_connections': 50,
+            'max_keepalive_connections': 20,
+            'keepalive_expiry': 30.0
+        }
+
+    def test_prefilter_setting(self, temp_config_file):
+        """Test getting the pre-filter toggle."""
+        config = ConfigLoader(temp_config_file)
+        assert config.is_prefilter_enabled() is False
+
+    def test_deterministic_redaction_setting(self, temp_config_file):
+        """Test getting the deterministic redaction toggle."""
+        config = ConfigLoader(temp_config_file)
+        assert config.is_deterministic_redaction_enabled() is True
+
+    def test_get_concise_prompt_limits(self, temp_config_file):
+        """Test getting the concise prompt thresholds."""
+        config = ConfigLoader(temp_config_file)
+        assert config.get_concise_prompt_max_chars() == 512
+        assert config.get_concise_prompt_max_categories() == 2
+
+    def test_concise_prompt_limits_default(self, tmp_path):
+        """Test the concise prompt thresholds when not in config."""
+        minimal_config = tmp_path / "minimal.yaml"
+        minimal_config.write_text("performance: {}")
+
+        config = ConfigLoader(str(minimal_config))
+        assert config.get_concise_prompt_max_chars() == 2048
+        assert config.get_concise_prompt_max_categories() == 3
+
+    def test_prefilter_disabled_by_default(self, tmp_path):
+        """Test that the pre-filter is disabled when not in config, since it lowers recall."""
+        minimal_config = tmp_path / "minimal.yaml"
+        minimal_config.write_text("performance: {}")
+
+        config = ConfigLoader(str(minimal_config))
+        assert config.is_prefilter_enabled() is False
+
+    def test_get_batch_settings(self, temp_config_file):
+        """Test getting batch strategy and concurrency."""
+        config = ConfigLoader(temp_config_file)
+        assert config.get_batch_strategy() == "combined"
+        assert config.get_batch_concurrency() == 3
+
+    def test_missing_batch_settings_default(self, tmp_path):
+        """Test default batch strategy and concurrency when not in config."""
+        minimal_config = tmp_path / "minimal.yaml"
+        minimal_config.write_text("performance: {}")
+
+        config = ConfigLoader(str(minimal_config))
+        assert config.get_batch_strategy() == "concurrent"
+        assert config.get_batch_concurrency() == 8
+
+    def test_get_max_concurrent_requests(self, temp_config_file):
+        """Test getting max concurrent requests."""
+        config = ConfigLoader(temp_config_file)
+        assert config.get_max_concurrent_requests() == 10
+
+    def test_missing_max_concurrent_requests_default(self, tmp_path):
+        """Test default max concurrent requests when not in config."""
+        minimal_config = tmp_path / "minimal.yaml"
+        minimal_config.write_text("performance: {}")
+
+        config = ConfigLoader(str(minimal_config))
+        assert config.get_max_concurrent_requests() == 100
+
+    def test_get_queue_settings(self, temp_config_file):
+        """Test getting queue size and concurrency limits."""
+        config = ConfigLoader(temp_config_file)
+        assert config.get_queue_max_size() == 20
+        assert config.get_concurrency_limit() == 4
+        assert config.get_openai_concurrency_limit() == 2
+
+    def test_missing_queue_settings_default(self, tmp_path):
+        """Test default queue settings when not in config."""
+        minimal_config = tmp_path / "minimal.yaml"
+        minimal_config.write_text("performance: {}")
+
+        config = ConfigLoader(str(minimal_config))
+        assert config.get_queue_max_size() == 100
+        assert config.get_concurrency_limit() == 10
+        assert config.get_openai_concurrency_limit() == 10
+
+    def test_get_redaction_cache_size(self, temp_config_file):
+        """Test getting redaction cache size."""
+        config = ConfigLoader(temp_config_file)
+        assert config.get_redaction_cache_size() == 16
+
+    def test_missing_redaction_cache_size_default(self, tmp_path):
+        """Test default redaction cache size when not in config."""
+        minimal_config = tmp_path / "minimal.yaml"
+        minimal_config.write_text("performance: {}")
+
+        config = ConfigLoader(str(minimal_config))
+        assert config.get_redaction_cache_size() == 128
+        assert config.get_openai_cache_size() == 128
+
+    def test_get_openai_cache_size(self, temp_config_file):
+        """Test getting OpenAI cache size."""
+        config = ConfigLoader(temp_config_file)
+        assert config.get_openai_cache_size() == 8
+
+    def test_concurrency_limit_capped_by_rate_limit(self, tmp_path):
+        """Test default concurrency limit does not exceed the per-minute request limit."""
+        minimal_config = tmp_path / "minimal.yaml"
+        minimal_config.write_text("rate_limiting:\n  enabled: true\n  max_requests_per_minute: 3\n")
+
+        config = ConfigLoader(str(minimal_config))
+        assert config.get_concurrency_limit() == 3
+
+
 @pytest.mark.unit
 class TestSecurityConfiguration:
     """Test suite for security configuration methods."""
@@ -307,3 +577,15 @@ class TestDefaultValues:
         assert retry_config['max_attempts'] == 3
         assert retry_config['min_wait'] == 2
         assert retry_config['max_wait'] == 10
+
+    def test_missing_sections_share_default_dicts(self, tmp_path):
+        """Test that default sections are built once rather than on every call."""
+        minimal_config = tmp_path / "minimal.yaml"
+        minimal_config.write_text("models: {}")
+
+        config = ConfigLoader(str(minimal_config))
+
+        assert config.get_retry_config() is config.get_retry_config()
+        assert config.get_logging_config() is config.get_logging_config()
+        assert config.get_server_config() == {'port': 7860, 'host': '127.0.0.1'}
+        assert config.get_output_text_config() is config.get_output_text_config()
@@ -0,0 +1,196 @@
+"""
+Unit Tests for Ollama HTTP Client
+
+Tests for the pooled httpx client used to call Ollama's /api/generate.
+
+Author: Harsh
+"""
+
+import asyncio
+import json
+import pytest
+import httpx
+from unittest.mock import patch
+from redactor.ollama_client import OllamaClient, resolve_ollama_host
+
+
+def _transport(requests, response_text="generated", status_code=200):
+    """Build a mock transport that records requests and returns a fixed response."""
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(status_code, json={"response": response_text, "done": True})
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.unit
+class TestResolveOllamaHost:
+    """Test suite for resolve_ollama_host."""
+
+    def test_explicit_host(self):
+        """Test that an explicit host is used as-is."""
+        assert resolve_ollama_host("http://ollama:11434/") == "http://ollama:11434"
+
+    def test_adds_scheme(self):
+        """Test that a bare host:port gets an http scheme."""
+        assert resolve_ollama_host("127.0.0.1:11434") == "http://127.0.0.1:11434"
+
+    @patch.dict('os.environ', {'OLLAMA_HOST': 'remote:11434'})
+    def test_environment_variable(self):
+        """Test that OLLAMA_HOST is used when no host is given."""
+        assert resolve_ollama_host() == "http://remote:11434"
+
+    @patch.dict('os.environ', {}, clear=True)
+    def test_default_host(self):
+        """Test the localhost default."""
+        assert resolve_ollama_host() == "http://localhost:11434"
+
+
+@pytest.mark.unit
+class TestOllamaClient:
+    """Test suite for OllamaClient."""
+
+    def test_invoke_posts_generate_request(self):
+        """Test that invoke posts a non-streaming generate request."""
+        requests = []
+        client = OllamaClient(model="llama3.2:latest", base_url="http://ollama:11434", format="json")
+        client._client = httpx.Client(base_url=client.base_url, transport=_transport(requests))
+
+        assert client.invoke("Hello") == "generated"
+
+        body = json.loads(requests[0].content)
+        assert requests[0].url.path == "/api/generate"
+        assert body == {"model": "llama3.2:latest", "prompt": "Hello", "stream": False, "format": "json"}
+
+    def test_format_omitted_when_none(self):
+        """Test that no format field is sent by default."""
+        requests = []
+        client = OllamaClient(model="llama3.2:latest")
+        client._client = httpx.Client(base_url=client.base_url, transport=_transport(requests))
+
+        client.invoke("Hello")
+
+        body = json.loads(requests[0].content)
+        assert "format" not in body
+        assert "keep_alive" not in body and "options" not in body
+
+    def test_keep_alive_and_options_sent(self):
+        """Test that keep_alive and model options are sent with every request."""
+        requests = []
+        client = OllamaClient(model="llama3.2:latest", keep_alive="30m", options={"temperature": 0})
+        client._client = httpx.Client(base_url=client.base_url, transport=_transport(requests))
+
+        client.invoke("Hello")
+        client.warmup()
+
+        for request in requests:
+            body = json.loads(request.content)
+            assert body["keep_alive"] == "30m"
+        assert json.loads(requests[0].content)["options"] == {"temperature": 0}
+
+    def test_format_override_per_call(self):
+        """Test that a per-call format replaces the client default."""
+        requests = []
+        schema = {"type": "object"}
+        client = OllamaClient(model="llama3.2:latest", format="json")
+        client._client = httpx.Client(base_url=client.base_url, transport=_transport(requests))
+
+        client.invoke("Hello", format=schema)
+
+        assert json.loads(requests[0].content)["format"] == schema
+
+    def test_connection_reused(self):
+        """Test that consecutive calls share one session."""
+        requests = []
+        client = OllamaClient(model="llama3.2:latest")
+        session = httpx.Client(base_url=client.base_url, transport=_transport(requests))
+        client._client = session
+
+        client.invoke("one")
+        client.invoke("two")
+
+        assert client._client is session
+        assert len(requests) == 2
+
+    def test_http_error_raised(self):
+        """Test that error statuses raise so retry logic can handle them."""
+        client = OllamaClient(model="missing-model")
+        client._client = httpx.Client(base_url=client.base_url, transport=_transport([], status_code=404))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            client.invoke("Hello")
+
+    def test_ainvoke(self):
+        """Test that ainvoke uses a lazily created async session."""
+        requests = []
+        client = OllamaClient(model="llama3.2:latest")
+
+        async def run():
+            client._async_client = httpx.AsyncClient(base_url=client.base_url, transport=_transport(requests))
+            result = await client.ainvoke("Hello")
+            await client.aclose()
+            return result
+
+        assert asyncio.run(run()) == "generated"
+        assert len(requests) == 1
+        assert client._async_client is None
+
+    def test_astream_yields_fragments(self):
+        """Test that astream yields response fragments from the NDJSON stream."""
+        lines = [
+            {"response": "Hel", "done": False},
+            {"response": "lo", "done": False},
+            {"response": "", "done": True}
+        ]
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            body = "\n".join(json.dumps(line) for line in lines) + "\n"
+            return httpx.Response(200, content=body.encode())
+
+        client = OllamaClient(model="llama3.2:latest")
+
+        async def run():
+            client._async_client = httpx.AsyncClient(
+                base_url=client.base_url, transport=httpx.MockTransport(handler)
+            )
+            fragments = [fragment async for fragment in client.astream("Hello")]
+            await client.aclose()
+            return fragments
+
+        assert asyncio.run(run()) == ["Hel", "lo"]
+        assert json.loads(requests[0].content)["stream"] is True
+
+    def test_pool_limits_applied(self):
+        """Test that connection pool settings are passed to httpx."""
+        client = OllamaClient(model="m", max_connections=7, max_keepalive_connections=3, keepalive_expiry=5.0)
+
+        assert client._limits.max_connections == 7
+        assert client._limits.max_keepalive_connections == 3
+        assert client._limits.keepalive_expiry == 5.0
+
+    def test_warmup_sends_empty_prompt(self):
+        """Test that warmup loads the model with an empty prompt and keep_alive."""
+        requests = []
+        client = OllamaClient(model="llama3.2:latest", format="json")
+        client._client = httpx.Client(base_url=client.base_url, transport=_transport(requests))
+
+        client.warmup(keep_alive="30m")
+
+        body = json.loads(requests[0].content)
+        assert body == {"model": "llama3.2:latest", "prompt": "", "stream": False, "keep_alive": "30m"}
+
+    def test_warmup_http_error_raised(self):
+        """Test that warmup raises when Ollama returns an error status."""
+        client = OllamaClient(model="m")
+        client._client = httpx.Client(base_url=client.base_url, transport=_transport([], status_code=404))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            client.warmup()
+
+    def test_context_manager_closes(self):
+        """Test that the context manager closes the session."""
+        with OllamaClient(model="m") as client:
+            pass
+
+        assert client._client.is_closed
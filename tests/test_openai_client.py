@@ -0,0 +1,125 @@
+"""
+Unit Tests for OpenAI Chat Client
+
+Tests for the OpenAI SDK wrapper used to submit redacted text.
+
+Author: Harsh
+"""
+
+import asyncio
+import json
+import pytest
+import httpx
+from redactor.openai_client import OpenAIClient
+
+
+def _completion(content):
+    """Build a minimal chat completion response body."""
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-3.5-turbo",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }]
+    }
+
+
+def _chunk(content):
+    """Build one server-sent event for a streamed chat completion."""
+    body = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "gpt-3.5-turbo",
+        "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}]
+    }
+    return f"data: {json.dumps(body)}\n\n"
+
+
+@pytest.mark.unit
+class TestOpenAIClient:
+    """Test suite for OpenAIClient."""
+
+    def test_invoke_sends_single_user_message(self):
+        """Test that invoke sends the prompt as one user message and returns the reply text."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=_completion("Hello!"))
+
+        client = OpenAIClient(
+            model="gpt-3.5-turbo", api_key="test-key", temperature=0.2, max_tokens=50,
+            http_client=httpx.Client(transport=httpx.MockTransport(handler))
+        )
+
+        assert client.invoke("Say hello") == "Hello!"
+
+        body = json.loads(requests[0].content)
+        assert requests[0].url.path.endswith("/chat/completions")
+        assert body["model"] == "gpt-3.5-turbo"
+        assert body["messages"] == [{"role": "user", "content": "Say hello"}]
+        assert body["temperature"] == 0.2
+        assert body["max_tokens"] == 50
+
+    def test_max_tokens_omitted_when_none(self):
+        """Test that no max_tokens field is sent by default."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=_completion("ok"))
+
+        client = OpenAIClient(
+            model="gpt-3.5-turbo", api_key="test-key",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler))
+        )
+        client.invoke("Hi")
+
+        assert "max_tokens" not in json.loads(requests[0].content)
+
+    def test_empty_content_returns_empty_string(self):
+        """Test that a reply without content is returned as an empty string."""
+        client = OpenAIClient(
+            model="gpt-3.5-turbo", api_key="test-key",
+            http_client=httpx.Client(transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json=_completion(None))
+            ))
+        )
+
+        assert client.invoke("Hi") == ""
+
+    def test_ainvoke(self):
+        """Test that ainvoke uses the async session."""
+        client = OpenAIClient(
+            model="gpt-3.5-turbo", api_key="test-key",
+            http_async_client=httpx.AsyncClient(transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json=_completion("async reply"))
+            ))
+        )
+
+        assert asyncio.run(client.ainvoke("Hi")) == "async reply"
+
+    def test_astream_yields_fragments(self):
+        """Test that astream yields the non-empty content deltas in order."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            body = _chunk("Hello") + _chunk("") + _chunk(" world") + "data: [DONE]\n\n"
+            return httpx.Response(200, content=body.encode(), headers={"content-type": "text/event-stream"})
+
+        client = OpenAIClient(
+            model="gpt-3.5-turbo", api_key="test-key",
+            http_async_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+        async def collect():
+            return [fragment async for fragment in client.astream("Hi")]
+
+        assert asyncio.run(collect()) == ["Hello", " world"]
+        assert json.loads(requests[0].content)["stream"] is True
@@ -0,0 +1,183 @@
+"""
+Unit Tests for Regex Pre-filter
+
+Tests for the candidate checks that let the redactor skip model calls.
+
+Author: Harsh
+"""
+
+import pytest
+from redactor.prefilter import (
+    needs_model, can_redact_locally, partition_categories, redact_structured
+)
+
+
+@pytest.mark.unit
+class TestCandidatePatterns:
+    """Test suite for the per-category candidate patterns."""
+
+    @pytest.mark.parametrize("category, text", [
+        ("Email Addresses", "Reach me at john.doe+work@example.co.uk"),
+        ("Phone Numbers", "Call (555) 123-4567"),
+        ("Phone Numbers", "Call +44 20 7946 0958"),
+        ("Social Security Numbers", "SSN 987-65-4321"),
+        ("Credit Card Numbers", "Card 4111-1111-1111-1111"),
+        ("Credit Card Numbers", "Card 4111111111111111"),
+        ("Dates of Birth", "Born 01/15/1990"),
+        ("Dates of Birth", "Born on January 5th"),
+        ("Dates of Birth", "Born in 1990"),
+    ])
+    def test_matches_candidates(self, category, text):
+        """Test that typical sensitive values are detected as candidates."""
+        assert needs_model(text, [category]) is True
+
+    @pytest.mark.parametrize("category", [
+        "Email Addresses",
+        "Phone Numbers",
+        "Social Security Numbers",
+        "Credit Card Numbers",
+        "Dates of Birth",
+    ])
+    def test_plain_text_has_no_candidates(self, category):
+        """Test that text without digits or emails has no candidates."""
+        assert needs_model("The meeting is on Monday at the office.", [category]) is False
+
+
+@pytest.mark.unit
+class TestNeedsModel:
+    """Test suite for needs_model."""
+
+    def test_no_candidates(self):
+        """Test that the model is not needed when nothing can match."""
+        assert needs_model("The meeting is on Monday.", ["Email Addresses", "Phone Numbers"]) is False
+
+    def test_candidate_present(self):
+        """Test that the model is needed when a candidate matches."""
+        assert needs_model("Mail a@example.com", ["Email Addresses"]) is True
+
+    def test_free_form_category(self):
+        """Test that free-form categories always need the model."""
+        assert needs_model("The meeting is on Monday.", ["Email Addresses", "Passwords"]) is True
+
+    def test_no_categories(self):
+        """Test that an empty selection needs no model call."""
+        assert needs_model("Anything", []) is False
+
+    def test_any_selected_category_matching_is_enough(self):
+        """Test that one combined pass finds a candidate of any selected category."""
+        assert needs_model("Call 555-123-4567", ["Email Addresses", "Phone Numbers"]) is True
+
+    def test_unselected_categories_ignored(self):
+        """Test that candidates of unselected categories do not count."""
+        assert needs_model("Mail a@example.com", ["Phone Numbers"]) is False
+
+
+@pytest.mark.unit
+class TestRedactStructured:
+    """Test suite for deterministic redaction."""
+
+    CATEGORY_MAP = {
+        "Email Addresses": "[EMAIL-1]",
+        "Phone Numbers": "[PHONE-NUM-1]",
+        "Social Security Numbers": "[SSN-1]",
+        "Credit Card Numbers": "[CREDIT-CARD-NUM-1]",
+    }
+
+    def test_redacts_and_numbers_placeholders(self):
+        """Test that values are replaced with per-category numbered placeholders."""
+        result, redacted = redact_structured(
+            "Mail a@example.com, b@example.com or a@example.com",
+            ["Email Addresses"],
+            self.CATEGORY_MAP
+        )
+
+        assert redacted == "Mail [EMAIL-1], [EMAIL-2] or [EMAIL-1]"
+        assert [item["data"] for item in result["detected_sensitive_data"]] == ["a@example.com", "b@example.com"]
+        assert result["redacted_text"] == redacted
+
+    def test_output_matches_prompt_format(self):
+        """Test that detections carry the same keys the LLM is asked to produce."""
+        result, _ = redact_structured("SSN 987-65-4321", ["Social Security Numbers"], self.CATEGORY_MAP)
+
+        assert result["detected_sensitive_data"] == [{
+            "type": "PII",
+            "data": "987-65-4321",
+            "category": "Social Security Numbers",
+            "reason": "Sensitive personal identifier.",
+            "redaction": "[SSN-1]"
+        }]
+
+    def test_ssn_not_redacted_as_phone(self):
+        """Test that SSNs take priority over the phone pattern."""
+        _, redacted = redact_structured(
+            "SSN 987-65-4321, phone (321) 654-0987",
+            ["Phone Numbers", "Social Security Numbers"],
+            self.CATEGORY_MAP
+        )
+
+        assert redacted == "SSN [SSN-1], phone [PHONE-NUM-1]"
+
+    def test_card_numbers_require_luhn(self):
+        """Test that digit runs failing the Luhn check are left alone."""
+        _, redacted = redact_structured(
+            "Card 4111-1111-1111-1111, order 1234567890123",
+            ["Credit Card Numbers"],
+            self.CATEGORY_MAP
+        )
+
+        assert redacted == "Card [CREDIT-CARD-NUM-1], order 1234567890123"
+
+    def test_many_matches_in_large_text(self):
+        """Test that every match in a large document is replaced and numbered."""
+        text = " ".join(f"user{i}@example.com" for i in range(2000))
+
+        result, redacted = redact_structured(text, ["Email Addresses"], self.CATEGORY_MAP)
+
+        assert "@" not in redacted
+        assert len(result["detected_sensitive_data"]) == 2000
+        assert redacted.split()[-1] == "[EMAIL-2000]"
+
+    def test_unselected_categories_kept(self):
+        """Test that only selected categories are redacted."""
+        _, redacted = redact_structured("Mail a@example.com", ["Phone Numbers"], self.CATEGORY_MAP)
+
+        assert redacted == "Mail a@example.com"
+
+
+@pytest.mark.unit
+class TestCanRedactLocally:
+    """Test suite for can_redact_locally."""
+
+    def test_structured_categories(self):
+        """Test that structured-only selections can be redacted locally."""
+        assert can_redact_locally(["Email Addresses", "Credit Card Numbers"]) is True
+
+    def test_free_form_category_requires_model(self):
+        """Test that any free-form category requires the model."""
+        assert can_redact_locally(["Email Addresses", "Addresses"]) is False
+
+    def test_dates_require_model(self):
+        """Test that dates of birth are not redacted locally."""
+        assert can_redact_locally(["Dates of Birth"]) is False
+
+    def test_empty_selection(self):
+        """Test that an empty selection is not handled locally."""
+        assert can_redact_locally([]) is False
+
+
+@pytest.mark.unit
+class TestPartitionCategories:
+    """Test suite for partition_categories."""
+
+    def test_splits_in_selection_order(self):
+        """Test that structured and model-only categories keep their selection order."""
+        local, model = partition_categories(
+            ["Addresses", "Phone Numbers", "Medical Information", "Email Addresses"]
+        )
+
+        assert local == ["Phone Numbers", "Email Addresses"]
+        assert model == ["Addresses", "Medical Information"]
+
+    def test_dates_stay_with_model(self):
+        """Test that dates of birth are left to the model."""
+        assert partition_categories(["Dates of Birth"]) == ([], ["Dates of Birth"])
@@ -8,15 +8,29 @@ Author: Harsh
 
 import pytest
 import time
-from unittest.mock import patch, Mock
+import asyncio
+import threading
+import inspect
+from unittest.mock import patch, Mock, MagicMock, AsyncMock
 from utils.rate_limiter import (
     RateLimiter,
+    TokenBucket,
     init_global_rate_limiter,
     get_global_rate_limiter,
-    rate_limited
+    rate_limited,
+    _named_limiters,
+    _shared_limiter
 )
 
 
+def _record_at(limiter, count, age=0.0, tokens=0):
+    """Add ``count`` requests of ``tokens`` tokens each, recorded ``age`` seconds ago."""
+    timestamp = time.monotonic() - age
+    for _ in range(count):
+        limiter._log.append((timestamp, tokens))
+        limiter._window_tokens += tokens
+
+
 @pytest.mark.unit
 class TestRateLimiter:
     """Test suite for RateLimiter class."""
@@ -34,35 +48,35 @@ class TestRateLimiter:
         """Test check_request_limit when within limit."""
         limiter = RateLimiter(max_requests_per_minute=10)
 
-        limiter.request_count = 5
+        _record_at(limiter, 5)
         assert limiter.check_request_limit() is True
 
     def test_check_request_limit_at_limit(self):
         """Test check_request_limit when at limit."""
         limiter = RateLimiter(max_requests_per_minute=10)
 
-        limiter.request_count = 10
+        _record_at(limiter, 10)
         assert limiter.check_request_limit() is False
 
     def test_check_request_limit_exceeds_limit(self):
         """Test check_request_limit when exceeding limit."""
         limiter = RateLimiter(max_requests_per_minute=10)
 
-        limiter.request_count = 15
+        _record_at(limiter, 15)
         assert limiter.check_request_limit() is False
 
     def test_check_token_limit_within_limit(self):
         """Test check_token_limit when within limit."""
         limiter = RateLimiter(max_tokens_per_minute=1000)
 
-        limiter.token_count = 500
+        _record_at(limiter, 1, tokens=500)
         assert limiter.check_token_limit(400) is True
 
     def test_check_token_limit_would_exceed(self):
         """Test check_token_limit when would exceed limit."""
         limiter = RateLimiter(max_tokens_per_minute=1000)
 
-        limiter.token_count = 800
+        _record_at(limiter, 1, tokens=800)
         assert limiter.check_token_limit(300) is False
 
     def test_record_request(self):
@@ -79,57 +93,254 @@ class TestRateLimiter:
         assert limiter.request_count == 2
         assert limiter.token_count == 150
 
-    def test_reset_if_needed_within_window(self):
-        """Test that counters are not reset within time window."""
+    def test_trim_expired_within_window(self):
+        """Test that requests from the last minute are kept."""
         limiter = RateLimiter()
-        limiter.request_count = 5
-        limiter.token_count = 100
+        _record_at(limiter, 5, age=30, tokens=20)
 
-        # Should not reset within 60 seconds
-        limiter._reset_if_needed()
+        limiter._trim_expired()
 
-        assert limiter.request_count == 5
+        assert len(limiter._log) == 5
         assert limiter.token_count == 100
 
-    def test_reset_if_needed_after_window(self):
-        """Test that counters reset after time window."""
+    def test_trim_expired_after_window(self, fake_clock):
+        """Test that requests older than a minute are dropped."""
         limiter = RateLimiter()
-        limiter.request_count = 5
-        limiter.token_count = 100
+        for _ in range(5):
+            limiter.record_request(tokens=20)
 
-        # Simulate time passing
-        limiter.window_start = time.time() - 61  # 61 seconds ago
+        fake_clock.advance(61)
+        limiter._trim_expired()
 
-        limiter._reset_if_needed()
-
-        assert limiter.request_count == 0
+        assert len(limiter._log) == 0
         assert limiter.token_count == 0
 
-    @patch('time.sleep')
-    def test_wait_if_needed_at_limit(self, mock_sleep):
-        """Test wait_if_needed when at rate limit."""
+    def test_window_slides(self, fake_clock):
+        """Test that only the expired part of the window is dropped."""
         limiter = RateLimiter(max_requests_per_minute=10)
-        limiter.request_count = 10
-        limiter.window_start = time.time() - 30  # 30 seconds into window
+        for _ in range(6):
+            limiter.record_request()
+        fake_clock.advance(40)
+        for _ in range(4):
+            limiter.record_request()
+        fake_clock.advance(10)
+
+        assert limiter.check_request_limit() is False
+
+        # Ten seconds later the six oldest requests expire, the rest remain
+        fake_clock.advance(10)
+
+        assert limiter.check_request_limit() is True
+        assert len(limiter._log) == 4
+
+    def test_wait_if_needed_at_limit(self, fake_clock):
+        """Test wait_if_needed when at rate limit."""
+        limiter = RateLimiter(max_requests_per_minute=10, jitter=0)
+        for _ in range(10):
+            limiter.record_request()
+        fake_clock.advance(30)
 
         limiter.wait_if_needed()
 
-        # Should have slept for approximately 30 seconds (60 - 30)
-        assert mock_sleep.called
-        sleep_time = mock_sleep.call_args[0][0]
-        assert 25 < sleep_time < 35  # Allow some tolerance
+        # Should sleep until the oldest request expires (60 - 30 seconds)
+        assert fake_clock.sleeps == [30.0]
+        assert limiter.request_count == 0
+
+    def test_wait_if_needed_under_limit_skips_lock(self, fake_clock):
+        """Test that wait_if_needed returns without locking or trimming when under the limit."""
+        limiter = RateLimiter(max_requests_per_minute=10)
+        limiter.record_request()
+        limiter._lock = MagicMock()
+
+        assert limiter.wait_if_needed() == fake_clock()
+
+        limiter._lock.__enter__.assert_not_called()
+
+    def test_wait_if_needed_adds_jitter(self, fake_clock):
+        """Test that the wait is lengthened by up to the jitter fraction, never shortened."""
+        limiter = RateLimiter(max_requests_per_minute=1, jitter=0.5)
+        limiter.record_request()
+        fake_clock.advance(30)
+
+        with patch('utils.rate_limiter.random.random', return_value=1.0):
+            limiter.wait_if_needed()
+
+        assert fake_clock.sleeps == [45.0]
+
+    def test_jittered_waits_differ(self, fake_clock):
+        """Test that limiters blocked at the same moment wake at different times."""
+        limiters = [RateLimiter(max_requests_per_minute=1) for _ in range(5)]
+        for limiter in limiters:
+            limiter.record_request()
+
+        blocked_at = fake_clock()
+        with patch('utils.rate_limiter.random.random', side_effect=[0.0, 0.25, 0.5, 0.75, 1.0]):
+            for limiter in limiters:
+                limiter.wait_if_needed(blocked_at)
+
+        assert fake_clock.sleeps == [60.0, 67.5, 75.0, 82.5, 90.0]
+
+    @patch('utils.rate_limiter.asyncio.sleep', new_callable=AsyncMock)
+    def test_await_if_needed_sleeps_without_blocking(self, mock_async_sleep, fake_clock):
+        """Test that await_if_needed waits with asyncio.sleep instead of time.sleep."""
+        limiter = RateLimiter(max_requests_per_minute=1, jitter=0)
+        limiter.record_request()
+        fake_clock.advance(20)
+
+        async def advance(seconds):
+            fake_clock.advance(seconds)
+        mock_async_sleep.side_effect = advance
+
+        asyncio.run(limiter.await_if_needed())
+
+        mock_async_sleep.assert_awaited_once_with(40.0)
+        assert fake_clock.sleeps == []
+        assert limiter.request_count == 0
+
+    @patch('utils.rate_limiter.asyncio.sleep', new_callable=AsyncMock)
+    def test_limit_requests_coroutine_function(self, mock_async_sleep, fake_clock):
+        """Test that limit_requests keeps coroutine functions async and records each call."""
+        limiter = RateLimiter(max_requests_per_minute=1, jitter=0)
+        mock_async_sleep.side_effect = lambda seconds: fake_clock.advance(seconds)
+
+        @limiter.limit_requests
+        async def test_func():
+            return "success"
+
+        assert inspect.iscoroutinefunction(test_func)
+        assert asyncio.run(test_func()) == "success"
+        assert asyncio.run(test_func()) == "success"
+
+        mock_async_sleep.assert_awaited_once_with(60.0)
+        assert fake_clock.sleeps == []
+        assert limiter.request_count == 1
+
+    def test_limit_requests_coroutine_failure_releases_slot(self):
+        """Test that a failed coroutine gives its reserved slot back."""
+        limiter = RateLimiter(max_requests_per_minute=1)
+
+        @limiter.limit_requests
+        async def test_func():
+            raise ValueError("Test error")
+
+        with pytest.raises(ValueError):
+            asyncio.run(test_func())
+        assert limiter.request_count == 0
+
+    def test_disabled_limiter_returns_function_unwrapped(self):
+        """Test that limit_requests adds no wrapper when the limiter is disabled."""
+        limiter = RateLimiter(max_requests_per_minute=1, enabled=False)
+
+        def test_func():
+            return "success"
+
+        async def async_func():
+            return "success"
+
+        assert limiter.limit_requests(test_func) is test_func
+        assert limiter.limit_requests(async_func) is async_func
+
+    def test_disabled_limiter_never_waits_or_records(self, fake_clock):
+        """Test that a disabled limiter admits every request without recording it."""
+        limiter = RateLimiter(max_requests_per_minute=1, max_tokens_per_minute=10, enabled=False)
+
+        for _ in range(3):
+            limiter.record_request(tokens=100)
+            limiter.wait_if_needed()
+        asyncio.run(limiter.await_if_needed())
+
+        assert limiter.check_request_limit() is True
+        assert limiter.check_token_limit(1000) is True
+        assert limiter.request_count == 0
+        assert fake_clock.sleeps == []
+
+    def test_try_acquire_reserves_request_and_tokens(self, fake_clock):
+        """Test that try_acquire records the request and its tokens when both fit."""
+        limiter = RateLimiter(max_requests_per_minute=10, max_tokens_per_minute=100)
+
+        assert limiter.try_acquire(tokens=60) is True
+        assert limiter.request_count == 1
+        assert limiter.token_count == 60
+
+    def test_try_acquire_rejects_over_token_budget(self, fake_clock):
+        """Test that try_acquire refuses a request whose tokens would exceed the budget."""
+        limiter = RateLimiter(max_requests_per_minute=10, max_tokens_per_minute=100)
+        limiter.try_acquire(tokens=60)
+
+        assert limiter.try_acquire(tokens=50) is False
+        assert limiter.try_acquire(tokens=40) is True
+        assert limiter.request_count == 2
+        assert limiter.token_count == 100
+
+    def test_try_acquire_rejects_at_request_limit(self, fake_clock):
+        """Test that try_acquire refuses a request when the request limit is reached."""
+        limiter = RateLimiter(max_requests_per_minute=2)
+
+        assert [limiter.try_acquire() for _ in range(3)] == [True, True, False]
+
+    def test_oversized_request_admitted_into_empty_window(self, fake_clock):
+        """Test that a request larger than the whole budget does not wait forever."""
+        limiter = RateLimiter(max_tokens_per_minute=100)
+
+        assert limiter.try_acquire(tokens=500) is True
+        assert limiter.try_acquire(tokens=1) is False
+
+    def test_acquire_waits_until_tokens_expire(self, fake_clock):
+        """Test that acquire sleeps until enough of the oldest tokens leave the window."""
+        limiter = RateLimiter(max_tokens_per_minute=100, jitter=0)
+        limiter.try_acquire(tokens=30)
+        fake_clock.advance(10)
+        limiter.try_acquire(tokens=50)
+        fake_clock.advance(10)
+
+        # 70 more tokens need both earlier requests to expire: the second at t=70
+        assert limiter.acquire(tokens=70) is True
+
+        assert fake_clock.sleeps == [50.0]
+        assert limiter.token_count == 70
+
+    def test_acquire_timeout(self, fake_clock):
+        """Test that acquire gives up without sleeping when the wait exceeds the timeout."""
+        limiter = RateLimiter(max_requests_per_minute=1, jitter=0)
+        limiter.try_acquire()
 
-    def test_wait_if_needed_within_limit(self):
+        assert limiter.acquire(timeout=30) is False
+        assert fake_clock.sleeps == []
+        assert limiter.request_count == 1
+
+    def test_try_acquire_is_atomic_across_threads(self):
+        """Test that concurrent try_acquire calls never reserve more than the token budget."""
+        limiter = RateLimiter(max_requests_per_minute=1000, max_tokens_per_minute=100)
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.extend(limiter.try_acquire(tokens=10) for _ in range(5))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results.count(True) == 10
+        assert limiter.token_count == 100
+
+    def test_negative_jitter_rejected(self):
+        """Test that a negative jitter is rejected."""
+        with pytest.raises(ValueError, match="jitter"):
+            RateLimiter(jitter=-0.1)
+
+    def test_wait_if_needed_within_limit(self, fake_clock):
         """Test wait_if_needed when within limit (should not wait)."""
         limiter = RateLimiter(max_requests_per_minute=10)
-        limiter.request_count = 5
+        for _ in range(5):
+            limiter.record_request()
 
-        start_time = time.time()
         limiter.wait_if_needed()
-        elapsed = time.time() - start_time
 
-        # Should not have waited
-        assert elapsed < 0.1
+        assert fake_clock.sleeps == []
 
     def test_limit_requests_decorator_successful(self):
         """Test limit_requests decorator on successful function."""
@@ -161,10 +372,9 @@ class TestRateLimiter:
         # Request should not be recorded on failure
         assert limiter.request_count == 0
 
-    @patch('time.sleep')
-    def test_limit_requests_decorator_rate_limited(self, mock_sleep):
+    def test_limit_requests_decorator_rate_limited(self, fake_clock):
         """Test limit_requests decorator enforces rate limit."""
-        limiter = RateLimiter(max_requests_per_minute=2)
+        limiter = RateLimiter(max_requests_per_minute=2, jitter=0)
         call_count = []
 
         @limiter.limit_requests
@@ -179,11 +389,14 @@ class TestRateLimiter:
         assert len(call_count) == 2
         assert limiter.request_count == 2
 
-        # Third call should trigger wait (but we've mocked sleep)
-        limiter.window_start = time.time() - 30  # Simulate 30 seconds elapsed
+        # Third call waits for the first request to leave the window
+        fake_clock.advance(30)
         test_func()
 
-        assert mock_sleep.called
+        assert fake_clock.sleeps == [30.0]
+        assert len(call_count) == 3
+        # Both earlier requests expired together, leaving only the third
+        assert limiter.request_count == 1
 
 
 @pytest.mark.unit
@@ -199,13 +412,16 @@ class TestGlobalRateLimiter:
         assert isinstance(limiter, RateLimiter)
         assert limiter.max_requests_per_minute == 100
         assert limiter.max_tokens_per_minute == 50000
+        assert limiter.enabled is True
+
+    def test_init_global_rate_limiter_disabled(self):
+        """Test that the global limiter can be initialized disabled."""
+        init_global_rate_limiter(enabled=False)
+
+        assert get_global_rate_limiter().enabled is False
 
     def test_get_global_rate_limiter_not_initialized(self):
         """Test get_global_rate_limiter raises error when not initialized."""
-        # Reset global limiter
-        import utils.rate_limiter
-        utils.rate_limiter._global_limiter = None
-
         with pytest.raises(RuntimeError, match="not initialized"):
             get_global_rate_limiter()
 
@@ -224,23 +440,40 @@ class TestGlobalRateLimiter:
 class TestRateLimitedDecorator:
     """Test suite for rate_limited decorator."""
 
-    @pytest.mark.slow
-    def test_rate_limited_decorator_basic(self):
+    def test_rate_limited_decorator_basic(self, fake_clock):
         """Test basic functionality of rate_limited decorator."""
         call_times = []
 
         @rate_limited(max_calls=2, period=1)
         def test_func():
-            call_times.append(time.time())
+            call_times.append(fake_clock())
             return "success"
 
-        # First two calls should succeed quickly
+        # First two calls go through without waiting
         test_func()
         test_func()
 
         assert len(call_times) == 2
-        # They should be very close together
-        assert (call_times[1] - call_times[0]) < 0.1
+        assert fake_clock.sleeps == []
+
+        # The third waits for one token to refill (period / max_calls)
+        test_func()
+
+        assert fake_clock.sleeps == [0.5]
+        assert call_times[2] - call_times[0] == 0.5
+
+    def test_sync_and_async_share_named_bucket(self, fake_clock):
+        """Test that sync and async functions with the same name draw from one bucket."""
+        @rate_limited(max_calls=1, period=60, name="test-mixed-provider")
+        def sync_call():
+            return "sync"
+
+        @rate_limited(max_calls=1, period=60, name="test-mixed-provider")
+        async def async_call():
+            return "async"
+
+        assert sync_call() == "sync"
+        assert _named_limiters["test-mixed-provider"].try_acquire() == pytest.approx(60.0)
 
     def test_rate_limited_decorator_with_args(self):
         """Test rate_limited decorator with function arguments."""
@@ -262,6 +495,96 @@ class TestRateLimitedDecorator:
         assert documented_func.__name__ == "documented_func"
 
 
+@pytest.mark.unit
+class TestAsyncRateLimiting:
+    """Test suite for rate limiting async functions."""
+
+    def test_bucket_allows_burst_up_to_capacity(self):
+        """Test that a full bucket lets a burst through, then asks to wait."""
+        bucket = TokenBucket(rate_per_sec=1.0, capacity=2)
+
+        assert bucket.try_acquire() == 0.0
+        assert bucket.try_acquire() == 0.0
+        assert bucket.try_acquire() == pytest.approx(1.0, abs=0.01)
+
+    def test_bucket_refills_over_time(self):
+        """Test that tokens refill at the configured rate."""
+        with patch('utils.rate_limiter._monotonic', side_effect=[100.0, 100.0, 100.5, 101.0]):
+            bucket = TokenBucket(rate_per_sec=1.0, capacity=1)
+            assert bucket.try_acquire() == 0.0
+            assert bucket.try_acquire() == pytest.approx(0.5)
+            assert bucket.try_acquire() == 0.0
+
+    def test_bucket_rejects_non_positive_rate(self):
+        """Test that a bucket needs a positive rate and capacity."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate_per_sec=0, capacity=1)
+
+    def test_coroutine_function_stays_async(self):
+        """Test that decorated coroutine functions remain awaitable."""
+        @rate_limited(max_calls=10, period=1)
+        async def add(a, b):
+            """Add two numbers."""
+            return a + b
+
+        assert inspect.iscoroutinefunction(add)
+        assert add.__name__ == "add"
+        assert asyncio.run(add(2, 3)) == 5
+
+    def test_async_generator_function_streams(self):
+        """Test that decorated async generators still yield every item."""
+        @rate_limited(max_calls=10, period=1)
+        async def count(n):
+            for i in range(n):
+                yield i
+
+        async def collect():
+            return [item async for item in count(3)]
+
+        assert inspect.isasyncgenfunction(count)
+        assert asyncio.run(collect()) == [0, 1, 2]
+
+    @patch('utils.rate_limiter.asyncio.sleep', new_callable=AsyncMock)
+    def test_waits_without_blocking_event_loop(self, mock_async_sleep, fake_clock):
+        """Test that exceeding the limit awaits asyncio.sleep instead of calling time.sleep."""
+        @rate_limited(max_calls=1, period=60)
+        async def call():
+            return "ok"
+
+        async def run_twice():
+            first = await call()
+            with patch.object(TokenBucket, 'try_acquire', side_effect=[5.0, 0.0]):
+                second = await call()
+            return first, second
+
+        assert asyncio.run(run_twice()) == ("ok", "ok")
+        mock_async_sleep.assert_awaited_once_with(5.0)
+        assert fake_clock.sleeps == []
+
+
+    def test_named_limit_shared_between_functions(self):
+        """Test that functions decorated with the same name draw from one bucket."""
+        @rate_limited(max_calls=1, period=60, name="test-shared-provider")
+        async def first():
+            return 1
+
+        @rate_limited(max_calls=1, period=60, name="test-shared-provider")
+        async def second():
+            return 2
+
+        asyncio.run(first())
+
+        bucket = _named_limiters["test-shared-provider"]
+        assert bucket.try_acquire() > 0
+
+    def test_unnamed_limits_are_independent(self):
+        """Test that each unnamed function gets its own limiter."""
+        factory = lambda: TokenBucket(rate_per_sec=1.0, capacity=1)
+
+        assert _shared_limiter(None, factory) is not _shared_limiter(None, factory)
+        assert _shared_limiter("test-named", factory) is _shared_limiter("test-named", factory)
+
+
 @pytest.mark.unit
 class TestRateLimiterLogging:
     """Test suite for rate limiter logging."""
@@ -278,7 +601,7 @@ class TestRateLimiterLogging:
     def test_rate_limit_exceeded_logging(self, mock_logger):
         """Test that rate limit exceeded is logged."""
         limiter = RateLimiter(max_requests_per_minute=5)
-        limiter.request_count = 10
+        _record_at(limiter, 10)
 
         limiter.check_request_limit()
 
@@ -294,6 +617,15 @@ class TestRateLimiterLogging:
 
         mock_logger.debug.assert_called_once()
 
+    @patch('utils.rate_limiter.logger')
+    def test_record_request_formats_lazily(self, mock_logger):
+        """Test that the per-request debug message is formatted by logging, not by the caller."""
+        limiter = RateLimiter()
+
+        limiter.record_request(tokens=100)
+
+        mock_logger.debug.assert_called_once_with("Request recorded: %d requests, %d tokens", 1, 100)
+
 
 @pytest.mark.unit
 class TestRateLimiterEdgeCases:
@@ -322,7 +654,7 @@ class TestRateLimiterEdgeCases:
         limiter = RateLimiter(max_tokens_per_minute=1000)
 
         # Even with negative current count, adding tokens should work
-        limiter.token_count = -100
+        _record_at(limiter, 1, tokens=-100)
         assert limiter.check_token_limit(500) is True
 
     def test_rapid_sequential_calls(self):
@@ -336,15 +668,103 @@ class TestRateLimiterEdgeCases:
         assert limiter.token_count == 500
         assert limiter.check_request_limit() is True
 
-    def test_window_boundary_condition(self):
+    def test_window_boundary_condition(self, fake_clock):
         """Test behavior exactly at window boundary."""
         limiter = RateLimiter(max_requests_per_minute=10)
-        limiter.request_count = 5
+        for _ in range(5):
+            limiter.record_request()
+
+        # Requests recorded exactly 60 seconds ago have expired
+        fake_clock.advance(60.0)
+        limiter._trim_expired()
+
+        assert len(limiter._log) == 0
+
+    def test_no_burst_across_window_boundary(self, fake_clock):
+        """Test that a full window does not reset all at once."""
+        limiter = RateLimiter(max_requests_per_minute=10, jitter=0)
+        for _ in range(10):
+            limiter.record_request()
+        fake_clock.advance(59)
+
+        # A fixed window would allow ten more requests here; the sliding
+        # window waits for the oldest request to expire
+        limiter.wait_if_needed()
+
+        assert fake_clock.sleeps == [1.0]
+
+    def test_concurrent_calls_not_over_admitted(self):
+        """Test that threads checking the limit together cannot all get through."""
+        limiter = RateLimiter(max_requests_per_minute=5, jitter=0)
+        start = threading.Barrier(20)
+        release = threading.Event()
+        all_blocked = threading.Event()
+        admitted, blocked = [], []
+
+        class Blocked(Exception):
+            pass
+
+        def sleep(seconds):
+            # Stand-in for waiting: the thread gives up instead
+            blocked.append(seconds)
+            if len(blocked) == 15:
+                all_blocked.set()
+            raise Blocked()
+
+        @limiter.limit_requests
+        def call():
+            admitted.append(1)
+            release.wait(5)
+
+        def worker():
+            start.wait()
+            try:
+                call()
+            except Blocked:
+                pass
+
+        with patch('utils.rate_limiter.time.sleep', side_effect=sleep):
+            threads = [threading.Thread(target=worker) for _ in range(20)]
+            for thread in threads:
+                thread.start()
+            all_blocked.wait(5)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        assert len(admitted) == 5
+        assert len(blocked) == 15
+        assert limiter.request_count == 5
+
+    def test_no_instance_dict(self):
+        """Test that limiters use slots instead of a per-instance __dict__."""
+        assert not hasattr(RateLimiter(), '__dict__')
+        assert not hasattr(TokenBucket(rate_per_sec=1.0, capacity=1), '__dict__')
+
+    def test_limit_requests_reads_clock_once(self):
+        """Test that the decorator reads the clock once per call and records the start time."""
+        limiter = RateLimiter(max_requests_per_minute=10)
 
-        # Set window start to exactly 60 seconds ago
-        limiter.window_start = time.time() - 60.0
+        @limiter.limit_requests
+        def test_func():
+            return "success"
+
+        with patch('utils.rate_limiter._monotonic', return_value=1000.0) as mock_clock:
+            test_func()
 
-        limiter._reset_if_needed()
+        assert mock_clock.call_count == 1
+        assert list(limiter._log) == [(1000.0, 0)]
 
-        # Should have reset
+    def test_explicit_now_is_used(self):
+        """Test that a passed-in time is used instead of the clock."""
+        limiter = RateLimiter(max_requests_per_minute=10)
+        limiter.record_request(tokens=5, now=100.0)
+
+        with patch('utils.rate_limiter._monotonic') as mock_clock:
+            assert limiter.check_request_limit(now=159.0) is True
+            assert limiter.request_count == 1
+            limiter._trim_expired(now=160.0)
+
+        mock_clock.assert_not_called()
         assert limiter.request_count == 0
+        assert limiter.token_count == 0
@@ -6,21 +6,95 @@ Tests for the core redaction functionality.
 Author: Harsh
 """
 
+import re
+import sys
+import subprocess
 import pytest
 import json
-from unittest.mock import Mock, MagicMock, patch
-from redactor import SensitiveInformationRedactor
+import asyncio
+import logging
+import orjson
+import httpx
+from pathlib import Path
+from unittest.mock import Mock, MagicMock, AsyncMock, patch
+import prompt
+from redactor import SensitiveInformationRedactor, RedactionResult
+from redactor.redactor import (
+    _StreamingStringField, _detection_prompt_parts, _batch_prompt_parts
+)
+from redactor.prefilter import needs_model
+from utils.retry_utils import is_transient_error
+
+
+# Model outputs shared by several tests, serialized once at import
+_PLAIN_RESPONSE = json.dumps({"redacted_text": "x", "detected_sensitive_data": []})
+
+_LONG_TEXT = "This is a test. " * 1000  # 15000+ characters
+_LONG_RESPONSE = json.dumps({"redacted_text": _LONG_TEXT, "detected_sensitive_data": []})
+
+_SPECIAL_TEXT = "Email: test@example.com\n\t<script>alert('xss')</script>"
+_SPECIAL_RESPONSE = json.dumps({
+    "redacted_text": _SPECIAL_TEXT.replace("test@example.com", "[EMAIL-1]"),
+    "detected_sensitive_data": [{"type": "email", "value": "test@example.com"}]
+})
+
+_UNICODE_TEXT = "Email: test@example.com 你好 مرحبا"
+_UNICODE_RESPONSE = json.dumps({
+    "redacted_text": _UNICODE_TEXT.replace("test@example.com", "[EMAIL-1]"),
+    "detected_sensitive_data": []
+})
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _ollama_client_patch():
+    """Patch OllamaClient once for the whole module instead of per test."""
+    with patch('redactor.redactor.OllamaClient') as mock_client:
+        yield mock_client
+
+
+@pytest.fixture(autouse=True)
+def mock_ollama(_ollama_client_patch):
+    """Provide the patched OllamaClient class, reset so no test sees another's setup."""
+    _ollama_client_patch.reset_mock(return_value=True, side_effect=True)
+    return _ollama_client_patch
+
+
+@pytest.fixture
+def redactor(mock_ollama):
+    """Provide a redactor without an OpenAI key."""
+    return SensitiveInformationRedactor()
+
+
+@pytest.fixture
+def redactor_with_key(mock_ollama):
+    """Provide a redactor with an OpenAI key (patch OpenAIClient before using its model)."""
+    return SensitiveInformationRedactor(openai_api_key="test-key")
+
+
+@pytest.fixture(autouse=True)
+def disable_prefilter():
+    """Send every text to the (mocked) model; TestPrefilterIntegration re-enables the pre-filter."""
+    with patch('redactor.redactor.needs_model', return_value=True):
+        yield
 
 
 @pytest.mark.unit
 class TestRedactorInitialization:
     """Test suite for redactor initialization."""
 
-    @patch('redactor.redactor.OllamaLLM')
-    @patch('redactor.redactor.ChatOpenAI')
+    def test_import_does_not_load_openai_sdk(self):
+        """Test that importing the redactor defers the OpenAI SDK import."""
+        code = "import sys, redactor.redactor; sys.exit('openai' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent.parent)
+
+        assert result.returncode == 0
+
+    @patch('redactor.redactor.OpenAIClient')
     def test_initialization_with_defaults(self, mock_openai, mock_ollama):
         """Test redactor initialization with default models."""
         redactor = SensitiveInformationRedactor(openai_api_key="test-key")
+        redactor.ollama_model
+        redactor.openai_model
 
         # Verify Ollama was initialized
         mock_ollama.assert_called_once()
@@ -30,8 +104,7 @@ class TestRedactorInitialization:
         mock_openai.assert_called_once()
         assert "gpt-3.5-turbo" in str(mock_openai.call_args)
 
-    @patch('redactor.redactor.OllamaLLM')
-    @patch('redactor.redactor.ChatOpenAI')
+    @patch('redactor.redactor.OpenAIClient')
     def test_initialization_with_custom_models(self, mock_openai, mock_ollama):
         """Test redactor initialization with custom model names."""
         redactor = SensitiveInformationRedactor(
@@ -39,34 +112,174 @@ class TestRedactorInitialization:
             openai_model_name="gpt-4",
             openai_api_key="test-key"
         )
+        redactor.ollama_model
+        redactor.openai_model
 
         # Verify custom models were used
-        mock_ollama.assert_called_once_with(model="llama2:latest")
+        assert mock_ollama.call_args.kwargs["model"] == "llama2:latest"
+        assert mock_ollama.call_args.kwargs["format"] == prompt.detection_schema
+        assert mock_ollama.call_args.kwargs["keep_alive"] == "30m"
+        assert mock_ollama.call_args.kwargs["options"] == {"temperature": 0.0}
         assert "gpt-4" in str(mock_openai.call_args)
 
-    @patch('redactor.redactor.OllamaLLM')
     def test_initialization_without_openai_key(self, mock_ollama):
         """Test initialization without OpenAI API key."""
         redactor = SensitiveInformationRedactor()
 
         assert redactor.openai_model is None
 
-    @patch('redactor.redactor.OllamaLLM')
+    @patch('redactor.redactor.OpenAIClient')
+    def test_models_created_on_first_use(self, mock_openai, mock_ollama):
+        """Test that no model is constructed until it is first accessed."""
+        redactor = SensitiveInformationRedactor(openai_api_key="test-key")
+
+        mock_ollama.assert_not_called()
+        mock_openai.assert_not_called()
+
+        assert redactor.ollama_model is redactor.ollama_model
+        mock_ollama.assert_called_once()
+
     def test_initialization_ollama_failure(self, mock_ollama):
-        """Test that initialization fails gracefully if Ollama fails."""
+        """Test that an Ollama client failure surfaces on first use, not at construction."""
         mock_ollama.side_effect = Exception("Ollama connection error")
 
+        redactor = SensitiveInformationRedactor()
+
         with pytest.raises(Exception, match="Ollama connection error"):
-            SensitiveInformationRedactor()
+            redactor.ollama_model
+
+
+    def test_update_config_refreshes_request_settings(self, mock_ollama):
+        """Test that per-request settings are snapshotted and refreshed by update_config."""
+        with patch('redactor.redactor.config') as mock_config:
+            mock_config.should_sanitize_error_messages.return_value = True
+            mock_config.get_retry_config.return_value = {'max_attempts': 3, 'min_wait': 2, 'max_wait': 10}
+            redactor = SensitiveInformationRedactor()
+
+            mock_config.should_sanitize_error_messages.return_value = False
+            mock_config.get_retry_config.return_value = {'max_attempts': 1, 'min_wait': 0, 'max_wait': 0}
+            assert redactor._sanitize_errors is True
+
+            redactor.update_config()
+
+        assert redactor._sanitize_errors is False
+        assert redactor._retry_config['max_attempts'] == 1
+
+
+def _status_error(status_code):
+    """Build an httpx.HTTPStatusError for the given status code."""
+    request = httpx.Request("POST", "http://ollama:11434/api/generate")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status_code, request=request))
+
+
+@pytest.mark.unit
+class TestTransientErrors:
+    """Test suite for the retry predicate used on model calls."""
+
+    @pytest.mark.parametrize("error", [
+        httpx.ConnectError("refused"),
+        httpx.ReadTimeout("slow"),
+        _status_error(429),
+        _status_error(503),
+        ConnectionResetError("reset by peer"),
+        TimeoutError("timed out"),
+    ])
+    def test_transient_errors_are_retried(self, error):
+        """Test that timeouts, connection failures, rate limits and server errors are retryable."""
+        assert is_transient_error(error) is True
+
+    @pytest.mark.parametrize("error", [
+        _status_error(401),
+        _status_error(404),
+        ValueError("bad input"),
+    ])
+    def test_permanent_errors_are_not_retried(self, error):
+        """Test that auth failures, missing models and other errors are raised immediately."""
+        assert is_transient_error(error) is False
+
+    def test_openai_errors(self):
+        """Test that OpenAI connection and rate limit errors are retryable, auth errors are not."""
+        import openai
+
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+        def status_error(cls, status_code):
+            return cls("error", response=httpx.Response(status_code, request=request), body=None)
+
+        assert is_transient_error(openai.APIConnectionError(request=request)) is True
+        assert is_transient_error(status_error(openai.RateLimitError, 429)) is True
+        assert is_transient_error(status_error(openai.AuthenticationError, 401)) is False
+
+    def test_permanent_error_fails_without_retry(self, mock_ollama, redactor):
+        """Test that a non-retryable Ollama error is attempted once per prompt."""
+        invoke = Mock(side_effect=_status_error(404))
+        invoke.__name__ = "invoke"
+        mock_ollama.return_value.invoke = invoke
+        redactor._concise_max_chars = 0
+
+        result, redacted = redactor.identify_sensitive_information("Hello there", ["Addresses"])
+
+        assert "error" in result
+        assert invoke.call_count == 1
+
+
+@pytest.mark.unit
+class TestRedactionResult:
+    """Test suite for the RedactionResult return type."""
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_results_have_named_fields(self, mock_retry, mock_ollama, redactor):
+        """Test that detection returns a RedactionResult that still unpacks like a tuple."""
+        mock_retry.return_value = json.dumps({"redacted_text": "Hi [EMAIL-1]", "detected_sensitive_data": []})
+
+        result = redactor.identify_sensitive_information("Hi a@example.org", ["Email Addresses", "Addresses"])
+        data, redacted = result
+
+        assert isinstance(result, RedactionResult)
+        assert result.redacted_text == redacted == "Hi [EMAIL-1]"
+        assert result.data is data
+
+    def test_error_and_batch_results(self, mock_ollama, redactor):
+        """Test that error and batch results are RedactionResults too."""
+
+        error = redactor.identify_sensitive_information("", ["Email Addresses"])
+        batch = redactor.identify_sensitive_information_batch(["a", "b"], [])
+
+        assert error == RedactionResult({"error": "No text provided"}, "")
+        assert all(isinstance(result, RedactionResult) for result in batch)
+
+
+@pytest.mark.unit
+class TestFailureLogging:
+    """Test suite for failure logging on the request path."""
+
+    def test_error_logged_without_traceback(self, caplog, mock_ollama, redactor):
+        """Test that failures log a one-line error without formatting the traceback."""
+
+        with caplog.at_level(logging.INFO, logger='redactor.redactor'):
+            redactor._detection_error(ValueError("boom"))
+
+        errors = [record for record in caplog.records if record.levelno == logging.ERROR]
+        assert errors[0].getMessage() == "Error in sensitive information detection: ValueError: boom"
+        assert all(record.exc_info is None for record in caplog.records)
+
+    def test_traceback_logged_at_debug(self, caplog, mock_ollama, redactor):
+        """Test that the traceback is still available with debug logging enabled."""
+
+        with caplog.at_level(logging.DEBUG, logger='redactor.redactor'):
+            redactor._openai_error(ValueError("boom"))
+
+        traced = [record for record in caplog.records if record.exc_info]
+        assert len(traced) == 1
+        assert traced[0].levelno == logging.DEBUG
 
 
 @pytest.mark.unit
 class TestIdentifySensitiveInformation:
     """Test suite for identify_sensitive_information method."""
 
-    @patch('redactor.redactor.OllamaLLM')
     @patch('redactor.redactor.retry_api_call')
-    def test_successful_identification(self, mock_retry, mock_ollama):
+    def test_successful_identification(self, mock_retry, mock_ollama, redactor):
         """Test successful sensitive information identification."""
         # Setup mock response
         mock_response = json.dumps({
@@ -81,7 +294,6 @@ class TestIdentifySensitiveInformation:
         })
         mock_retry.return_value = mock_response
 
-        redactor = SensitiveInformationRedactor()
         result, redacted = redactor.identify_sensitive_information(
             "My email is john@example.com",
             ["Email Addresses"],
@@ -92,10 +304,8 @@ class TestIdentifySensitiveInformation:
         assert len(result["detected_sensitive_data"]) == 1
         assert result["detected_sensitive_data"][0]["type"] == "email"
 
-    @patch('redactor.redactor.OllamaLLM')
-    def test_empty_text_input(self, mock_ollama):
+    def test_empty_text_input(self, mock_ollama, redactor):
         """Test handling of empty text input."""
-        redactor = SensitiveInformationRedactor()
 
         result, redacted = redactor.identify_sensitive_information("", ["Email Addresses"])
 
@@ -103,24 +313,20 @@ class TestIdentifySensitiveInformation:
         assert result["error"] == "No text provided"
         assert redacted == ""
 
-    @patch('redactor.redactor.OllamaLLM')
-    def test_no_categories_selected(self, mock_ollama):
+    def test_no_categories_selected(self, mock_ollama, redactor):
         """Test handling when no categories are selected."""
-        redactor = SensitiveInformationRedactor()
 
         result, redacted = redactor.identify_sensitive_information("Some text", [])
 
         assert "error" in result
         assert result["error"] == "No categories selected"
 
-    @patch('redactor.redactor.OllamaLLM')
     @patch('redactor.redactor.retry_api_call')
-    def test_invalid_json_response(self, mock_retry, mock_ollama):
+    def test_invalid_json_response(self, mock_retry, mock_ollama, redactor):
         """Test handling of invalid JSON response from model."""
         # Return invalid JSON
         mock_retry.return_value = "This is not valid JSON"
 
-        redactor = SensitiveInformationRedactor()
         result, redacted = redactor.identify_sensitive_information(
             "Test text",
             ["Email Addresses"],
@@ -130,13 +336,11 @@ class TestIdentifySensitiveInformation:
         assert "error" in result
         assert "JSON" in result["error"]
 
-    @patch('redactor.redactor.OllamaLLM')
     @patch('redactor.redactor.retry_api_call')
-    def test_model_exception(self, mock_retry, mock_ollama):
+    def test_model_exception(self, mock_retry, mock_ollama, redactor):
         """Test handling of exceptions during model invocation."""
         mock_retry.side_effect = Exception("Model error")
 
-        redactor = SensitiveInformationRedactor()
         result, redacted = redactor.identify_sensitive_information(
             "Test text",
             ["Email Addresses"],
@@ -145,9 +349,8 @@ class TestIdentifySensitiveInformation:
 
         assert "error" in result
 
-    @patch('redactor.redactor.OllamaLLM')
     @patch('redactor.redactor.retry_api_call')
-    def test_multiple_categories(self, mock_retry, mock_ollama):
+    def test_multiple_categories(self, mock_retry, mock_ollama, redactor):
         """Test identification with multiple categories."""
         mock_response = json.dumps({
             "redacted_text": "Email: [EMAIL-1], Phone: [PHONE-1]",
@@ -158,7 +361,6 @@ class TestIdentifySensitiveInformation:
         })
         mock_retry.return_value = mock_response
 
-        redactor = SensitiveInformationRedactor()
         result, redacted = redactor.identify_sensitive_information(
             "Email: test@example.com, Phone: 555-1234",
             ["Email Addresses", "Phone Numbers"],
@@ -167,7 +369,6 @@ class TestIdentifySensitiveInformation:
 
         assert len(result["detected_sensitive_data"]) == 2
 
-    @patch('redactor.redactor.OllamaLLM')
     @patch('redactor.redactor.retry_api_call')
     @patch('redactor.redactor.config')
     def test_sensitive_data_logging_disabled(self, mock_config, mock_retry, mock_ollama):
@@ -189,7 +390,6 @@ class TestIdentifySensitiveInformation:
         # Just verify it completes without error
         assert redacted == "[EMAIL-1]"
 
-    @patch('redactor.redactor.OllamaLLM')
     @patch('redactor.redactor.retry_api_call')
     @patch('redactor.redactor.config')
     def test_error_sanitization_enabled(self, mock_config, mock_retry, mock_ollama):
@@ -208,118 +408,1189 @@ class TestIdentifySensitiveInformation:
         assert "raw_output" not in result
 
 
+@pytest.mark.unit
+class TestPromptAssembly:
+    """Test suite for prefix-stable prompt assembly."""
+
+    def test_prompt_starts_with_static_prefix(self, mock_ollama, redactor):
+        """Test that requests with different inputs share the same static prefix."""
+        import prompt
+
+        first = redactor._build_detection_prompt("text one", ["Email Addresses"], None)
+        second = redactor._build_detection_prompt("other text", ["Phone Numbers"], None)
+
+        assert first.startswith(prompt.detection_prefix)
+        assert second.startswith(prompt.detection_prefix)
+
+    def test_dynamic_values_follow_prefix(self, mock_ollama, redactor):
+        """Test that the categories and user text only appear after the prefix."""
+        import prompt
+
+        formatted = redactor._build_detection_prompt(
+            "My secret text", ["Email Addresses"], {"Email Addresses": "[EMAIL-1]"}
+        )
+        suffix = formatted[len(prompt.detection_prefix):]
+
+        assert "My secret text" in suffix
+        assert "[EMAIL-1]" in suffix
+        assert "My secret text" not in prompt.detection_prefix
+
+    def test_memoized_prompt_matches_template(self, mock_ollama, redactor):
+        """Test that the memoized head and tail reproduce the full template."""
+        formatted = redactor._build_detection_prompt(
+            "Text with {braces}", ["Email Addresses"], {"Email Addresses": "[EMAIL-1]"}
+        )
+
+        assert formatted == prompt.detection_prefix + prompt.detection_suffix.format(
+            category_selected="[EMAIL-1]", user_prompt="Text with {braces}"
+        )
+
+    def test_prompt_head_reused_per_selection(self, mock_ollama, redactor):
+        """Test that the head is built once per category selection."""
+        _detection_prompt_parts.cache_clear()
+        redactor._build_detection_prompt("first", ["Email Addresses"], {"Email Addresses": "[EMAIL-1]"})
+        redactor._build_detection_prompt("second", ["Email Addresses"], {"Email Addresses": "[EMAIL-1]"})
+
+        assert _detection_prompt_parts.cache_info().hits == 1
+        assert _detection_prompt_parts.cache_info().misses == 1
+
+    def test_formats_memoized_per_selection(self, mock_ollama, redactor):
+        """Test that placeholder patterns are resolved once per category selection."""
+        category_map = {"Email Addresses": "[EMAIL-1]", "Phone Numbers": "[PHONE-1]"}
+
+        first = redactor._formats_for(["Email Addresses", "Phone Numbers"], category_map)
+        second = redactor._formats_for(["Email Addresses", "Phone Numbers"], category_map)
+
+        assert first == (("[EMAIL-1]", "[PHONE-1]"), "[EMAIL-1]\n[PHONE-1]")
+        assert second is first
+        assert redactor._formats_cache.hits == 1
+
+    def test_formats_follow_category_map(self, mock_ollama, redactor):
+        """Test that a different category map is not served another map's patterns."""
+
+        first = redactor._formats_for(["Email Addresses"], {"Email Addresses": "[EMAIL-1]"})
+        second = redactor._formats_for(["Email Addresses"], {"Email Addresses": "[MAIL-1]"})
+
+        assert first[0] == ("[EMAIL-1]",)
+        assert second[0] == ("[MAIL-1]",)
+
+    def test_formats_skip_unknown_categories(self, mock_ollama, redactor):
+        """Test that categories missing from the map are ignored."""
+
+        formats, categories_str = redactor._formats_for(
+            ["Unknown", "Email Addresses"], {"Email Addresses": "[EMAIL-1]"}
+        )
+
+        assert formats == ("[EMAIL-1]",)
+        assert categories_str == "[EMAIL-1]"
+
+    def test_unknown_categories_warned_once(self, caplog, mock_ollama, redactor):
+        """Test that unknown categories are reported once per selection."""
+        category_map = {"Email Addresses": "[EMAIL-1]"}
+
+        with caplog.at_level(logging.WARNING, logger='redactor.redactor'):
+            redactor._formats_for(["Emails"], category_map)
+            redactor._formats_for(["Emails"], category_map)
+
+        warnings = [record for record in caplog.records if "without a placeholder" in record.getMessage()]
+        assert len(warnings) == 1
+        assert "Emails" in warnings[0].getMessage()
+
+    def test_batch_prompt_matches_prefix_and_suffix(self):
+        """Test that the memoized batch prompt reproduces the batch prefix and formatted suffix."""
+        texts = ["first {text}", "second"]
+        requests_block = "\n\n".join(
+            f"{prompt.batch_request_header.format(index=index)}\n{text}"
+            for index, text in enumerate(texts, start=1)
+        )
+
+        formatted = SensitiveInformationRedactor._build_batch_prompt(texts, "[EMAIL-1]")
+
+        assert formatted == prompt.batch_prefix + prompt.batch_suffix.format(
+            category_selected="[EMAIL-1]", requests_block=requests_block
+        )
+
+    def test_batch_prompt_head_reused_per_selection(self):
+        """Test that the batch prompt head is built once per category selection."""
+        _batch_prompt_parts.cache_clear()
+        SensitiveInformationRedactor._build_batch_prompt(["one"], "[EMAIL-1]")
+        SensitiveInformationRedactor._build_batch_prompt(["two"], "[EMAIL-1]")
+
+        assert _batch_prompt_parts.cache_info().hits == 1
+        assert _batch_prompt_parts.cache_info().misses == 1
+
+    def test_detection_schema_requires_output_keys(self):
+        """Test that the detection schema enforces the template's JSON shape."""
+        assert prompt.detection_schema["required"] == ["detected_sensitive_data", "redacted_text"]
+        item_schema = prompt.detection_schema["properties"]["detected_sensitive_data"]["items"]
+        assert item_schema["required"] == ["type", "data", "category", "reason", "redaction"]
+
+    def test_prompts_omit_escaping_instructions(self):
+        """Test that JSON escaping guidance is left to the schema-constrained decoder."""
+        assert "Escape double quotes" not in prompt.detection_prefix
+        assert "Escape double quotes" not in prompt.batch_prefix
+
+    def test_full_template_matches_prefix_and_suffix(self):
+        """Test that the one-step template renders the same prompt."""
+        import prompt
+
+        expected = prompt.detection_prefix + prompt.detection_suffix.format(
+            category_selected="[EMAIL-1]", user_prompt="text"
+        )
+
+        assert prompt.template.format(category_selected="[EMAIL-1]", user_prompt="text") == expected
+
+
+@pytest.mark.unit
+class TestConcisePrompt:
+    """Test suite for the concise prompt used with short inputs."""
+
+    VALID_OUTPUT = json.dumps({"redacted_text": "Mail [EMAIL-1]", "detected_sensitive_data": []})
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_short_input_uses_concise_prompt(self, mock_retry, mock_ollama, redactor):
+        """Test that short inputs with few categories skip the worked examples."""
+        mock_retry.return_value = self.VALID_OUTPUT
+
+        redactor.identify_sensitive_information("Mail a@b.com", ["Email Addresses"])
+
+        formatted_prompt = mock_retry.call_args[0][1]
+        assert mock_retry.call_count == 1
+        assert formatted_prompt.startswith(prompt.concise_prefix)
+        assert "Mail a@b.com" in formatted_prompt
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_long_input_uses_full_prompt(self, mock_retry, mock_ollama, redactor):
+        """Test that long inputs keep the example-rich prompt."""
+        mock_retry.return_value = self.VALID_OUTPUT
+
+        redactor.identify_sensitive_information("x" * 5000, ["Email Addresses"])
+
+        assert mock_retry.call_args[0][1].startswith(prompt.detection_prefix)
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_many_categories_use_full_prompt(self, mock_retry, mock_ollama, redactor):
+        """Test that selecting many categories keeps the example-rich prompt."""
+        mock_retry.return_value = self.VALID_OUTPUT
+        categories = ["Email Addresses", "Phone Numbers", "Social Security Numbers", "Credit Card Numbers"]
+
+        redactor.identify_sensitive_information("Mail a@b.com", categories)
+
+        assert mock_retry.call_args[0][1].startswith(prompt.detection_prefix)
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_falls_back_to_full_prompt_on_parse_failure(self, mock_retry, mock_ollama, redactor):
+        """Test that unparseable concise output is retried once with the full prompt."""
+        mock_retry.side_effect = ["Invalid JSON", self.VALID_OUTPUT]
+
+        result, redacted = redactor.identify_sensitive_information("Mail a@b.com", ["Email Addresses"])
+
+        first, second = mock_retry.call_args_list
+        assert first[0][1].startswith(prompt.concise_prefix)
+        assert second[0][1].startswith(prompt.detection_prefix)
+        assert "error" not in result
+        assert redacted == "Mail [EMAIL-1]"
+
+    @patch('redactor.redactor.aretry_api_call', new_callable=AsyncMock)
+    def test_async_falls_back_to_full_prompt(self, mock_aretry, mock_ollama, redactor):
+        """Test that the async path falls back to the full prompt like the sync path."""
+        mock_aretry.side_effect = ["Invalid JSON", self.VALID_OUTPUT]
+
+        result, redacted = asyncio.run(
+            redactor.aidentify_sensitive_information("Mail a@b.com", ["Email Addresses"])
+        )
+
+        assert mock_aretry.await_count == 2
+        assert mock_aretry.await_args[0][1].startswith(prompt.detection_prefix)
+        assert redacted == "Mail [EMAIL-1]"
+
+    def test_concise_prompt_omits_examples(self):
+        """Test that the concise prompt is much shorter than the full prompt."""
+        assert "Example" not in prompt.concise_prefix
+        assert len(prompt.concise_prefix) < len(prompt.detection_prefix) // 4
+
+    def test_concise_prompt_parts_match_prefix_and_suffix(self):
+        """Test that the memoized concise prompt parts render the concise prefix and formatted suffix."""
+        expected = prompt.concise_prefix + prompt.detection_suffix.format(
+            category_selected="[EMAIL-1]", user_prompt="text"
+        )
+
+        head, tail = _detection_prompt_parts("[EMAIL-1]", concise=True)
+        assert head + "text" + tail == expected
+
+
+@pytest.mark.unit
+class TestIdentifySensitiveInformationBatch:
+    """Test suite for identify_sensitive_information_batch method."""
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_successful_batch(self, mock_retry, mock_ollama, redactor):
+        """Test that batch results are matched back to inputs by index."""
+        mock_retry.return_value = json.dumps({
+            "results": [
+                {"index": 2, "redacted_text": "Call [PHONE-1]", "detected_sensitive_data": [{"type": "phone"}]},
+                {"index": 1, "redacted_text": "Mail [EMAIL-1]", "detected_sensitive_data": [{"type": "email"}]}
+            ]
+        })
+
+        results = redactor.identify_sensitive_information_batch(
+            ["Mail a@example.com", "Call 555-1234"],
+            ["Email Addresses", "Phone Numbers"],
+            category_map={"Email Addresses": "[EMAIL-1]", "Phone Numbers": "[PHONE-1]"}
+        )
+
+        assert [redacted for _, redacted in results] == ["Mail [EMAIL-1]", "Call [PHONE-1]"]
+        assert results[0][0]["detected_sensitive_data"][0]["type"] == "email"
+        assert "index" not in results[0][0]
+        mock_retry.assert_called_once()
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_duplicate_texts_sent_once(self, mock_retry, mock_ollama, redactor):
+        """Test that duplicate texts share one request block and are fanned back out."""
+        mock_retry.return_value = json.dumps({
+            "results": [
+                {"index": 1, "redacted_text": "Mail [EMAIL-1]", "detected_sensitive_data": []},
+                {"index": 2, "redacted_text": "Call [PHONE-1]", "detected_sensitive_data": []}
+            ]
+        })
+
+        results = redactor.identify_sensitive_information_batch(
+            ["Mail a@example.com", "Call 555-1234", "Mail a@example.com"],
+            ["Email Addresses", "Phone Numbers"]
+        )
+
+        formatted_prompt = mock_retry.call_args[0][1]
+        assert "### Request 3:" not in formatted_prompt
+        assert [redacted for _, redacted in results] == ["Mail [EMAIL-1]", "Call [PHONE-1]", "Mail [EMAIL-1]"]
+        assert results[0][0] is not results[2][0]
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_batch_prompt_numbers_requests(self, mock_retry, mock_ollama, redactor):
+        """Test that each text is placed in its own numbered request block."""
+        mock_retry.return_value = json.dumps({"results": []})
+
+        redactor.identify_sensitive_information_batch(
+            ["first text", "second text"],
+            ["Email Addresses"],
+            category_map={"Email Addresses": "[EMAIL-1]"}
+        )
+
+        formatted_prompt = mock_retry.call_args[0][1]
+        assert mock_retry.call_args.kwargs["format"] == prompt.batch_schema
+        assert "### Request 1:\nfirst text" in formatted_prompt
+        assert "### Request 2:\nsecond text" in formatted_prompt
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_batch_split_by_max_batch_size(self, mock_retry, mock_ollama, redactor):
+        """Test that large batches are split into several model calls."""
+        mock_retry.side_effect = [
+            json.dumps({"results": [{"index": 1, "redacted_text": "a"}, {"index": 2, "redacted_text": "b"}]}),
+            json.dumps({"results": [{"index": 1, "redacted_text": "c"}]})
+        ]
+
+        results = redactor.identify_sensitive_information_batch(
+            ["a", "b", "c"],
+            ["Email Addresses"],
+            category_map={"Email Addresses": "[EMAIL-1]"},
+            max_batch_size=2
+        )
+
+        assert mock_retry.call_count == 2
+        assert [redacted for _, redacted in results] == ["a", "b", "c"]
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_batch_missing_result(self, mock_retry, mock_ollama, redactor):
+        """Test that texts without a returned result get an error entry."""
+        mock_retry.return_value = json.dumps({"results": [{"index": 1, "redacted_text": "a"}]})
+
+        results = redactor.identify_sensitive_information_batch(
+            ["a", "b"],
+            ["Email Addresses"],
+            category_map={"Email Addresses": "[EMAIL-1]"}
+        )
+
+        assert results[0][1] == "a"
+        assert "error" in results[1][0]
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_batch_invalid_json_response(self, mock_retry, mock_ollama, redactor):
+        """Test handling of invalid JSON from the model in batch mode."""
+        mock_retry.return_value = "This is not valid JSON"
+
+        results = redactor.identify_sensitive_information_batch(
+            ["a", "b"],
+            ["Email Addresses"],
+            category_map={"Email Addresses": "[EMAIL-1]"}
+        )
+
+        assert len(results) == 2
+        assert all("JSON" in result["error"] for result, _ in results)
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_batch_empty_texts_not_sent(self, mock_retry, mock_ollama, redactor):
+        """Test that empty texts are answered locally without a model call."""
+        results = redactor.identify_sensitive_information_batch(
+            ["", ""],
+            ["Email Addresses"],
+            category_map={"Email Addresses": "[EMAIL-1]"}
+        )
+
+        assert all(result["error"] == "No text provided" for result, _ in results)
+        mock_retry.assert_not_called()
+
+    def test_batch_no_categories_selected(self, mock_ollama, redactor):
+        """Test batch handling when no categories are selected."""
+
+        results = redactor.identify_sensitive_information_batch(["Some text"], [])
+
+        assert results == [({"error": "No categories selected"}, "Some text")]
+
+    def test_empty_batch(self, mock_ollama, redactor):
+        """Test that an empty batch returns no results."""
+
+        assert redactor.identify_sensitive_information_batch([], ["Email Addresses"]) == []
+
+
+@pytest.mark.unit
+class TestAsyncRedaction:
+    """Test suite for the async redaction and OpenAI methods."""
+
+    @patch('redactor.redactor.aretry_api_call', new_callable=AsyncMock)
+    def test_async_identification(self, mock_aretry, mock_ollama, redactor):
+        """Test async identification awaits the model's ainvoke."""
+        mock_aretry.return_value = json.dumps({
+            "redacted_text": "My email is [EMAIL-1]",
+            "detected_sensitive_data": [
+                {"type": "email", "value": "john@example.com", "placeholder": "[EMAIL-1]"}
+            ]
+        })
+
+        result, redacted = asyncio.run(redactor.aidentify_sensitive_information(
+            "My email is john@example.com",
+            ["Email Addresses"],
+            category_map={"Email Addresses": "[EMAIL-1]"}
+        ))
+
+        assert redacted == "My email is [EMAIL-1]"
+        assert len(result["detected_sensitive_data"]) == 1
+        assert mock_aretry.await_args[0][0] == redactor.ollama_model.ainvoke
+        assert "john@example.com" in mock_aretry.await_args[0][1]
+
+    @patch('redactor.redactor.aretry_api_call', new_callable=AsyncMock)
+    def test_async_identification_invalid_json(self, mock_aretry, mock_ollama, redactor):
+        """Test async identification handles invalid JSON like the sync path."""
+        mock_aretry.return_value = "not json"
+
+        result, redacted = asyncio.run(redactor.aidentify_sensitive_information(
+            "Some text", ["Email Addresses"]
+        ))
+
+        assert "JSON" in result["error"]
+        assert redacted == ""
+
+    @patch('redactor.redactor.aretry_api_call', new_callable=AsyncMock)
+    def test_async_identification_empty_text(self, mock_aretry, mock_ollama, redactor):
+        """Test async identification rejects empty text without calling the model."""
+        result, redacted = asyncio.run(redactor.aidentify_sensitive_information("", ["Email Addresses"]))
+
+        assert result["error"] == "No text provided"
+        mock_aretry.assert_not_awaited()
+
+    @patch('redactor.redactor.aretry_api_call', new_callable=AsyncMock)
+    def test_async_identification_exception_sanitized(self, mock_aretry, mock_ollama, redactor):
+        """Test async identification returns a sanitized error on failure."""
+        mock_aretry.side_effect = Exception("connection refused")
+
+        result, redacted = asyncio.run(redactor.aidentify_sensitive_information(
+            "Some text", ["Email Addresses"]
+        ))
+
+        assert "error" in result
+        assert "connection refused" not in result["error"]
+
+    @patch('redactor.redactor.OpenAIClient')
+    @patch('redactor.redactor.aretry_api_call', new_callable=AsyncMock)
+    def test_async_openai_submission(self, mock_aretry, mock_openai_cls, mock_ollama, redactor_with_key):
+        """Test async OpenAI submission returns the response content."""
+        mock_aretry.return_value = "This is the OpenAI response"
+
+        result = asyncio.run(redactor_with_key.asubmit_to_openai("Redacted text here"))
+
+        assert result == "This is the OpenAI response"
+        assert mock_aretry.await_args[0][0] == redactor_with_key.openai_model.ainvoke
+
+    def test_async_openai_not_initialized(self, mock_ollama, redactor):
+        """Test async OpenAI submission when model not initialized."""
+        result = asyncio.run(redactor.asubmit_to_openai("Some text"))
+
+        assert "not available" in result
+
+
+@pytest.mark.unit
+class TestConcurrentBatch:
+    """Test suite for aidentify_batch."""
+
+    @patch('redactor.redactor.aretry_api_call', new_callable=AsyncMock)
+    def test_results_preserve_order(self, mock_aretry, mock_ollama):
+        """Test that results are returned in input order."""
+        async def respond(func, prompt, **kwargs):
+            text = prompt.rsplit("PROMPT_PROVIDED: ", 1)[1].split("\n", 1)[0]
+            return json.dumps({"redacted_text": text.upper(), "detected_sensitive_data": []})
+        mock_aretry.side_effect = respond
+
+        redactor = SensitiveInformationRedactor(max_concurrency=2)
+        results = asyncio.run(redactor.aidentify_batch(["one", "two", "three"], ["Email Addresses"]))
+
+        assert [redacted for _, redacted in results] == ["ONE", "TWO", "THREE"]
+
+    @patch('redactor.redactor.aretry_api_call', new_callable=AsyncMock)
+    def test_concurrency_is_bounded(self, mock_aretry, mock_ollama):
+        """Test that no more than max_concurrency requests are in flight."""
+        in_flight = 0
+        peak = 0
+
+        async def respond(func, prompt, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return json.dumps({"redacted_text": "ok", "detected_sensitive_data": []})
+        mock_aretry.side_effect = respond
+
+        redactor = SensitiveInformationRedactor(max_concurrency=2)
+        texts = [f"text {i}" for i in range(6)]
+        results = asyncio.run(redactor.aidentify_batch(texts, ["Email Addresses"]))
+
+        assert len(results) == 6
+        assert peak == 2
+
+    @patch('redactor.redactor.aretry_api_call', new_callable=AsyncMock)
+    def test_failure_isolated_to_document(self, mock_aretry, mock_ollama, redactor):
+        """Test that one failing document does not fail the whole batch."""
+        async def respond(func, prompt, **kwargs):
+            if "bad" in prompt:
+                raise Exception("connection refused")
+            return json.dumps({"redacted_text": "ok", "detected_sensitive_data": []})
+        mock_aretry.side_effect = respond
+
+        results = asyncio.run(redactor.aidentify_batch(["good", "bad", ""], ["Email Addresses"]))
+
+        assert results[0][1] == "ok"
+        assert "error" in results[1][0]
+        assert "connection refused" not in results[1][0]["error"]
+        assert results[2][0]["error"] == "No text provided"
+
+    @patch('redactor.redactor.aretry_api_call', new_callable=AsyncMock)
+    def test_duplicate_texts_sent_once(self, mock_aretry, mock_ollama, redactor):
+        """Test that duplicate texts are dispatched once and fanned back out."""
+        mock_aretry.return_value = json.dumps({"redacted_text": "ok", "detected_sensitive_data": []})
+
+        results = asyncio.run(redactor.aidentify_batch(["same", "same", "other", "same"], ["Email Addresses"]))
+
+        assert len(results) == 4
+        assert mock_aretry.await_count == 2
+        assert results[0][0] is not results[1][0]
+
+    def test_empty_batch(self, mock_ollama, redactor):
+        """Test that an empty batch returns an empty list."""
+
+        assert asyncio.run(redactor.aidentify_batch([], ["Email Addresses"])) == []
+
+    def test_max_concurrency_defaults_to_config(self, mock_ollama):
+        """Test that max_concurrency falls back to the configured value."""
+        with patch('redactor.redactor.config') as mock_config:
+            mock_config.get_batch_concurrency.return_value = 3
+            redactor = SensitiveInformationRedactor()
+
+        assert redactor.max_concurrency == 3
+
+
+def _batch_response(prompt_text: str) -> str:
+    """Answer a batched prompt by upper-casing every "### Request N:" block."""
+    requests_block = prompt_text.rsplit("CATEGORY_SELECTED:", 1)[1]
+    results = [
+        {"index": int(index), "redacted_text": text.upper(), "detected_sensitive_data": []}
+        for index, text in re.findall(r"### Request (\d+):\n(.*)", requests_block)
+    ]
+    return json.dumps({"results": results})
+
+
+@pytest.mark.unit
+class TestAsyncCombinedBatch:
+    """Test suite for aidentify_sensitive_information_batch."""
+
+    @patch('redactor.redactor.aretry_api_call', new_callable=AsyncMock)
+    def test_chunks_results_in_order(self, mock_aretry, mock_ollama, redactor):
+        """Test that texts are split into batched prompts and results keep input order."""
+        async def respond(func, prompt_text, **kwargs):
+            return _batch_response(prompt_text)
+        mock_aretry.side_effect = respond
+
+        texts = ["one", "two", "three", "four", "five"]
+        results = asyncio.run(redactor.aidentify_sensitive_information_batch(
+            texts, ["Email Addresses"], max_batch_size=2
+        ))
+
+        assert [redacted for _, redacted in results] == ["ONE", "TWO", "THREE", "FOUR", "FIVE"]
+        assert mock_aretry.await_count == 3
+        assert mock_aretry.await_args.kwargs["format"] == prompt.batch_schema
+
+    @patch('redactor.redactor.aretry_api_call', new_callable=AsyncMock)
+    def test_prompts_sent_concurrently(self, mock_aretry, mock_ollama):
+        """Test that batched prompts overlap, bounded by max_concurrency."""
+        in_flight = 0
+        peak = 0
+
+        async def respond(func, prompt_text, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _batch_response(prompt_text)
+        mock_aretry.side_effect = respond
+
+        redactor = SensitiveInformationRedactor(max_concurrency=2)
+        texts = [f"text {i}" for i in range(8)]
+        results = asyncio.run(redactor.aidentify_sensitive_information_batch(
+            texts, ["Email Addresses"], max_batch_size=2
+        ))
+
+        assert len(results) == 8
+        assert peak == 2
+
+    @patch('redactor.redactor.aretry_api_call', new_callable=AsyncMock)
+    def test_failure_isolated_to_chunk(self, mock_aretry, mock_ollama, redactor):
+        """Test that a failing prompt only fails the texts it carried."""
+        async def respond(func, prompt_text, **kwargs):
+            if "bad" in prompt_text:
+                raise Exception("connection refused")
+            return _batch_response(prompt_text)
+        mock_aretry.side_effect = respond
+
+        results = asyncio.run(redactor.aidentify_sensitive_information_batch(
+            ["good", "bad", "fine"], ["Email Addresses"], max_batch_size=1
+        ))
+
+        assert results[0][1] == "GOOD"
+        assert "error" in results[1][0]
+        assert results[2][1] == "FINE"
+
+    def test_empty_batch(self, redactor):
+        """Test that an empty batch returns no results."""
+
+        assert asyncio.run(redactor.aidentify_sensitive_information_batch([], ["Email Addresses"])) == []
+
+
+@pytest.mark.unit
+class TestPrefilterIntegration:
+    """Test suite for skipping model calls when no category can match."""
+
+    @patch('redactor.redactor.needs_model', side_effect=needs_model)
+    @patch('redactor.redactor.retry_api_call')
+    def test_no_candidates_skips_model(self, mock_retry, mock_needs_model, mock_ollama, redactor):
+        """Test that text with no candidate matches is returned unchanged without a model call."""
+        redactor._prefilter_enabled = True
+
+        result, redacted = redactor.identify_sensitive_information(
+            "The meeting is on Monday.", ["Email Addresses", "Phone Numbers"]
+        )
+
+        assert result == {"detected_sensitive_data": [], "redacted_text": "The meeting is on Monday."}
+        assert redacted == "The meeting is on Monday."
+        mock_retry.assert_not_called()
+
+    @patch('redactor.redactor.needs_model', side_effect=needs_model)
+    @patch('redactor.redactor.retry_api_call')
+    def test_free_form_category_calls_model(self, mock_retry, mock_needs_model, mock_ollama, redactor):
+        """Test that free-form categories are still sent to the model."""
+        mock_retry.return_value = _PLAIN_RESPONSE
+
+        redactor._prefilter_enabled = True
+        redactor.identify_sensitive_information("The meeting is on Monday.", ["Passwords"])
+
+        mock_retry.assert_called_once()
+
+    @patch('redactor.redactor.needs_model', side_effect=needs_model)
+    @patch('redactor.redactor.retry_api_call')
+    def test_prefilter_disabled(self, mock_retry, mock_needs_model, mock_ollama, redactor):
+        """Test that the model is always called when the pre-filter is disabled."""
+        mock_retry.return_value = _PLAIN_RESPONSE
+
+        redactor._prefilter_enabled = False
+        redactor.identify_sensitive_information("The meeting is on Monday.", ["Email Addresses"])
+
+        mock_retry.assert_called_once()
+
+    @patch('redactor.redactor.needs_model', side_effect=needs_model)
+    @patch('redactor.redactor.retry_api_call')
+    def test_batch_sends_only_candidates(self, mock_retry, mock_needs_model, mock_ollama, redactor):
+        """Test that the batch prompt only includes texts with candidate matches."""
+        mock_retry.return_value = json.dumps({
+            "results": [{"index": 1, "redacted_text": "Mail [EMAIL-1]", "detected_sensitive_data": []}]
+        })
+
+        redactor._prefilter_enabled = True
+        results = redactor.identify_sensitive_information_batch(
+            ["No contact details here", "Mail a@example.com"], ["Email Addresses"]
+        )
+
+        formatted_prompt = mock_retry.call_args[0][1]
+        assert "No contact details here" not in formatted_prompt
+        assert [redacted for _, redacted in results] == ["No contact details here", "Mail [EMAIL-1]"]
+
+
+@pytest.mark.unit
+class TestDeterministicRedaction:
+    """Test suite for redacting structured categories without the model."""
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_structured_categories_redacted_locally(self, mock_retry, mock_ollama, redactor):
+        """Test that structured-only selections never call the model when enabled."""
+        redactor._deterministic_redaction = True
+
+        result, redacted = redactor.identify_sensitive_information(
+            "Mail a@example.com", ["Email Addresses"], category_map={"Email Addresses": "[EMAIL-1]"}
+        )
+
+        assert redacted == "Mail [EMAIL-1]"
+        assert result["detected_sensitive_data"][0]["data"] == "a@example.com"
+        mock_retry.assert_not_called()
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_free_form_category_uses_model(self, mock_retry, mock_ollama, redactor):
+        """Test that selections with free-form categories still call the model."""
+        mock_retry.return_value = _PLAIN_RESPONSE
+
+        redactor._deterministic_redaction = True
+        redactor.identify_sensitive_information("Mail a@example.com", ["Email Addresses", "Addresses"])
+
+        mock_retry.assert_called_once()
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_mixed_selection_sends_pre_redacted_text(self, mock_retry, mock_ollama, redactor):
+        """Test that the model only sees pre-redacted text and the remaining categories."""
+        mock_retry.return_value = json.dumps({
+            "redacted_text": "Mail [EMAIL-1] at [ADDRESS-1]",
+            "detected_sensitive_data": [{
+                "type": "PII", "data": "1 Main St", "category": "Addresses",
+                "reason": "Address.", "redaction": "[ADDRESS-1]"
+            }]
+        })
+        category_map = {"Email Addresses": "[EMAIL-1]", "Addresses": "[ADDRESS-1]"}
+
+        redactor._deterministic_redaction = True
+        result, redacted = redactor.identify_sensitive_information(
+            "Mail a@example.com at 1 Main St", ["Email Addresses", "Addresses"], category_map=category_map
+        )
+
+        formatted_prompt = mock_retry.call_args[0][1]
+        assert "a@example.com" not in formatted_prompt
+        assert "Mail [EMAIL-1] at 1 Main St" in formatted_prompt
+        assert "CATEGORY_SELECTED:\n[ADDRESS-1]\n" in formatted_prompt
+        assert redacted == "Mail [EMAIL-1] at [ADDRESS-1]"
+        assert [item["category"] for item in result["detected_sensitive_data"]] == ["Email Addresses", "Addresses"]
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_mixed_selection_model_error_returned(self, mock_retry, mock_ollama, redactor):
+        """Test that a model failure is not masked by the local redaction."""
+        mock_retry.return_value = "Invalid JSON"
+
+        redactor._deterministic_redaction = True
+        result, redacted = redactor.identify_sensitive_information(
+            "Mail a@example.com at 1 Main St", ["Email Addresses", "Addresses"]
+        )
+
+        assert "error" in result
+        assert redacted == ""
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_mixed_selection_in_combined_batch(self, mock_retry, mock_ollama, redactor):
+        """Test that batched prompts also carry pre-redacted text."""
+        mock_retry.return_value = json.dumps({"results": [
+            {"index": 1, "redacted_text": "Mail [EMAIL-1]", "detected_sensitive_data": []}
+        ]})
+
+        redactor._deterministic_redaction = True
+        results = redactor.identify_sensitive_information_batch(
+            ["Mail a@example.com"], ["Email Addresses", "Addresses"],
+            category_map={"Email Addresses": "[EMAIL-1]", "Addresses": "[ADDRESS-1]"}
+        )
+
+        formatted_prompt = mock_retry.call_args[0][1]
+        assert "a@example.com" not in formatted_prompt
+        assert "CATEGORY_SELECTED:\n[ADDRESS-1]\n" in formatted_prompt
+        assert results[0][0]["detected_sensitive_data"][0]["data"] == "a@example.com"
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_disabled_by_default(self, mock_retry, mock_ollama, redactor):
+        """Test that the model is used for structured categories unless enabled."""
+        mock_retry.return_value = _PLAIN_RESPONSE
+
+        redactor.identify_sensitive_information("Mail a@example.com", ["Email Addresses"])
+
+        assert redactor._deterministic_redaction is False
+        mock_retry.assert_called_once()
+
+
+def _collect_detection_stream(redactor, text, categories):
+    """Run astream_sensitive_information to completion and return every yielded value."""
+    async def collect():
+        return [item async for item in redactor.astream_sensitive_information(text, categories)]
+    return asyncio.run(collect())
+
+
+@pytest.mark.unit
+class TestStreamSensitiveInformation:
+    """Test suite for astream_sensitive_information method."""
+
+    def test_stream_yields_partial_then_final(self, mock_ollama, redactor):
+        """Test that partial redacted text is yielded before the parsed result."""
+        output = json.dumps({
+            "detected_sensitive_data": [{"type": "PII", "data": "a@b.com"}],
+            "redacted_text": "Mail [EMAIL-1] now"
+        })
+
+        async def fake_stream(prompt):
+            for start in range(0, len(output), 8):
+                yield output[start:start + 8]
+
+        redactor.ollama_model.astream = fake_stream
+        items = _collect_detection_stream(redactor, "Mail a@b.com now", ["Email Addresses"])
+
+        partials = [redacted for result, redacted in items if result is None]
+        final_result, final_redacted = items[-1]
+        assert partials
+        assert all("Mail [EMAIL-1] now".startswith(partial) for partial in partials)
+        assert final_redacted == "Mail [EMAIL-1] now"
+        assert len(final_result["detected_sensitive_data"]) == 1
+
+    def test_stream_result_cached(self, mock_ollama, redactor):
+        """Test that a completed stream is served from the cache next time."""
+        calls = []
+
+        async def fake_stream(prompt):
+            calls.append(prompt)
+            yield json.dumps({"detected_sensitive_data": [], "redacted_text": "ok"})
+
+        redactor.ollama_model.astream = fake_stream
+        _collect_detection_stream(redactor, "Some text", ["Email Addresses"])
+        items = _collect_detection_stream(redactor, "Some text", ["Email Addresses"])
+
+        assert len(calls) == 1
+        assert items == [({"detected_sensitive_data": [], "redacted_text": "ok"}, "ok")]
+
+    def test_stream_invalid_input(self, mock_ollama, redactor):
+        """Test that invalid input yields a single error without calling the model."""
+        items = _collect_detection_stream(redactor, "", ["Email Addresses"])
+
+        assert items == [({"error": "No text provided"}, "")]
+        redactor.ollama_model.astream.assert_not_called()
+
+    def test_stream_error_sanitized(self, mock_ollama, redactor):
+        """Test that a failing stream yields a sanitized error result."""
+        async def fake_stream(prompt):
+            raise Exception("connection refused")
+            yield
+
+        redactor.ollama_model.astream = fake_stream
+        result, redacted = _collect_detection_stream(redactor, "Some text", ["Email Addresses"])[-1]
+
+        assert "connection refused" not in result["error"]
+        assert redacted == ""
+
+    @patch('utils.retry_utils.asyncio.sleep', new_callable=AsyncMock)
+    def test_stream_retries_failure_before_first_fragment(self, mock_sleep, mock_ollama, redactor):
+        """Test that a transient error before any output is retried with backoff."""
+        attempts = []
+
+        async def fake_stream(prompt):
+            attempts.append(prompt)
+            if len(attempts) < 3:
+                raise httpx.ConnectError("connection refused")
+            yield json.dumps({"detected_sensitive_data": [], "redacted_text": "ok"})
+
+        redactor.ollama_model.astream = fake_stream
+        items = _collect_detection_stream(redactor, "Some text", ["Email Addresses"])
+
+        assert len(attempts) == 3
+        assert mock_sleep.await_count == 2
+        assert items[-1] == ({"detected_sensitive_data": [], "redacted_text": "ok"}, "ok")
+
+    @patch('utils.retry_utils.asyncio.sleep', new_callable=AsyncMock)
+    def test_stream_failure_after_first_fragment_not_retried(self, mock_sleep, mock_ollama, redactor):
+        """Test that a failure after partial output ends the stream with an error instead of restarting it."""
+        attempts = []
+
+        async def fake_stream(prompt):
+            attempts.append(prompt)
+            yield '{"redacted_text": "Some'
+            raise httpx.ReadError("connection reset")
+
+        redactor.ollama_model.astream = fake_stream
+        items = _collect_detection_stream(redactor, "Some text", ["Email Addresses"])
+
+        assert len(attempts) == 1
+        mock_sleep.assert_not_awaited()
+        assert items[0] == (None, "Some")
+        assert "error" in items[-1][0]
+
+
+def _feed_all(fragments, key="redacted_text"):
+    """Feed fragments to a _StreamingStringField and return the last decoded value."""
+    field = _StreamingStringField(key)
+    value = None
+    for fragment in fragments:
+        partial = field.feed(fragment)
+        if partial is not None:
+            value = partial
+    return value
+
+
+@pytest.mark.unit
+class TestStreamingStringField:
+    """Test suite for incremental redacted_text extraction."""
+
+    def test_value_not_started(self):
+        """Test that nothing is returned before the value begins."""
+        assert _feed_all(['{"detected_sensitive_data": [']) is None
+
+    def test_unfinished_value(self):
+        """Test that an unfinished string value is decoded so far."""
+        assert _feed_all(['{"redacted_text": "Hello [EM']) == "Hello [EM"
+
+    def test_escaped_quotes(self):
+        """Test that escaped quotes are decoded and do not end the value."""
+        assert _feed_all(['{"redacted_text": "He said \\"hi\\" to']) == 'He said "hi" to'
+
+    def test_trailing_partial_escape_held_back(self):
+        """Test that an incomplete escape sequence waits for the next fragment."""
+        field = _StreamingStringField("redacted_text")
+
+        assert field.feed('{"redacted_text": "caf\\u00') == "caf"
+        assert field.feed('e9 ok') == "caf\u00e9 ok"
+
+    def test_complete_value(self):
+        """Test that a complete value stops at its closing quote."""
+        field = _StreamingStringField("redacted_text")
+
+        assert field.feed('{"redacted_text": "done", "other": "x"}') == "done"
+        assert field.closed is True
+        assert field.feed('"more"') is None
+
+    def test_fragment_boundaries_do_not_matter(self):
+        """Test that any fragmentation decodes to the same value as orjson."""
+        value = 'He said "hi" caf\u00e9 \U0001F600 \\ end'
+        output = orjson.dumps({"detected_sensitive_data": [], "redacted_text": value}).decode()
+        output = output.replace("\u00e9", "\\u00e9").replace("\U0001F600", "\\ud83d\\ude00")
+
+        for size in range(1, 8):
+            fragments = [output[i:i + size] for i in range(0, len(output), size)]
+            assert _feed_all(fragments) == value
+
+
+def _collect_stream(redactor, text):
+    """Run astream_openai to completion and return every yielded value."""
+    async def collect():
+        return [partial async for partial in redactor.astream_openai(text)]
+    return asyncio.run(collect())
+
+
+@pytest.mark.unit
+class TestStreamOpenAI:
+    """Test suite for astream_openai method."""
+
+    @patch('redactor.redactor.OpenAIClient')
+    def test_stream_yields_accumulated_text(self, mock_openai_cls, mock_ollama, redactor_with_key):
+        """Test that each yielded value is the response accumulated so far."""
+        async def fake_stream(prompt):
+            for piece in ["Hello", " world"]:
+                yield piece
+
+        redactor_with_key.openai_model.astream = fake_stream
+
+        assert _collect_stream(redactor_with_key, "Redacted text") == ["Hello", "Hello world"]
+
+    @patch('redactor.redactor.OpenAIClient')
+    def test_stream_empty_response(self, mock_openai_cls, mock_ollama, redactor_with_key):
+        """Test that an empty stream yields a fallback message."""
+        async def fake_stream(prompt):
+            return
+            yield
+
+        redactor_with_key.openai_model.astream = fake_stream
+
+        assert _collect_stream(redactor_with_key, "Redacted text") == ["No response content available."]
+
+    @patch('redactor.redactor.OpenAIClient')
+    def test_stream_error_is_sanitized(self, mock_openai_cls, mock_ollama, redactor_with_key):
+        """Test that errors during streaming are yielded as sanitized messages."""
+        async def fake_stream(prompt):
+            yield "Partial"
+            raise Exception("connection reset")
+
+        redactor_with_key.openai_model.astream = fake_stream
+
+        results = _collect_stream(redactor_with_key, "Redacted text")
+
+        assert results[0] == "Partial"
+        assert "error occurred" in results[-1]
+        assert "connection reset" not in results[-1]
+
+    def test_stream_without_openai_model(self, mock_ollama, redactor):
+        """Test streaming when the OpenAI model is not initialized."""
+
+        results = _collect_stream(redactor, "Some text")
+
+        assert len(results) == 1
+        assert "not available" in results[0]
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """Test suite for the redactor's response caches."""
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_identical_requests_hit_cache(self, mock_retry, mock_ollama, redactor):
+        """Test that repeated identical requests call the model once."""
+        mock_retry.return_value = json.dumps({
+            "redacted_text": "My email is [EMAIL-1]",
+            "detected_sensitive_data": [{"type": "email", "value": "john@example.com"}]
+        })
+
+        first = redactor.identify_sensitive_information("My email is john@example.com", ["Email Addresses"])
+        second = redactor.identify_sensitive_information("My email is john@example.com", ["Email Addresses"])
+
+        assert first == second
+        assert mock_retry.call_count == 1
+        assert redactor.stats["detection_cache_hits"] == 1
+        assert redactor.stats["detection_cache_misses"] == 1
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_category_order_shares_cache_entry(self, mock_retry, mock_ollama, redactor):
+        """Test that category order does not create separate cache entries."""
+        mock_retry.return_value = _PLAIN_RESPONSE
+
+        redactor.identify_sensitive_information("text", ["Email Addresses", "Phone Numbers"])
+        redactor.identify_sensitive_information("text", ["Phone Numbers", "Email Addresses"])
+
+        assert mock_retry.call_count == 1
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_errors_are_not_cached(self, mock_retry, mock_ollama, redactor):
+        """Test that failed detections are retried on the next call."""
+        mock_retry.return_value = "Invalid JSON"
+
+        redactor.identify_sensitive_information("text", ["Email Addresses"])
+        redactor.identify_sensitive_information("text", ["Email Addresses"])
+
+        # Each call tries the concise prompt, then falls back to the full prompt
+        assert mock_retry.call_count == 4
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_cached_result_is_a_copy(self, mock_retry, mock_ollama, redactor):
+        """Test that mutating a returned result does not corrupt the cache."""
+        mock_retry.return_value = _PLAIN_RESPONSE
+
+        result, _ = redactor.identify_sensitive_information("text", ["Email Addresses"])
+        result["extra"] = "mutated"
+        cached, _ = redactor.identify_sensitive_information("text", ["Email Addresses"])
+
+        assert "extra" not in cached
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_batch_uses_detection_cache(self, mock_retry, mock_ollama, redactor):
+        """Test that batch redaction skips texts already in the detection cache."""
+        mock_retry.side_effect = [
+            json.dumps({"redacted_text": "cached", "detected_sensitive_data": []}),
+            json.dumps({"results": [{"index": 1, "redacted_text": "fresh", "detected_sensitive_data": []}]}),
+        ]
+
+        redactor.identify_sensitive_information("first", ["Email Addresses"])
+        results = redactor.identify_sensitive_information_batch(["first", "second"], ["Email Addresses"])
+
+        assert [redacted for _, redacted in results] == ["cached", "fresh"]
+        assert mock_retry.call_count == 2
+        assert "### Request 1:\nsecond" in mock_retry.call_args[0][1]
+
+    @patch('redactor.redactor.OpenAIClient')
+    @patch('redactor.redactor.retry_api_call')
+    def test_openai_responses_cached(self, mock_retry, mock_openai_cls, mock_ollama, redactor_with_key):
+        """Test that identical OpenAI submissions call the model once."""
+        mock_retry.return_value = "Response"
+
+        assert redactor_with_key.submit_to_openai("Redacted") == "Response"
+        assert redactor_with_key.submit_to_openai("Redacted") == "Response"
+
+        assert mock_retry.call_count == 1
+        assert redactor_with_key.stats["openai_cache_hits"] == 1
+
+    @patch('redactor.redactor.retry_api_call')
+    def test_clear_cache(self, mock_retry, mock_ollama, redactor):
+        """Test that clear_cache forces the next request to call the model."""
+        mock_retry.return_value = _PLAIN_RESPONSE
+
+        redactor.identify_sensitive_information("text", ["Email Addresses"])
+        redactor.clear_cache()
+        redactor.identify_sensitive_information("text", ["Email Addresses"])
+
+        assert mock_retry.call_count == 2
+
+
 @pytest.mark.unit
 class TestSubmitToOpenAI:
     """Test suite for submit_to_openai method."""
 
-    @patch('redactor.redactor.OllamaLLM')
-    @patch('redactor.redactor.ChatOpenAI')
+    @patch('redactor.redactor.OpenAIClient')
     @patch('redactor.redactor.retry_api_call')
-    def test_successful_openai_submission(self, mock_retry, mock_openai_cls, mock_ollama):
+    def test_successful_openai_submission(self, mock_retry, mock_openai_cls, mock_ollama, redactor_with_key):
         """Test successful OpenAI submission."""
         # Setup mock response
-        mock_response = Mock()
-        mock_response.content = "This is the OpenAI response"
-        mock_retry.return_value = mock_response
+        mock_retry.return_value = "This is the OpenAI response"
 
-        redactor = SensitiveInformationRedactor(openai_api_key="test-key")
-        result = redactor.submit_to_openai("Redacted text here")
+        result = redactor_with_key.submit_to_openai("Redacted text here")
 
         assert result == "This is the OpenAI response"
 
-    @patch('redactor.redactor.OllamaLLM')
-    def test_empty_text_to_openai(self, mock_ollama):
+    def test_empty_text_to_openai(self, mock_ollama, redactor):
         """Test submitting empty text to OpenAI."""
-        redactor = SensitiveInformationRedactor()
         result = redactor.submit_to_openai("")
 
         assert "No text provided" in result
 
-    @patch('redactor.redactor.OllamaLLM')
-    def test_openai_not_initialized(self, mock_ollama):
+    def test_openai_not_initialized(self, mock_ollama, redactor):
         """Test OpenAI submission when model not initialized."""
-        redactor = SensitiveInformationRedactor()
         result = redactor.submit_to_openai("Some text")
 
         assert "not available" in result
         assert "API key" in result
 
-    @patch('redactor.redactor.OllamaLLM')
-    @patch('redactor.redactor.ChatOpenAI')
+    @patch('redactor.redactor.OpenAIClient')
     @patch('redactor.redactor.retry_api_call')
-    def test_openai_response_without_content(self, mock_retry, mock_openai_cls, mock_ollama):
-        """Test handling OpenAI response without content attribute."""
-        # Mock response without content attribute
-        mock_response = Mock(spec=[])  # No attributes
-        mock_retry.return_value = mock_response
+    def test_openai_response_without_content(self, mock_retry, mock_openai_cls, mock_ollama, redactor_with_key):
+        """Test handling an empty OpenAI response."""
+        mock_retry.return_value = ""
 
-        redactor = SensitiveInformationRedactor(openai_api_key="test-key")
-        result = redactor.submit_to_openai("Test text")
+        result = redactor_with_key.submit_to_openai("Test text")
 
         assert "No response content" in result
 
-    @patch('redactor.redactor.OllamaLLM')
-    @patch('redactor.redactor.ChatOpenAI')
+    @patch('redactor.redactor.OpenAIClient')
     @patch('redactor.redactor.retry_api_call')
-    def test_openai_exception_handling(self, mock_retry, mock_openai_cls, mock_ollama):
+    def test_openai_exception_handling(self, mock_retry, mock_openai_cls, mock_ollama, redactor_with_key):
         """Test exception handling in OpenAI submission."""
         mock_retry.side_effect = Exception("API error")
 
-        redactor = SensitiveInformationRedactor(openai_api_key="test-key")
-        result = redactor.submit_to_openai("Test text")
+        result = redactor_with_key.submit_to_openai("Test text")
 
         assert "error occurred" in result.lower()
 
-    @patch('redactor.redactor.OllamaLLM')
-    @patch('redactor.redactor.ChatOpenAI')
+    @patch('redactor.redactor.OpenAIClient')
     @patch('redactor.redactor.retry_api_call')
     @patch('redactor.redactor.config')
     def test_openai_instruction_prefix(self, mock_config, mock_retry, mock_openai_cls, mock_ollama):
         """Test that instruction prefix is added to OpenAI submission."""
         mock_config.get_openai_instruction_prefix.return_value = "INSTRUCTION: "
-        mock_response = Mock()
-        mock_response.content = "Response"
-        mock_retry.return_value = mock_response
+        mock_retry.return_value = "Response"
 
         redactor = SensitiveInformationRedactor(openai_api_key="test-key")
         result = redactor.submit_to_openai("Test")
 
-        # Verify retry_api_call was called with prefixed text
+        # Verify retry_api_call was called with the client's invoke and the prefixed text
         call_args = mock_retry.call_args[0]
-        assert "INSTRUCTION:" in call_args[0]
+        assert call_args[0] == redactor.openai_model.invoke
+        assert "INSTRUCTION:" in call_args[1]
+
+
+@pytest.mark.unit
+class TestWarmup:
+    """Test suite for warmup method."""
+
+    def test_warmup_loads_model(self, mock_ollama, redactor):
+        """Test that warmup asks Ollama to load the model."""
+
+        assert redactor.warmup() is True
+        mock_ollama.return_value.warmup.assert_called_once_with()
+
+    def test_warmup_failure_does_not_raise(self, mock_ollama, redactor):
+        """Test that an unreachable Ollama server only fails the warm-up."""
+        mock_ollama.return_value.warmup.side_effect = ConnectionError("connection refused")
+
+        assert redactor.warmup() is False
 
 
 @pytest.mark.unit
 class TestUpdateOpenAIApiKey:
     """Test suite for update_openai_api_key method."""
 
-    @patch('redactor.redactor.OllamaLLM')
-    @patch('redactor.redactor.ChatOpenAI')
-    def test_successful_api_key_update(self, mock_openai_cls, mock_ollama):
+    @patch('redactor.redactor.OpenAIClient')
+    def test_successful_api_key_update(self, mock_openai_cls, mock_ollama, redactor):
         """Test successful API key update."""
-        redactor = SensitiveInformationRedactor()
 
         result = redactor.update_openai_api_key("new-test-key")
 
         assert result is True
         mock_openai_cls.assert_called()
 
-    @patch('redactor.redactor.OllamaLLM')
-    def test_empty_api_key_update(self, mock_ollama):
+    @patch('redactor.redactor.OpenAIClient')
+    def test_api_key_update_reuses_http_sessions(self, mock_openai_cls, mock_ollama):
+        """Test that rebuilt models share the redactor's pooled HTTP sessions."""
+        redactor = SensitiveInformationRedactor(openai_model_name="gpt-4", openai_api_key="old-key")
+        redactor.openai_model
+        redactor.update_openai_api_key("new-key")
+
+        http_client, http_async_client = redactor._openai_sessions
+        first, second = mock_openai_cls.call_args_list
+        assert first.kwargs["http_client"] is second.kwargs["http_client"] is http_client
+        assert second.kwargs["http_async_client"] is http_async_client
+        assert second.kwargs["model"] == "gpt-4"
+
+    @patch('redactor.redactor.OpenAIClient')
+    def test_aclose_closes_async_sessions(self, mock_openai_cls, mock_ollama, redactor_with_key):
+        """Test that aclose closes the async sessions and later requests reopen them."""
+        mock_ollama.return_value.aclose = AsyncMock()
+        redactor_with_key.ollama_model
+        redactor_with_key.openai_model
+        http_client, http_async_client = redactor_with_key._openai_sessions
+
+        asyncio.run(redactor_with_key.aclose())
+
+        mock_ollama.return_value.aclose.assert_awaited_once()
+        assert http_client.is_closed and http_async_client.is_closed
+        assert redactor_with_key._openai_sessions[1] is not http_async_client
+        assert mock_openai_cls.call_count == 1
+        redactor_with_key.openai_model
+        assert mock_openai_cls.call_count == 2
+
+    def test_close_without_sessions(self, mock_ollama, redactor):
+        """Test that closing a redactor that never connected does nothing."""
+
+        redactor.close()
+        asyncio.run(redactor.aclose())
+
+        mock_ollama.assert_not_called()
+
+    @patch('redactor.redactor.OpenAIClient')
+    def test_unchanged_api_key_keeps_model(self, mock_openai_cls, mock_ollama):
+        """Test that re-submitting the current key does not rebuild the model."""
+        redactor = SensitiveInformationRedactor(openai_api_key="same-key")
+
+        assert redactor.update_openai_api_key("same-key") is True
+        mock_openai_cls.assert_called_once()
+
+    def test_empty_api_key_update(self, mock_ollama, redactor):
         """Test update with empty API key."""
-        redactor = SensitiveInformationRedactor()
 
         result = redactor.update_openai_api_key("")
 
         assert result is False
 
-    @patch('redactor.redactor.OllamaLLM')
-    @patch('redactor.redactor.ChatOpenAI')
-    def test_api_key_update_exception(self, mock_openai_cls, mock_ollama):
+    @patch('redactor.redactor.OpenAIClient')
+    def test_api_key_update_exception(self, mock_openai_cls, mock_ollama, redactor):
         """Test API key update with exception."""
         mock_openai_cls.side_effect = Exception("Invalid API key")
 
-        redactor = SensitiveInformationRedactor()
         result = redactor.update_openai_api_key("invalid-key")
 
         assert result is False
@@ -331,9 +1602,8 @@ class TestRedactorIntegration:
     """Integration tests requiring actual Ollama connection."""
 
     @pytest.mark.skip(reason="Requires Ollama to be running")
-    def test_real_ollama_connection(self):
+    def test_real_ollama_connection(self, redactor):
         """Test with real Ollama connection (skip by default)."""
-        redactor = SensitiveInformationRedactor()
 
         result, redacted = redactor.identify_sensitive_information(
             "My email is test@example.com",
@@ -348,60 +1618,39 @@ class TestRedactorIntegration:
 class TestRedactorEdgeCases:
     """Test suite for edge cases."""
 
-    @patch('redactor.redactor.OllamaLLM')
     @patch('redactor.redactor.retry_api_call')
-    def test_very_long_text(self, mock_retry, mock_ollama):
+    def test_very_long_text(self, mock_retry, mock_ollama, redactor):
         """Test with very long input text."""
-        long_text = "This is a test. " * 1000  # 15000+ characters
-        mock_response = json.dumps({
-            "redacted_text": long_text,
-            "detected_sensitive_data": []
-        })
-        mock_retry.return_value = mock_response
+        mock_retry.return_value = _LONG_RESPONSE
 
-        redactor = SensitiveInformationRedactor()
         result, redacted = redactor.identify_sensitive_information(
-            long_text,
+            _LONG_TEXT,
             ["Email Addresses"],
             category_map={"Email Addresses": "[EMAIL-1]"}
         )
 
         assert len(redacted) > 10000
 
-    @patch('redactor.redactor.OllamaLLM')
     @patch('redactor.redactor.retry_api_call')
-    def test_special_characters_in_text(self, mock_retry, mock_ollama):
+    def test_special_characters_in_text(self, mock_retry, mock_ollama, redactor):
         """Test with special characters in text."""
-        special_text = "Email: test@example.com\n\t<script>alert('xss')</script>"
-        mock_response = json.dumps({
-            "redacted_text": special_text.replace("test@example.com", "[EMAIL-1]"),
-            "detected_sensitive_data": [{"type": "email", "value": "test@example.com"}]
-        })
-        mock_retry.return_value = mock_response
+        mock_retry.return_value = _SPECIAL_RESPONSE
 
-        redactor = SensitiveInformationRedactor()
         result, redacted = redactor.identify_sensitive_information(
-            special_text,
+            _SPECIAL_TEXT,
             ["Email Addresses"],
             category_map={"Email Addresses": "[EMAIL-1]"}
         )
 
         assert "[EMAIL-1]" in redacted
 
-    @patch('redactor.redactor.OllamaLLM')
     @patch('redactor.redactor.retry_api_call')
-    def test_unicode_characters(self, mock_retry, mock_ollama):
+    def test_unicode_characters(self, mock_retry, mock_ollama, redactor):
         """Test with Unicode characters."""
-        unicode_text = "Email: test@example.com 你好 مرحبا"
-        mock_response = json.dumps({
-            "redacted_text": unicode_text.replace("test@example.com", "[EMAIL-1]"),
-            "detected_sensitive_data": []
-        })
-        mock_retry.return_value = mock_response
+        mock_retry.return_value = _UNICODE_RESPONSE
 
-        redactor = SensitiveInformationRedactor()
         result, redacted = redactor.identify_sensitive_information(
-            unicode_text,
+            _UNICODE_TEXT,
             ["Email Addresses"],
             category_map={"Email Addresses": "[EMAIL-1]"}
         )
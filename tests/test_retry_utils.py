@@ -8,12 +8,32 @@ Author: Harsh
 
 import pytest
 import time
-from unittest.mock import Mock, patch
+import httpx
+import asyncio
+import inspect
+import threading
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock, patch
 from utils.retry_utils import (
     create_retry_decorator,
     retry_api_call,
+    aretry_api_call,
     safe_api_call,
-    standard_retry
+    standard_retry,
+    ServiceUnavailable,
+    _backoff_delay,
+    _server_requested_delay,
+    hashable_args,
+    _breakers,
+    _inflight,
+    _ainflight,
+    _stale_results,
+    _response_cache,
+    get_retry_stats,
+    reset_retry_stats,
+    _attempt_windows,
+    _attempt_window_for
 )
 
 
@@ -35,6 +55,18 @@ class TestCreateRetryDecorator:
         assert result == "success"
         assert mock_func.call_count == 1
 
+    @patch('utils.retry_utils._retry_after_failure')
+    def test_success_skips_retry_machinery(self, mock_retry):
+        """Test that a first-try success never enters the retry loop."""
+        decorator = create_retry_decorator(max_attempts=3)
+
+        @decorator
+        def test_func(value):
+            return value
+
+        assert test_func("success") == "success"
+        mock_retry.assert_not_called()
+
     def test_retry_on_exception(self):
         """Test that function retries on exception."""
         mock_func = Mock(side_effect=[Exception("First fail"), Exception("Second fail"), "success"])
@@ -73,7 +105,7 @@ class TestCreateRetryDecorator:
                 raise Exception("Fail")
             return "success"
 
-        decorator = create_retry_decorator(max_attempts=3, min_wait=0.1, max_wait=0.5, multiplier=2)
+        decorator = create_retry_decorator(max_attempts=3, min_wait=0.1, max_wait=0.5, multiplier=2, jitter="none")
 
         @decorator
         def test_func():
@@ -145,8 +177,1021 @@ class TestRetryApiCall:
         result = retry_api_call(mock_func, max_attempts=2, min_wait=0.1)
 
         assert result == "success"
-        # Should log start and success
-        assert mock_logger.info.call_count >= 2
+        # Should log start and success at DEBUG, and the retry as a warning
+        assert mock_logger.debug.call_count >= 2
+        mock_logger.info.assert_not_called()
+        assert mock_logger.warning.call_count == 1
+
+    @patch('utils.retry_utils.logger')
+    def test_per_call_logs_skipped_when_debug_disabled(self, mock_logger):
+        """Test that the happy path does no logging work unless DEBUG is enabled."""
+        mock_logger.isEnabledFor.return_value = False
+
+        assert retry_api_call(lambda: "ok") == "ok"
+        mock_logger.debug.assert_not_called()
+
+    def test_partial_is_accepted(self):
+        """Test that callables without __name__ (e.g. functools.partial) can be retried."""
+        from functools import partial
+        attempts = []
+
+        def api_func(value):
+            attempts.append(value)
+            if len(attempts) < 2:
+                raise ConnectionError("reset")
+            return value
+
+        assert retry_api_call(partial(api_func, "ok"), max_attempts=2, min_wait=0, max_wait=0) == "ok"
+
+
+@pytest.mark.unit
+class TestAsyncRetryApiCall:
+    """Test suite for aretry_api_call function."""
+
+    def test_successful_async_call(self):
+        """Test successful async API call without retries."""
+        calls = []
+
+        async def api_func(a, b=None):
+            calls.append((a, b))
+            return f"{a}-{b}"
+
+        result = asyncio.run(aretry_api_call(api_func, "arg1", b="arg2"))
+
+        assert result == "arg1-arg2"
+        assert calls == [("arg1", "arg2")]
+
+    def test_async_retry_on_failure(self):
+        """Test async retry on API call failure."""
+        attempts = []
+
+        async def api_func():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise Exception("Temporary failure")
+            return "success"
+
+        result = asyncio.run(aretry_api_call(api_func, max_attempts=3, min_wait=0.1, max_wait=0.2))
+
+        assert result == "success"
+        assert len(attempts) == 3
+
+    def test_async_exception_after_max_attempts(self):
+        """Test that exception is raised after max attempts."""
+        attempts = []
+
+        async def api_func():
+            attempts.append(1)
+            raise Exception("Always fails")
+
+        with pytest.raises(Exception, match="Always fails"):
+            asyncio.run(aretry_api_call(api_func, max_attempts=2, min_wait=0.1, max_wait=0.2))
+
+        assert len(attempts) == 2
+
+
+@pytest.mark.unit
+class TestRetryConditions:
+    """Test suite for retry_on and jitter."""
+
+    def test_retry_on_exception_types(self):
+        """Test that only the listed exception types are retried."""
+        decorator = create_retry_decorator(max_attempts=3, min_wait=0, max_wait=0, retry_on=(TimeoutError,))
+        mock_func = Mock(side_effect=[TimeoutError("slow"), "success"])
+
+        assert decorator(lambda: mock_func())() == "success"
+
+        mock_func = Mock(side_effect=PermissionError("denied"))
+        with pytest.raises(PermissionError):
+            decorator(lambda: mock_func())()
+        assert mock_func.call_count == 1
+
+    def test_retry_on_predicate(self):
+        """Test that a predicate decides which exceptions are retried."""
+        attempts = []
+
+        async def api_func():
+            attempts.append(1)
+            raise ValueError("permanent" if len(attempts) > 1 else "transient")
+
+        with pytest.raises(ValueError, match="permanent"):
+            asyncio.run(aretry_api_call(
+                api_func, max_attempts=5, min_wait=0, max_wait=0,
+                retry_on=lambda e: str(e) == "transient"
+            ))
+
+        assert len(attempts) == 2
+
+    def test_backoff_without_jitter_is_truncated_exponential(self):
+        """Test that waits grow by the multiplier and stop at max_wait."""
+        delays = [_backoff_delay(attempt, 1, 10, 2, "none") for attempt in range(1, 6)]
+
+        assert delays == [1, 2, 4, 8, 10]
+
+    @patch('utils.retry_utils.random.uniform', side_effect=lambda low, high: high)
+    def test_jitter_modes_bound_the_wait(self, mock_uniform):
+        """Test the range each jitter mode draws from."""
+        assert _backoff_delay(3, 1, 10, 2, "full") == 4
+        mock_uniform.assert_called_with(0, 4)
+
+        assert _backoff_delay(3, 1, 10, 2, "equal") == 4
+        mock_uniform.assert_called_with(0, 2.0)
+
+    def test_full_jitter_stays_below_cap(self):
+        """Test that full jitter never waits longer than the backoff cap."""
+        delays = [_backoff_delay(2, 1, 10, 2, "full") for _ in range(100)]
+
+        assert all(0 <= delay <= 2 for delay in delays)
+        assert len(set(delays)) > 1
+
+    @patch('utils.retry_utils.time.sleep')
+    def test_waits_between_attempts(self, mock_sleep):
+        """Test that the decorator sleeps the computed backoff between attempts."""
+        mock_func = Mock(side_effect=[Exception("Fail 1"), Exception("Fail 2"), "success"])
+        decorator = create_retry_decorator(max_attempts=3, min_wait=1, max_wait=10, multiplier=3, jitter="none")
+
+        assert decorator(lambda: mock_func())() == "success"
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [1, 3]
+
+    @patch('utils.retry_utils.time.sleep')
+    @patch('utils.retry_utils.asyncio.sleep', new_callable=AsyncMock)
+    def test_coroutine_function_waits_with_asyncio_sleep(self, mock_async_sleep, mock_sleep):
+        """Test that decorated coroutine functions stay async and back off with asyncio.sleep."""
+        attempts = []
+        decorator = create_retry_decorator(max_attempts=3, min_wait=1, max_wait=10, multiplier=3, jitter="none")
+
+        @decorator
+        async def test_func():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise Exception("Temporary failure")
+            return "success"
+
+        assert inspect.iscoroutinefunction(test_func)
+        assert asyncio.run(test_func()) == "success"
+        assert [call.args[0] for call in mock_async_sleep.await_args_list] == [1, 3]
+        mock_sleep.assert_not_called()
+
+    def test_zero_max_attempts_rejected(self):
+        """Test that at least one attempt is required."""
+        with pytest.raises(ValueError, match="max_attempts"):
+            create_retry_decorator(max_attempts=0)
+
+    def test_jitter_retries_succeed(self):
+        """Test that jittered retries still retry up to max_attempts."""
+        attempts = []
+
+        async def api_func():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError("reset")
+            return "success"
+
+        result = asyncio.run(aretry_api_call(api_func, max_attempts=3, min_wait=0.01, max_wait=0.02, jitter="equal"))
+
+        assert result == "success"
+        assert len(attempts) == 3
+
+
+def _status_error(status_code, headers=None):
+    """Build the httpx.HTTPStatusError raise_for_status() raises for a response."""
+    request = httpx.Request("POST", "http://localhost:11434/api/generate")
+    response = httpx.Response(status_code, headers=headers, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+@pytest.mark.unit
+class TestServerRequestedDelay:
+    """Test suite for honouring Retry-After and X-RateLimit-Reset headers."""
+
+    def test_retry_after_seconds(self):
+        """Test that a numeric Retry-After is used as the wait."""
+        assert _server_requested_delay(_status_error(429, {"Retry-After": "3"}), 10) == 3
+
+    def test_retry_after_http_date(self):
+        """Test that an HTTP-date Retry-After is converted to seconds from now."""
+        from email.utils import formatdate
+        error = _status_error(503, {"Retry-After": formatdate(time.time() + 5, usegmt=True)})
+
+        assert 3 <= _server_requested_delay(error, 10) <= 5
+
+    def test_rate_limit_reset_epoch(self):
+        """Test that X-RateLimit-Reset is read as an absolute Unix timestamp."""
+        error = _status_error(429, {"X-RateLimit-Reset": str(int(time.time()) + 4)})
+
+        assert 2 <= _server_requested_delay(error, 10) <= 4
+
+    def test_delay_clamped_to_max_wait_and_zero(self):
+        """Test that the hint never exceeds max_wait or goes negative."""
+        assert _server_requested_delay(_status_error(429, {"Retry-After": "3600"}), 10) == 10
+        assert _server_requested_delay(_status_error(429, {"X-RateLimit-Reset": "1"}), 10) == 0
+
+    def test_no_usable_hint(self):
+        """Test that missing or malformed headers and errors without a response give None."""
+        assert _server_requested_delay(_status_error(500), 10) is None
+        assert _server_requested_delay(_status_error(429, {"Retry-After": "soon"}), 10) is None
+        assert _server_requested_delay(ConnectionError("reset"), 10) is None
+
+    @patch('utils.retry_utils.time.sleep')
+    def test_retry_waits_for_server_hint(self, mock_sleep):
+        """Test that retry_api_call sleeps for Retry-After instead of the backoff."""
+        attempts = []
+
+        def api_func():
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise _status_error(429, {"Retry-After": "7"})
+            return "success"
+
+        assert retry_api_call(api_func, max_attempts=3, min_wait=1, max_wait=10, jitter="none") == "success"
+        mock_sleep.assert_called_once_with(7.0)
+
+    @patch('utils.retry_utils.asyncio.sleep', new_callable=AsyncMock)
+    def test_async_retry_waits_for_server_hint(self, mock_async_sleep):
+        """Test that aretry_api_call honours Retry-After as well."""
+        attempts = []
+
+        async def api_func():
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise _status_error(503, {"Retry-After": "2"})
+            return "success"
+
+        assert asyncio.run(aretry_api_call(api_func, max_attempts=3, min_wait=1, max_wait=10)) == "success"
+        mock_async_sleep.assert_awaited_once_with(2.0)
+
+
+@pytest.mark.unit
+class TestPerAttemptTimeout:
+    """Test suite for bounding each attempt with per_attempt_timeout."""
+
+    def test_hung_attempt_is_retried(self):
+        """Test that an attempt exceeding the timeout fails with TimeoutError and is retried."""
+        attempts = []
+        release = threading.Event()
+
+        def api_func():
+            attempts.append(1)
+            if len(attempts) == 1:
+                release.wait(timeout=5)
+                return "too late"
+            return "success"
+
+        try:
+            result = retry_api_call(api_func, max_attempts=2, min_wait=0, max_wait=0, per_attempt_timeout=0.05)
+        finally:
+            release.set()
+
+        assert result == "success"
+        assert len(attempts) == 2
+
+    def test_timeout_after_max_attempts(self):
+        """Test that TimeoutError is raised once every attempt has timed out."""
+        release = threading.Event()
+
+        def api_func():
+            release.wait(timeout=5)
+
+        try:
+            with pytest.raises(TimeoutError, match="api_func did not respond within 0.05 seconds"):
+                retry_api_call(api_func, max_attempts=2, min_wait=0, max_wait=0, per_attempt_timeout=0.05)
+        finally:
+            release.set()
+
+    def test_timeouts_count_as_breaker_failures(self):
+        """Test that timed-out calls trip the circuit breaker."""
+        release = threading.Event()
+
+        def hanging_backend():
+            release.wait(timeout=5)
+
+        try:
+            for _ in range(5):
+                with pytest.raises(TimeoutError):
+                    retry_api_call(hanging_backend, max_attempts=1, per_attempt_timeout=0.01)
+            with pytest.raises(ServiceUnavailable):
+                retry_api_call(hanging_backend, max_attempts=1, per_attempt_timeout=0.01)
+        finally:
+            release.set()
+
+    def test_fast_attempt_returns_result(self):
+        """Test that a call finishing within the timeout returns its result."""
+        def api_func(value, suffix=""):
+            return value + suffix
+
+        assert retry_api_call(api_func, "ok", suffix="!", per_attempt_timeout=5) == "ok!"
+
+    def test_async_hung_attempt_is_cancelled_and_retried(self):
+        """Test that aretry_api_call cancels an attempt exceeding the timeout and retries."""
+        attempts = []
+        cancelled = []
+
+        async def api_func():
+            attempts.append(1)
+            if len(attempts) == 1:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(1)
+                    raise
+            return "success"
+
+        result = asyncio.run(aretry_api_call(api_func, max_attempts=2, min_wait=0, max_wait=0, per_attempt_timeout=0.05))
+
+        assert result == "success"
+        assert cancelled == [1]
+
+
+@pytest.mark.unit
+class TestDeadline:
+    """Test suite for bounding a call's total time with deadline_seconds."""
+
+    def test_stops_before_wait_past_deadline(self):
+        """Test that no retry is started when its wait would end after the deadline."""
+        attempts = []
+        clock = [100.0]
+
+        def api_func():
+            attempts.append(1)
+            raise ConnectionError("reset")
+
+        def sleep(delay):
+            clock[0] += delay
+
+        with patch('utils.retry_utils.time.monotonic', side_effect=lambda: clock[0]), \
+                patch('utils.retry_utils.time.sleep', side_effect=sleep) as mock_sleep:
+            with pytest.raises(ConnectionError):
+                retry_api_call(api_func, max_attempts=5, min_wait=2, max_wait=10, jitter="none", deadline_seconds=5)
+
+        # Waits of 2 then 4 seconds: the second would end past the 5 second deadline
+        assert len(attempts) == 2
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [2]
+
+    @patch('utils.retry_utils.time.sleep')
+    def test_max_attempts_still_applies(self, mock_sleep):
+        """Test that a generous deadline does not allow more than max_attempts."""
+        attempts = []
+
+        def api_func():
+            attempts.append(1)
+            raise ConnectionError("reset")
+
+        with pytest.raises(ConnectionError):
+            retry_api_call(api_func, max_attempts=3, min_wait=1, max_wait=1, jitter="none", deadline_seconds=60)
+        assert len(attempts) == 3
+
+    def test_deadline_uses_monotonic_clock_from_first_attempt(self):
+        """Test that time spent in slow attempts counts towards the deadline."""
+        attempts = []
+        clock = iter([100.0, 104.5])
+
+        def api_func():
+            attempts.append(1)
+            raise ConnectionError("reset")
+
+        with patch('utils.retry_utils.time.monotonic', side_effect=lambda: next(clock)):
+            with pytest.raises(ConnectionError):
+                retry_api_call(api_func, max_attempts=3, min_wait=1, max_wait=1, jitter="none", deadline_seconds=5)
+
+        # The first attempt took 4.5 seconds, so a 1 second wait would pass the deadline
+        assert len(attempts) == 1
+
+    @patch('utils.retry_utils.time.sleep')
+    def test_decorator_deadline(self, mock_sleep):
+        """Test that create_retry_decorator honours deadline_seconds."""
+        attempts = []
+
+        @create_retry_decorator(max_attempts=5, min_wait=3, max_wait=10, jitter="none", deadline_seconds=2)
+        def api_func():
+            attempts.append(1)
+            raise ConnectionError("reset")
+
+        with pytest.raises(ConnectionError):
+            api_func()
+        assert len(attempts) == 1
+        mock_sleep.assert_not_called()
+
+    def test_async_deadline(self):
+        """Test that aretry_api_call honours deadline_seconds."""
+        attempts = []
+        clock = [100.0]
+
+        async def api_func():
+            attempts.append(1)
+            raise ConnectionError("reset")
+
+        async def sleep(delay):
+            clock[0] += delay
+
+        with patch('utils.retry_utils.time.monotonic', side_effect=lambda: clock[0]), \
+                patch('utils.retry_utils.asyncio.sleep', side_effect=sleep):
+            with pytest.raises(ConnectionError):
+                asyncio.run(aretry_api_call(
+                    api_func, max_attempts=5, min_wait=2, max_wait=10, jitter="none", deadline_seconds=5
+                ))
+        assert len(attempts) == 2
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """Test suite for the per-function circuit breaker."""
+
+    def _failing(self, error=ConnectionError("backend down")):
+        calls = []
+
+        def api_func():
+            calls.append(1)
+            raise error
+        return api_func, calls
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that calls fail fast once the threshold of failed calls is reached."""
+        api_func, calls = self._failing()
+
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                retry_api_call(api_func, max_attempts=1)
+
+        with pytest.raises(ServiceUnavailable):
+            retry_api_call(api_func, max_attempts=1)
+        assert len(calls) == 5
+        assert _breakers[api_func.__qualname__].state == "open"
+
+    @patch('utils.retry_utils.time.monotonic')
+    def test_half_open_probe_closes_on_success(self, mock_monotonic):
+        """Test that after the cooldown one probe is let through and a success closes the breaker."""
+        mock_monotonic.return_value = 100.0
+        outcomes = [ConnectionError("down")] * 5 + ["ok"]
+
+        def api_func():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                retry_api_call(api_func, max_attempts=1)
+
+        mock_monotonic.return_value = 129.0
+        with pytest.raises(ServiceUnavailable):
+            retry_api_call(api_func, max_attempts=1)
+
+        mock_monotonic.return_value = 130.0
+        assert retry_api_call(api_func, max_attempts=1) == "ok"
+        breaker = _breakers[api_func.__qualname__]
+        assert breaker.state == "closed"
+        assert breaker.consecutive_failures == 0
+
+    @patch('utils.retry_utils.time.monotonic')
+    def test_failed_probe_reopens(self, mock_monotonic):
+        """Test that a failed half-open probe reopens the breaker for another cooldown."""
+        mock_monotonic.return_value = 100.0
+        api_func, calls = self._failing()
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                retry_api_call(api_func, max_attempts=1)
+
+        mock_monotonic.return_value = 130.0
+        with pytest.raises(ConnectionError):
+            retry_api_call(api_func, max_attempts=1)
+
+        breaker = _breakers[api_func.__qualname__]
+        assert breaker.state == "open"
+        assert breaker.opened_at == 130.0
+        with pytest.raises(ServiceUnavailable):
+            retry_api_call(api_func, max_attempts=1)
+        assert len(calls) == 6
+
+    @patch('utils.retry_utils.time.monotonic')
+    def test_cancelled_probe_releases_half_open(self, mock_monotonic):
+        """Test that a cancelled half-open probe does not leave the breaker stuck rejecting calls."""
+        mock_monotonic.return_value = 100.0
+        failing = True
+
+        async def api_func():
+            if failing:
+                raise ConnectionError("down")
+            await asyncio.sleep(5)
+            return "ok"
+
+        async def fail():
+            with pytest.raises(ConnectionError):
+                await aretry_api_call(api_func, max_attempts=1)
+
+        for _ in range(5):
+            asyncio.run(fail())
+        breaker = _breakers[api_func.__qualname__]
+        assert breaker.state == "open"
+
+        async def cancel_probe():
+            probe = asyncio.ensure_future(aretry_api_call(api_func, max_attempts=1))
+            await asyncio.sleep(0)
+            assert breaker.state == "half_open"
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+
+        mock_monotonic.return_value = 130.0
+        failing = False
+        asyncio.run(cancel_probe())
+
+        assert breaker.state == "open"
+        assert breaker.allow()
+        assert breaker.state == "half_open"
+
+    @patch('utils.retry_utils.time.monotonic')
+    def test_interrupted_sync_probe_releases_half_open(self, mock_monotonic):
+        """Test that a KeyboardInterrupt during a sync probe lets the next call probe again."""
+        mock_monotonic.return_value = 100.0
+        outcomes = [ConnectionError("down")] * 5 + [KeyboardInterrupt(), "ok"]
+
+        def api_func():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, BaseException):
+                raise outcome
+            return outcome
+
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                retry_api_call(api_func, max_attempts=1)
+
+        mock_monotonic.return_value = 130.0
+        with pytest.raises(KeyboardInterrupt):
+            retry_api_call(api_func, max_attempts=1)
+
+        assert _breakers[api_func.__qualname__].state == "open"
+        assert retry_api_call(api_func, max_attempts=1) == "ok"
+        assert _breakers[api_func.__qualname__].state == "closed"
+
+    def test_success_resets_failure_count(self):
+        """Test that only consecutive failures count towards opening the breaker."""
+        outcomes = [ConnectionError("down")] * 4 + ["ok"] + [ConnectionError("down")] * 4
+
+        def api_func():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        for _ in range(9):
+            try:
+                retry_api_call(api_func, max_attempts=1)
+            except ConnectionError:
+                pass
+
+        assert _breakers[api_func.__qualname__].state == "closed"
+
+    def test_non_retryable_errors_do_not_open(self):
+        """Test that errors excluded by retry_on do not count as backend failures."""
+        api_func, calls = self._failing(ValueError("bad request"))
+
+        for _ in range(6):
+            with pytest.raises(ValueError):
+                retry_api_call(api_func, max_attempts=1, retry_on=ConnectionError)
+
+        assert len(calls) == 6
+        assert _breakers[api_func.__qualname__].state == "closed"
+
+    def test_functions_have_independent_breakers(self):
+        """Test that an open breaker for one function does not block another."""
+        api_func, _ = self._failing()
+
+        def healthy_func():
+            return "ok"
+
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                retry_api_call(api_func, max_attempts=1)
+
+        assert retry_api_call(healthy_func) == "ok"
+
+    def test_async_calls_share_breaker(self):
+        """Test that aretry_api_call fails fast once the breaker is open."""
+        calls = []
+
+        async def api_func():
+            calls.append(1)
+            raise ConnectionError("backend down")
+
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                asyncio.run(aretry_api_call(api_func, max_attempts=1))
+
+        with pytest.raises(ServiceUnavailable):
+            asyncio.run(aretry_api_call(api_func, max_attempts=1))
+        assert len(calls) == 5
+
+
+@pytest.mark.unit
+class TestRequestCollapsing:
+    """Test suite for collapsing identical in-flight retry_api_call calls."""
+
+    @patch('utils.retry_utils.logger')
+    def test_concurrent_identical_calls_share_one_backend_call(self, mock_logger):
+        """Test that callers with the same collapse_key wait for the in-flight call."""
+        release = threading.Event()
+        calls = []
+
+        def api_func(prompt):
+            calls.append(prompt)
+            release.wait(timeout=5)
+            return f"reply to {prompt}"
+
+        def joined():
+            return sum("Joining" in call.args[0] for call in mock_logger.info.call_args_list)
+
+        key = hashable_args(api_func, "hello")
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(retry_api_call, api_func, "hello", collapse_key=key)]
+            while key not in _inflight:
+                time.sleep(0.001)
+            futures += [pool.submit(retry_api_call, api_func, "hello", collapse_key=key) for _ in range(3)]
+            while joined() < 3:
+                time.sleep(0.001)
+            release.set()
+            results = [f.result(timeout=5) for f in futures]
+
+        assert results == ["reply to hello"] * 4
+        assert calls == ["hello"]
+        assert _inflight == {}
+
+    def test_exception_is_shared_and_key_released(self):
+        """Test that a failed call raises for the caller and a later call runs again."""
+        outcomes = [ValueError("bad"), "ok"]
+
+        def api_func():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        with pytest.raises(ValueError, match="bad"):
+            retry_api_call(api_func, collapse_key="k", max_attempts=1)
+
+        assert retry_api_call(api_func, collapse_key="k", max_attempts=1) == "ok"
+        assert _inflight == {}
+
+    @patch('utils.retry_utils.logger')
+    def test_interrupted_leader_releases_followers(self, mock_logger):
+        """Test that a leader ending with a BaseException does not leave followers blocked."""
+        release = threading.Event()
+
+        def api_func():
+            release.wait(timeout=5)
+            raise KeyboardInterrupt
+
+        def joined():
+            return sum("Joining" in call.args[0] for call in mock_logger.info.call_args_list)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(retry_api_call, api_func, collapse_key="k", max_attempts=1)
+            while "k" not in _inflight:
+                time.sleep(0.001)
+            follower = pool.submit(retry_api_call, api_func, collapse_key="k", max_attempts=1)
+            while joined() < 1:
+                time.sleep(0.001)
+            release.set()
+
+            with pytest.raises(KeyboardInterrupt):
+                leader.result(timeout=5)
+            with pytest.raises(concurrent.futures.CancelledError):
+                follower.result(timeout=5)
+
+        assert _inflight == {}
+
+    def test_sequential_calls_are_not_collapsed(self):
+        """Test that a finished call's result is not reused."""
+        replies = iter(["first", "second"])
+
+        def api_func():
+            return next(replies)
+
+        assert retry_api_call(api_func, collapse_key="k") == "first"
+        assert retry_api_call(api_func, collapse_key="k") == "second"
+
+    def test_concurrent_identical_async_calls_share_one_backend_call(self):
+        """Test that awaiting callers with the same collapse_key share the in-flight call."""
+        calls = []
+
+        async def api_func(prompt):
+            calls.append(prompt)
+            await asyncio.sleep(0.01)
+            return f"reply to {prompt}"
+
+        async def run():
+            key = hashable_args(api_func, "hello")
+            return await asyncio.gather(*(aretry_api_call(api_func, "hello", collapse_key=key) for _ in range(4)))
+
+        assert asyncio.run(run()) == ["reply to hello"] * 4
+        assert calls == ["hello"]
+        assert _ainflight == {}
+
+    def test_async_exception_is_shared(self):
+        """Test that every collapsed async caller sees the in-flight call's exception."""
+        calls = []
+
+        async def api_func():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("bad")
+
+        async def run():
+            return await asyncio.gather(
+                *(aretry_api_call(api_func, collapse_key="k", max_attempts=1) for _ in range(3)),
+                return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(calls) == 1
+        assert _ainflight == {}
+
+    def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        """Test that cancelling a collapsed waiter leaves the in-flight call running."""
+        async def api_func():
+            await asyncio.sleep(0.02)
+            return "ok"
+
+        async def run():
+            leader = asyncio.create_task(aretry_api_call(api_func, collapse_key="k"))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(aretry_api_call(api_func, collapse_key="k"))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            return await leader
+
+        assert asyncio.run(run()) == "ok"
+
+    def test_hashable_args_ignores_keyword_order(self):
+        """Test that keys match regardless of keyword argument order."""
+        def api_func(prompt, a=None, b=None):
+            return prompt
+
+        assert hashable_args(api_func, "p", a=1, b=2) == hashable_args(api_func, "p", b=2, a=1)
+        assert hashable_args(api_func, "p") != hashable_args(api_func, "q")
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """Test suite for reusing successful results with cache_ttl."""
+
+    def test_identical_calls_hit_cache(self):
+        """Test that a repeated call within the TTL returns the cached result without calling the backend."""
+        calls = []
+
+        def api_func(prompt, temperature=0):
+            calls.append(prompt)
+            return {"answer": prompt}
+
+        first = retry_api_call(api_func, "hello", temperature=0, cache_ttl=60)
+        second = retry_api_call(api_func, "hello", temperature=0, cache_ttl=60)
+
+        assert second is first
+        assert calls == ["hello"]
+
+    def test_different_arguments_miss(self):
+        """Test that calls with different arguments are cached separately."""
+        calls = []
+
+        def api_func(prompt):
+            calls.append(prompt)
+            return prompt
+
+        assert retry_api_call(api_func, "a", cache_ttl=60) == "a"
+        assert retry_api_call(api_func, "b", cache_ttl=60) == "b"
+        assert calls == ["a", "b"]
+
+    def test_expired_entry_calls_backend(self):
+        """Test that a result older than cache_ttl is refreshed."""
+        calls = []
+
+        def api_func():
+            calls.append(1)
+            return len(calls)
+
+        with patch('utils.retry_utils.time.monotonic', side_effect=[100.0, 200.0, 200.0]):
+            assert retry_api_call(api_func, cache_ttl=60) == 1
+            assert retry_api_call(api_func, cache_ttl=60) == 2
+
+    def test_failures_are_not_cached(self):
+        """Test that an exception is raised again on the next call instead of being remembered."""
+        attempts = []
+
+        def api_func():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ValueError("bad request")
+            return "success"
+
+        with pytest.raises(ValueError):
+            retry_api_call(api_func, max_attempts=1, cache_ttl=60)
+        assert retry_api_call(api_func, max_attempts=1, cache_ttl=60) == "success"
+
+    def test_custom_cache_key(self):
+        """Test that calls sharing an explicit cache_key share the cached result."""
+        def api_func(prompt, request_id):
+            return f"{prompt}-{request_id}"
+
+        assert retry_api_call(api_func, "hi", 1, cache_ttl=60, cache_key="hi") == "hi-1"
+        assert retry_api_call(api_func, "hi", 2, cache_ttl=60, cache_key="hi") == "hi-1"
+        assert "hi" in _response_cache
+
+    def test_without_ttl_nothing_is_cached(self):
+        """Test that results are only cached when cache_ttl is given."""
+        retry_api_call(lambda: "ok")
+
+        assert len(_response_cache) == 0
+
+    def test_async_identical_calls_hit_cache(self):
+        """Test that aretry_api_call reuses cached results too."""
+        calls = []
+
+        async def api_func(prompt):
+            calls.append(prompt)
+            return prompt.upper()
+
+        async def run():
+            return [await aretry_api_call(api_func, "hi", cache_ttl=60) for _ in range(3)]
+
+        assert asyncio.run(run()) == ["HI", "HI", "HI"]
+        assert calls == ["hi"]
+
+
+@pytest.mark.unit
+class TestAdaptiveAttempts:
+    """Test suite for scaling max_attempts by recent success rate."""
+
+    def test_full_attempts_without_history(self):
+        """Test that max_attempts is used until enough attempts have been recorded."""
+        attempts = []
+
+        def backend():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError("reset")
+            return "success"
+
+        assert retry_api_call(backend, max_attempts=3, min_wait=0, max_wait=0, adaptive_attempts=True) == "success"
+        assert len(attempts) == 3
+        assert list(_attempt_windows[backend.__qualname__].outcomes) == [0, 0, 1]
+
+    def test_healthy_backend_gets_single_attempt(self):
+        """Test that a function whose recent attempts all succeeded is not retried."""
+        attempts = []
+
+        def backend():
+            attempts.append(1)
+            raise ConnectionError("reset")
+
+        window = _attempt_window_for(backend)
+        for _ in range(20):
+            window.record(True)
+
+        with pytest.raises(ConnectionError):
+            retry_api_call(backend, max_attempts=5, min_wait=0, max_wait=0, adaptive_attempts=True)
+        assert len(attempts) == 1
+
+    def test_mostly_healthy_backend_gets_three_attempts(self):
+        """Test that a success rate between 70% and 99% allows up to 3 attempts."""
+        attempts = []
+
+        def backend():
+            attempts.append(1)
+            raise ConnectionError("reset")
+
+        window = _attempt_window_for(backend)
+        for outcome in [True] * 18 + [False] * 2:
+            window.record(outcome)
+
+        with pytest.raises(ConnectionError):
+            retry_api_call(backend, max_attempts=5, min_wait=0, max_wait=0, adaptive_attempts=True)
+        assert len(attempts) == 3
+
+    def test_degraded_backend_gets_ceiling(self):
+        """Test that a low success rate allows up to max_attempts."""
+        attempts = []
+
+        def backend():
+            attempts.append(1)
+            raise ConnectionError("reset")
+
+        window = _attempt_window_for(backend)
+        for outcome in [True] * 10 + [False] * 10:
+            window.record(outcome)
+
+        with pytest.raises(ConnectionError):
+            retry_api_call(backend, max_attempts=5, min_wait=0, max_wait=0, adaptive_attempts=True)
+        assert len(attempts) == 5
+
+    def test_non_retryable_errors_count_as_healthy(self):
+        """Test that an error retry_on rejects is recorded as the backend answering."""
+        def backend():
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            retry_api_call(backend, retry_on=ConnectionError, adaptive_attempts=True)
+        assert list(_attempt_windows[backend.__qualname__].outcomes) == [1]
+
+    def test_disabled_by_default(self):
+        """Test that no attempt history is kept unless adaptive_attempts is set."""
+        retry_api_call(lambda: "ok")
+
+        assert len(_attempt_windows) == 0
+
+    def test_async_adaptive_attempts(self):
+        """Test that aretry_api_call scales max_attempts by the recorded history too."""
+        attempts = []
+
+        async def backend():
+            attempts.append(1)
+            raise ConnectionError("reset")
+
+        window = _attempt_window_for(backend)
+        for _ in range(20):
+            window.record(True)
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(aretry_api_call(backend, max_attempts=5, min_wait=0, max_wait=0, adaptive_attempts=True))
+        assert len(attempts) == 1
+        assert list(window.outcomes)[-1] == 0
+
+
+@pytest.mark.unit
+class TestRetryStats:
+    """Test suite for the shared retry counters."""
+
+    @patch('utils.retry_utils.time.sleep')
+    def test_retries_and_waits_counted(self, mock_sleep):
+        """Test that a call succeeding on its third attempt counts one call, two retries and their waits."""
+        attempts = []
+
+        def api_func():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError("reset")
+            return "success"
+
+        retry_api_call(api_func, max_attempts=3, min_wait=1, max_wait=10, jitter="none")
+        stats = get_retry_stats()
+
+        assert stats["calls"] == 1
+        assert stats["successes"] == 1
+        assert stats["failures"] == 0
+        assert stats["retries"] == 2
+        assert stats["cumulative_wait_seconds"] == 3
+        assert stats["success_rate"] == 1.0
+        assert stats["retry_rate"] == 2.0
+
+    def test_failures_and_breaker_trips_counted(self):
+        """Test that exhausted calls, breaker trips and rejected calls are counted."""
+        def failing_backend():
+            raise ConnectionError("down")
+
+        for _ in range(6):
+            with pytest.raises((ConnectionError, ServiceUnavailable)):
+                retry_api_call(failing_backend, max_attempts=1)
+        stats = get_retry_stats()
+
+        assert stats["calls"] == 6
+        assert stats["failures"] == 6
+        assert stats["breaker_trips"] == 1
+        assert stats["success_rate"] == 0.0
+
+    def test_decorated_and_async_calls_counted(self):
+        """Test that decorated functions and aretry_api_call share the counters."""
+        @create_retry_decorator(max_attempts=1)
+        def decorated():
+            return "ok"
+
+        async def api_func():
+            return "ok"
+
+        decorated()
+        asyncio.run(aretry_api_call(api_func))
+
+        assert get_retry_stats()["successes"] == 2
+
+    def test_reset(self):
+        """Test that reset_retry_stats zeroes every counter."""
+        retry_api_call(lambda: "ok")
+        reset_retry_stats()
+
+        stats = get_retry_stats()
+        assert stats["calls"] == 0
+        assert stats["successes"] == 0
+        assert stats["retry_rate"] == 0.0
+
+    @patch('utils.retry_utils._STATS_LOG_INTERVAL', 2)
+    @patch('utils.retry_utils.logger')
+    def test_periodic_summary_logged(self, mock_logger):
+        """Test that a summary is logged at INFO every _STATS_LOG_INTERVAL calls."""
+        for _ in range(4):
+            retry_api_call(lambda: "ok")
+
+        summaries = [call for call in mock_logger.info.call_args_list if call.args[0].startswith("Retry stats")]
+        assert len(summaries) == 2
 
 
 @pytest.mark.unit
@@ -208,6 +1253,57 @@ class TestSafeApiCall:
         assert result == fallback
         assert result["error"] == "Service unavailable"
 
+    def test_returns_last_good_result_on_error(self):
+        """Test that a failing call returns the last cached result for its key."""
+        mock_func = Mock(side_effect=["fresh", Exception("Error")])
+
+        assert safe_api_call(mock_func, cache_key="prompt", fallback_value="fallback") == "fresh"
+        assert safe_api_call(mock_func, cache_key="prompt", fallback_value="fallback") == "fresh"
+
+    def test_stale_result_is_per_key(self):
+        """Test that a cached result is only returned for its own key."""
+        mock_func = Mock(side_effect=["fresh", Exception("Error")])
+
+        safe_api_call(mock_func, cache_key="prompt-a")
+
+        assert safe_api_call(mock_func, cache_key="prompt-b", fallback_value="fallback") == "fallback"
+
+    @patch('utils.retry_utils.time.monotonic')
+    def test_expired_result_uses_fallback(self, mock_monotonic):
+        """Test that results older than cache_ttl are not returned."""
+        mock_func = Mock(side_effect=["fresh", Exception("Error"), Exception("Error")])
+        mock_monotonic.return_value = 100.0
+        safe_api_call(mock_func, cache_key="prompt")
+
+        mock_monotonic.return_value = 130.0
+        assert safe_api_call(mock_func, cache_key="prompt", cache_ttl=30, fallback_value="fallback") == "fresh"
+
+        mock_monotonic.return_value = 130.1
+        assert safe_api_call(mock_func, cache_key="prompt", cache_ttl=30, fallback_value="fallback") == "fallback"
+
+    def test_without_cache_key_nothing_is_remembered(self):
+        """Test that results are only cached when a cache_key is given."""
+        mock_func = Mock(side_effect=["fresh", Exception("Error")])
+
+        safe_api_call(mock_func)
+
+        assert safe_api_call(mock_func, fallback_value="fallback") == "fallback"
+        assert len(_stale_results) == 0
+
+    @patch('utils.retry_utils.logger')
+    def test_traceback_only_logged_at_debug(self, mock_logger):
+        """Test that the error log carries exc_info only when DEBUG is enabled."""
+        def failing_func():
+            raise ValueError("boom")
+
+        mock_logger.isEnabledFor.return_value = False
+        safe_api_call(failing_func)
+        assert mock_logger.error.call_args.kwargs["exc_info"] is False
+
+        mock_logger.isEnabledFor.return_value = True
+        safe_api_call(failing_func)
+        assert mock_logger.error.call_args.kwargs["exc_info"] is True
+
 
 @pytest.mark.unit
 class TestStandardRetry:
@@ -250,23 +1346,19 @@ class TestRetryEdgeCases:
     """Test suite for edge cases in retry logic."""
 
     def test_zero_max_attempts(self):
-        """Test behavior with zero max attempts."""
+        """Test that zero max attempts is rejected by every retry helper."""
         mock_func = Mock(return_value="success")
 
-        # With 0 attempts, function should not be called at all
-        # but tenacity's stop_after_attempt(0) might behave differently
-        # Let's test actual behavior
-        try:
-            decorator = create_retry_decorator(max_attempts=0)
-
-            @decorator
-            def test_func():
-                return mock_func()
+        async def api_func():
+            return mock_func()
 
-            test_func()
-        except Exception:
-            # Expected - can't retry 0 times
-            pass
+        with pytest.raises(ValueError, match="max_attempts must be at least 1"):
+            create_retry_decorator(max_attempts=0)
+        with pytest.raises(ValueError, match="max_attempts must be at least 1"):
+            retry_api_call(mock_func, max_attempts=0)
+        with pytest.raises(ValueError, match="max_attempts must be at least 1"):
+            asyncio.run(aretry_api_call(api_func, max_attempts=0))
+        mock_func.assert_not_called()
 
     def test_single_max_attempt(self):
         """Test with max_attempts=1 (no retries)."""
@@ -310,3 +1402,20 @@ class TestRetryEdgeCases:
         # Wait time should be capped by max_wait
         wait_time = call_times[1] - call_times[0]
         assert wait_time < 1.0  # Much less than what multiplier=100 would cause
+
+    def test_retry_api_call_rejects_zero_max_attempts(self):
+        """Test that retry_api_call validates max_attempts like the decorator."""
+        def api_func():
+            return "success"
+
+        with pytest.raises(ValueError, match="max_attempts"):
+            retry_api_call(api_func, max_attempts=0)
+
+    @patch('utils.retry_utils.create_retry_decorator')
+    def test_retry_api_call_builds_no_decorator(self, mock_create):
+        """Test that retry_api_call runs the retry loop without building a decorator per call."""
+        def api_func(value):
+            return value * 2
+
+        assert retry_api_call(api_func, 21) == 42
+        mock_create.assert_not_called()
@@ -0,0 +1,98 @@
+"""
+Unit Tests for Application Settings Snapshot
+
+Tests for the frozen AppSettings dataclass built from configuration.
+
+Author: Harsh
+"""
+
+import logging
+import dataclasses
+import pytest
+from settings import AppSettings, LoggingSettings, load_settings
+from utils.config_loader import ConfigLoader
+
+
+@pytest.mark.unit
+class TestLoggingSettings:
+    """Test suite for LoggingSettings."""
+
+    def test_level_resolved_to_int(self):
+        """Test that the level name is resolved to a numeric level once."""
+        settings = LoggingSettings.from_dict({'level': 'DEBUG'})
+
+        assert settings.level_name == 'DEBUG'
+        assert settings.level == logging.DEBUG
+
+    def test_lowercase_level_name(self):
+        """Test that level names are case-insensitive."""
+        settings = LoggingSettings.from_dict({'level': 'warning'})
+
+        assert settings.level == logging.WARNING
+
+    def test_unknown_level_defaults_to_info(self):
+        """Test that an unknown level falls back to INFO."""
+        settings = LoggingSettings.from_dict({'level': 'VERBOSE'})
+
+        assert settings.level == logging.INFO
+
+    def test_defaults_for_missing_keys(self):
+        """Test defaults when the logging section is empty."""
+        settings = LoggingSettings.from_dict({})
+
+        assert settings.file == 'app.log'
+        assert settings.console is True
+        assert settings.max_bytes == 10485760
+        assert settings.backup_count == 5
+
+
+@pytest.mark.unit
+class TestAppSettings:
+    """Test suite for AppSettings."""
+
+    def test_from_config(self, temp_config_file):
+        """Test that settings are resolved from the config file."""
+        settings = load_settings(ConfigLoader(temp_config_file))
+
+        assert settings.ollama_model_name == "llama3.2:latest"
+        assert settings.openai_model_name == "gpt-3.5-turbo"
+        assert settings.ollama_warmup is True
+        assert settings.ui_title == "Sensitive Information Redaction Tool"
+        assert settings.server_host == "127.0.0.1"
+        assert settings.server_port == 7860
+        assert settings.input_lines == 10
+        assert settings.sanitize_errors is True
+        assert settings.batch_processing_enabled is False
+        assert settings.batch_strategy == "combined"
+        assert settings.logging.level == logging.INFO
+        assert settings.queue_max_size == 20
+        assert settings.concurrency_limit == 4
+        assert settings.openai_concurrency_limit == 2
+
+    def test_categories(self, temp_config_file):
+        """Test that category options and map are resolved."""
+        settings = load_settings(ConfigLoader(temp_config_file))
+
+        assert settings.category_options == ("Email Addresses", "Phone Numbers")
+        assert settings.category_map["Email Addresses"] == "[EMAIL-1]"
+
+    def test_settings_are_frozen(self, temp_config_file):
+        """Test that settings cannot be modified after creation."""
+        settings = load_settings(ConfigLoader(temp_config_file))
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            settings.ui_title = "Changed"
+
+    def test_category_map_is_read_only(self, temp_config_file):
+        """Test that the category map cannot be mutated."""
+        settings = load_settings(ConfigLoader(temp_config_file))
+
+        with pytest.raises(TypeError):
+            settings.category_map["New"] = "[NEW-1]"
+
+    def test_uses_slots(self, temp_config_file):
+        """Test that settings instances do not carry a __dict__."""
+        settings = load_settings(ConfigLoader(temp_config_file))
+
+        assert '__slots__' in vars(AppSettings)
+        assert not hasattr(settings, '__dict__')
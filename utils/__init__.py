@@ -5,24 +5,45 @@ This module provides shared utilities for the sensitive information redaction to
 - Configuration management (config_loader)
 - Retry logic for API calls (retry_utils)
 - Rate limiting utilities (rate_limiter)
+- Result caching (cache)
+- Micro-batching of concurrent requests (batcher)
 
 Author: Harsh
 """
 
 from .config_loader import ConfigLoader, load_config
-from .retry_utils import retry_api_call, safe_api_call, standard_retry
-from .rate_limiter import RateLimiter, init_global_rate_limiter, get_global_rate_limiter, rate_limited
+from .retry_utils import (
+    retry_api_call, aretry_api_call, safe_api_call, standard_retry, ServiceUnavailable,
+    hashable_args, is_transient_error, RetryStats, get_retry_stats, reset_retry_stats
+)
+from .rate_limiter import (
+    RateLimiter, TokenBucket, init_global_rate_limiter, get_global_rate_limiter, rate_limited
+)
+from .cache import LRUCache, response_cache_key, dedupe_texts
+from .batcher import PromptBatcher
 
 __all__ = [
     'ConfigLoader',
     'load_config',
     'retry_api_call',
+    'aretry_api_call',
     'safe_api_call',
     'standard_retry',
+    'ServiceUnavailable',
+    'hashable_args',
+    'is_transient_error',
+    'RetryStats',
+    'get_retry_stats',
+    'reset_retry_stats',
     'RateLimiter',
+    'TokenBucket',
     'init_global_rate_limiter',
     'get_global_rate_limiter',
-    'rate_limited'
+    'rate_limited',
+    'LRUCache',
+    'response_cache_key',
+    'dedupe_texts',
+    'PromptBatcher'
 ]
 
 __version__ = "1.0.0"
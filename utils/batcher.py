@@ -0,0 +1,178 @@
+"""
+Request Batcher for Ollama Guardrail
+
+Collects items submitted concurrently from many threads and hands them to a
+batch function in groups, so N concurrent requests can share one model call
+(e.g. the combined multi-text detection prompt) instead of paying one round
+trip each. A group is dispatched as soon as it is full or the oldest item
+has waited ``max_delay_ms``.
+
+Ollama's /api/generate takes a single prompt, so the batch function decides
+how a group becomes model calls; the batcher only handles buffering and
+delivering each result back to its caller.
+
+Author: Harsh
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Queue entry telling the worker to flush and exit
+_STOP = object()
+
+
+class PromptBatcher:
+    """
+    Micro-batcher feeding concurrent submissions to a batch function.
+
+    A single daemon worker thread drains the queue. The batch function
+    receives the items of a group in submission order and must return one
+    result per item in the same order; if it raises, every caller in the
+    group gets the exception, and the worker carries on with the next group.
+
+    Attributes:
+        max_batch_size: Maximum number of items per batch function call
+        max_delay_ms: Maximum time the first item of a group waits for more items
+
+    Example:
+        >>> batcher = PromptBatcher(
+        ...     lambda texts: redactor.identify_sensitive_information_batch(texts, categories)
+        ... )
+        >>> result = batcher.batched_invoke("Call me at 555-123-4567")
+        >>> batcher.close()
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 10,
+        max_delay_ms: float = 10.0,
+        name: str = "prompt-batcher"
+    ):
+        """
+        Initialize the batcher and start its worker thread.
+
+        Args:
+            batch_fn: Function taking a list of items and returning their results in order
+            max_batch_size: Maximum number of items per batch function call
+            max_delay_ms: Maximum time in milliseconds to wait for a group to fill
+            name: Worker thread name
+
+        Raises:
+            ValueError: If max_batch_size is less than 1 or max_delay_ms is negative
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_delay_ms < 0:
+            raise ValueError("max_delay_ms must not be negative")
+
+        self.max_batch_size = max_batch_size
+        self.max_delay_ms = max_delay_ms
+        self._batch_fn = batch_fn
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, item: Any) -> Future:
+        """
+        Queue an item for the next batch.
+
+        Args:
+            item: Item passed to the batch function
+
+        Returns:
+            Future resolving to the item's result
+
+        Raises:
+            RuntimeError: If the batcher has been closed
+        """
+        future: Future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("PromptBatcher is closed")
+            self._queue.put((item, future))
+        return future
+
+    def batched_invoke(self, item: Any) -> Any:
+        """
+        Submit an item and block until its batch has been processed.
+
+        Args:
+            item: Item passed to the batch function
+
+        Returns:
+            The item's result
+
+        Raises:
+            Exception: Whatever the batch function raised for the item's group
+        """
+        return self.submit(item).result()
+
+    def close(self) -> None:
+        """Process the items already queued, then stop the worker thread."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._worker.join()
+
+    def __enter__(self) -> 'PromptBatcher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        """Worker loop: collect a group, dispatch it, repeat until stopped."""
+        stopping = False
+        while not stopping:
+            entry = self._queue.get()
+            if entry is _STOP:
+                return
+            batch: List[Tuple[Any, Future]] = [entry]
+            deadline = time.monotonic() + self.max_delay_ms / 1000.0
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[Any, Future]]) -> None:
+        """Call the batch function for one group and resolve its futures."""
+        # Drop callers that cancelled while queued
+        batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        logger.debug("Dispatching batch of %d items", len(batch))
+        try:
+            results = list(self._batch_fn([item for item, _ in batch]))
+            if len(results) != len(batch):
+                raise ValueError(f"Batch function returned {len(results)} results for {len(batch)} items")
+        except BaseException as e:
+            # Also catches BaseExceptions (e.g. a gevent Timeout), so the
+            # worker thread survives and no dequeued caller is left waiting
+            logger.error("Batch of %d items failed: %s", len(batch), e)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
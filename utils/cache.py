@@ -0,0 +1,166 @@
+"""
+Result Cache for Ollama Guardrail
+
+Provides a small thread-safe LRU cache and deterministic cache keys used to
+memoize expensive model results, such as repeated redaction requests for
+identical text.
+
+Author: Harsh
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Sequence, Tuple
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with a fixed capacity.
+
+    Unlike functools.lru_cache this stores explicit key/value pairs, so it
+    can memoize results of async calls and only cache successful results.
+
+    Attributes:
+        maxsize: Maximum number of entries kept (0 disables caching)
+        hits: Number of cache hits
+        misses: Number of cache misses
+
+    Example:
+        >>> cache = LRUCache(maxsize=128)
+        >>> cache.set("key", "value")
+        >>> cache.get("key")
+        'value'
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept (0 disables caching)
+        """
+        self.maxsize = max(0, int(maxsize))
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is not cached
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if self.maxsize == 0:
+            return
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+        logger.debug("Cache cleared")
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check whether a key is cached without updating recency."""
+        return key in self._data
+
+
+def response_cache_key(model_name: str, text: str, categories: Iterable[str] = ()) -> str:
+    """
+    Build a deterministic cache key for a model response.
+
+    The key is a 16-byte BLAKE2b digest (cheaper than SHA-256 for long
+    texts), so the cache never holds a second copy of large inputs, and it
+    is independent of the order of ``categories``.
+
+    Args:
+        model_name: Name of the model producing the response
+        text: Input text (or full prompt) sent to the model
+        categories: Selected categories or placeholder patterns, if any
+
+    Returns:
+        Hex digest cache key
+
+    Example:
+        >>> response_cache_key("llama3.2", "hi", ["B", "A"]) == response_cache_key("llama3.2", "hi", ["A", "B"])
+        True
+    """
+    fields = {"m": model_name, "c": sorted(categories), "t": text}
+    try:
+        payload = orjson.dumps(fields, option=orjson.OPT_SORT_KEYS, default=str)
+    except orjson.JSONEncodeError:
+        # orjson rejects strings that are not valid UTF-8 (e.g. lone surrogates)
+        payload = json.dumps(fields, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def dedupe_texts(texts: Sequence[str]) -> Tuple[List[str], List[int]]:
+    """
+    Collapse duplicate texts so each distinct text is processed once.
+
+    Texts are keyed by a 16-byte BLAKE2b digest, which is cheaper than
+    SHA-256 and keeps the lookup table small for long documents.
+
+    Args:
+        texts: Input texts, possibly containing duplicates
+
+    Returns:
+        Tuple of (unique texts in first-seen order, index into the unique
+        list for every original position)
+
+    Example:
+        >>> dedupe_texts(["a", "b", "a"])
+        (['a', 'b'], [0, 1, 0])
+    """
+    unique: List[str] = []
+    index_by_key: Dict[bytes, int] = {}
+    mapping: List[int] = []
+    for text in texts:
+        key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        index = index_by_key.get(key)
+        if index is None:
+            index = index_by_key[key] = len(unique)
+            unique.append(text)
+        mapping.append(index)
+    return unique, mapping
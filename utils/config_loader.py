@@ -3,17 +3,86 @@ Configuration Loader for Ollama Guardrail
 
 Provides type-safe configuration management with YAML file support.
 Uses singleton pattern for efficient configuration access throughout the application.
+Parsed files are cached by path and modification time, so re-creating the
+loader for an unchanged file copies a dictionary instead of re-parsing YAML.
+The loaded tree is also flattened to dotted keys once, so each getter is a
+single dictionary lookup instead of a chain of nested ``get`` calls.
 
 Author: Harsh
 """
 
 import os
+import copy
 import logging
-from typing import Dict, Any, Optional, List
+import threading
+from functools import cached_property, lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 import yaml
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+# Defaults for sections missing from config.yaml, built once instead of on
+# every getter call (shared like the loaded sections; do not mutate)
+_DEFAULT_RETRY_CONFIG: Dict[str, int] = {
+    'max_attempts': 3,
+    'min_wait': 2,
+    'max_wait': 10,
+    'multiplier': 2
+}
+_DEFAULT_LOGGING_CONFIG: Dict[str, Any] = {
+    'level': 'INFO',
+    'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    'file': 'app.log',
+    'console': True,
+    'file_logging': True,
+    'max_bytes': 10485760,
+    'backup_count': 5
+}
+_DEFAULT_SERVER_CONFIG: Dict[str, Any] = {
+    'port': 7860,
+    'host': '127.0.0.1'
+}
+_DEFAULT_INPUT_TEXT_CONFIG: Dict[str, Any] = {
+    'lines': 10,
+    'placeholder': 'Enter text to analyze for sensitive information...'
+}
+_DEFAULT_OUTPUT_TEXT_CONFIG: Dict[str, Any] = {
+    'lines': 10
+}
+
+
+def _flatten(tree: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    Index every section and value of a nested dictionary by its dotted path.
+
+    Example:
+        >>> _flatten({'models': {'ollama': {'name': 'llama3.2'}}})
+        {'models': {'ollama': {'name': 'llama3.2'}}, 'models.ollama': {'name': 'llama3.2'}, 'models.ollama.name': 'llama3.2'}
+    """
+    flat: Dict[str, Any] = {}
+    for key, value in tree.items():
+        path = f"{prefix}{key}"
+        flat[path] = value
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{path}."))
+    return flat
+
+
+@lru_cache(maxsize=8)
+def _parse_config_file(path: str, mtime_ns: int, size: int) -> Any:
+    """
+    Parse a YAML file; cached per file version.
+
+    mtime_ns and size are only part of the cache key, so an edited file is
+    parsed again. Callers must copy the result before handing it out.
+    """
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
 
 class ConfigLoader:
     """
@@ -23,7 +92,8 @@ class ConfigLoader:
     for various configuration sections.
 
     Attributes:
-        config (Dict[str, Any]): The loaded configuration dictionary
+        config (Dict[str, Any]): The loaded configuration dictionary (read-only
+            after loading; getters read a flattened index built from it)
 
     Example:
         >>> config = ConfigLoader()
@@ -33,12 +103,18 @@ class ConfigLoader:
     """
 
     _instance: Optional['ConfigLoader'] = None
+    # Guards creating and loading the singleton, so threads constructing it
+    # at the same time parse the file once
+    _lock = threading.Lock()
 
     def __new__(cls, config_path: str = "config.yaml"):
         """Implement singleton pattern to avoid reloading config."""
         if cls._instance is None:
-            cls._instance = super(ConfigLoader, cls).__new__(cls)
-            cls._instance._initialized = False
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super(ConfigLoader, cls).__new__(cls)
+                    instance._initialized = False
+                    cls._instance = instance
         return cls._instance
 
     def __init__(self, config_path: str = "config.yaml"):
@@ -56,14 +132,24 @@ class ConfigLoader:
         if self._initialized:
             return
 
+        with self._lock:
+            if not self._initialized:
+                self._load(config_path)
+
+    def _load(self, config_path: str) -> None:
+        """Load and index the configuration file; called once, under the class lock."""
         try:
             if not os.path.exists(config_path):
                 raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
-            with open(config_path, 'r') as f:
-                self.config = yaml.safe_load(f)
+            stat = os.stat(config_path)
+            self.config = copy.deepcopy(
+                _parse_config_file(os.path.abspath(config_path), stat.st_mtime_ns, stat.st_size)
+            )
 
-            logger.info(f"Configuration loaded successfully from {config_path}")
+            self._flat = _flatten(self.config or {})
+
+            logger.info("Configuration loaded successfully from %s", config_path)
             self._initialized = True
 
         except yaml.YAMLError as e:
@@ -74,29 +160,99 @@ class ConfigLoader:
             raise
 
     # Model Configuration Methods
+    @cached_property
+    def ollama_model_name(self) -> str:
+        """Ollama model name (resolved once)."""
+        return self._flat.get('models.ollama.name', 'llama3.2:latest')
+
     def get_ollama_model_name(self) -> str:
         """Get Ollama model name."""
-        return self.config.get('models', {}).get('ollama', {}).get('name', 'llama3.2:latest')
+        return self.ollama_model_name
 
     def get_ollama_timeout(self) -> int:
         """Get Ollama API timeout in seconds."""
-        return self.config.get('models', {}).get('ollama', {}).get('timeout', 120)
+        return self._flat.get('models.ollama.timeout', 120)
+
+    def get_ollama_num_parallel(self) -> Optional[int]:
+        """
+        Get the number of requests the Ollama server runs in parallel.
+
+        Uses models.ollama.num_parallel, then the OLLAMA_NUM_PARALLEL environment
+        variable (set when the server runs on this host); None if neither is set.
+        """
+        num_parallel = self._flat.get('models.ollama.num_parallel')
+        if num_parallel is None:
+            num_parallel = os.getenv('OLLAMA_NUM_PARALLEL')
+        try:
+            return int(num_parallel) if num_parallel else None
+        except ValueError:
+            logger.warning(f"Ignoring invalid OLLAMA_NUM_PARALLEL value: {num_parallel}")
+            return None
+
+    def get_ollama_temperature(self) -> float:
+        """Get Ollama sampling temperature (0 keeps detection output deterministic)."""
+        return self._flat.get('models.ollama.temperature', 0.0)
+
+    def get_ollama_host(self) -> Optional[str]:
+        """Get Ollama server URL (None falls back to the OLLAMA_HOST environment variable)."""
+        return self._flat.get('models.ollama.host')
+
+    def get_ollama_connection_pool(self) -> Dict[str, Any]:
+        """
+        Get HTTP connection pool settings for the Ollama client.
+
+        Returns:
+            Dictionary with max_connections, max_keepalive_connections, keepalive_expiry
+        """
+        pool = self._flat.get('models.ollama.connection_pool', {})
+        return {
+            'max_connections': pool.get('max_connections', 100),
+            'max_keepalive_connections': pool.get('max_keepalive_connections', 40),
+            'keepalive_expiry': pool.get('keepalive_expiry', 30.0)
+        }
+
+    def should_warmup_ollama_model(self) -> bool:
+        """Check if the Ollama model should be loaded in the background at startup."""
+        return self._flat.get('models.ollama.warmup', True)
+
+    def get_ollama_keep_alive(self) -> Optional[str]:
+        """Get how long Ollama keeps the model loaded after a request (None uses the server default)."""
+        return self._flat.get('models.ollama.keep_alive', '30m')
+
+    def get_openai_connection_pool(self) -> Dict[str, Any]:
+        """
+        Get HTTP connection pool settings for the OpenAI client.
+
+        Returns:
+            Dictionary with max_connections, max_keepalive_connections, keepalive_expiry
+        """
+        pool = self._flat.get('models.openai.connection_pool', {})
+        return {
+            'max_connections': pool.get('max_connections', 50),
+            'max_keepalive_connections': pool.get('max_keepalive_connections', 20),
+            'keepalive_expiry': pool.get('keepalive_expiry', 30.0)
+        }
+
+    @cached_property
+    def openai_model_name(self) -> str:
+        """OpenAI model name (resolved once)."""
+        return self._flat.get('models.openai.name', 'gpt-3.5-turbo')
 
     def get_openai_model_name(self) -> str:
         """Get OpenAI model name."""
-        return self.config.get('models', {}).get('openai', {}).get('name', 'gpt-3.5-turbo')
+        return self.openai_model_name
 
     def get_openai_timeout(self) -> int:
         """Get OpenAI API timeout in seconds."""
-        return self.config.get('models', {}).get('openai', {}).get('timeout', 60)
+        return self._flat.get('models.openai.timeout', 60)
 
     def get_openai_temperature(self) -> float:
         """Get OpenAI temperature setting."""
-        return self.config.get('models', {}).get('openai', {}).get('temperature', 0.7)
+        return self._flat.get('models.openai.temperature', 0.7)
 
     def get_openai_max_tokens(self) -> int:
         """Get OpenAI max tokens."""
-        return self.config.get('models', {}).get('openai', {}).get('max_tokens', 2000)
+        return self._flat.get('models.openai.max_tokens', 2000)
 
     # Retry Configuration Methods
     def get_retry_config(self) -> Dict[str, int]:
@@ -106,12 +262,7 @@ class ConfigLoader:
         Returns:
             Dictionary with max_attempts, min_wait, max_wait, multiplier
         """
-        return self.config.get('retry', {
-            'max_attempts': 3,
-            'min_wait': 2,
-            'max_wait': 10,
-            'multiplier': 2
-        })
+        return self._flat.get('retry', _DEFAULT_RETRY_CONFIG)
 
     def get_max_retry_attempts(self) -> int:
         """Get maximum retry attempts."""
@@ -120,15 +271,15 @@ class ConfigLoader:
     # Rate Limiting Configuration Methods
     def is_rate_limiting_enabled(self) -> bool:
         """Check if rate limiting is enabled."""
-        return self.config.get('rate_limiting', {}).get('enabled', True)
+        return self._flat.get('rate_limiting.enabled', True)
 
     def get_max_requests_per_minute(self) -> int:
         """Get maximum requests per minute."""
-        return self.config.get('rate_limiting', {}).get('max_requests_per_minute', 60)
+        return self._flat.get('rate_limiting.max_requests_per_minute', 60)
 
     def get_max_tokens_per_minute(self) -> int:
         """Get maximum tokens per minute."""
-        return self.config.get('rate_limiting', {}).get('max_tokens_per_minute', 90000)
+        return self._flat.get('rate_limiting.max_tokens_per_minute', 90000)
 
     # Logging Configuration Methods
     def get_logging_config(self) -> Dict[str, Any]:
@@ -138,33 +289,30 @@ class ConfigLoader:
         Returns:
             Dictionary with level, format, file, console, file_logging, max_bytes, backup_count
         """
-        return self.config.get('logging', {
-            'level': 'INFO',
-            'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            'file': 'app.log',
-            'console': True,
-            'file_logging': True,
-            'max_bytes': 10485760,
-            'backup_count': 5
-        })
+        return self._flat.get('logging', _DEFAULT_LOGGING_CONFIG)
 
     # UI Configuration Methods
+    @cached_property
+    def ui_title(self) -> str:
+        """Gradio interface title (resolved once)."""
+        return self._flat.get('ui.title', 'Sensitive Information Redaction Tool')
+
     def get_ui_title(self) -> str:
         """Get Gradio interface title."""
-        return self.config.get('ui', {}).get('title', 'Sensitive Information Redaction Tool')
+        return self.ui_title
 
     def get_ui_description(self) -> str:
         """Get Gradio interface description."""
-        return self.config.get('ui', {}).get('description',
-                                             'Identify and redact sensitive information from text before AI processing')
+        return self._flat.get('ui.description',
+                              'Identify and redact sensitive information from text before AI processing')
 
     def get_ui_theme(self) -> str:
         """Get Gradio theme."""
-        return self.config.get('ui', {}).get('theme', 'default')
+        return self._flat.get('ui.theme', 'default')
 
     def get_ui_share(self) -> bool:
         """Get whether to enable public sharing."""
-        return self.config.get('ui', {}).get('share', False)
+        return self._flat.get('ui.share', False)
 
     def get_server_config(self) -> Dict[str, Any]:
         """
@@ -173,27 +321,19 @@ class ConfigLoader:
         Returns:
             Dictionary with port and host
         """
-        return self.config.get('ui', {}).get('server', {
-            'port': 7860,
-            'host': '127.0.0.1'
-        })
+        return self._flat.get('ui.server', _DEFAULT_SERVER_CONFIG)
 
     def get_input_text_config(self) -> Dict[str, Any]:
         """Get input text component configuration."""
-        return self.config.get('ui', {}).get('components', {}).get('input_text', {
-            'lines': 10,
-            'placeholder': 'Enter text to analyze for sensitive information...'
-        })
+        return self._flat.get('ui.components.input_text', _DEFAULT_INPUT_TEXT_CONFIG)
 
     def get_output_text_config(self) -> Dict[str, Any]:
         """Get output text component configuration."""
-        return self.config.get('ui', {}).get('components', {}).get('output_text', {
-            'lines': 10
-        })
+        return self._flat.get('ui.components.output_text', _DEFAULT_OUTPUT_TEXT_CONFIG)
 
     def get_category_selection_default_all(self) -> bool:
         """Check if all categories should be selected by default."""
-        return self.config.get('ui', {}).get('components', {}).get('category_selection', {}).get('default_all', False)
+        return self._flat.get('ui.components.category_selection.default_all', False)
 
     # Redaction Categories Methods
     def get_redaction_categories(self) -> List[Dict[str, str]]:
@@ -203,14 +343,15 @@ class ConfigLoader:
         Returns:
             List of dictionaries with name, placeholder, description
         """
-        return self.config.get('categories', {}).get('enabled', [])
+        return self._flat.get('categories.enabled', [])
 
-    def get_category_map(self) -> Dict[str, str]:
+    @cached_property
+    def category_map(self) -> Dict[str, str]:
         """
-        Get mapping of category names to placeholders.
+        Mapping of category names to placeholders, built once.
 
         Returns:
-            Dictionary mapping category names to placeholder patterns
+            Dictionary mapping category names to placeholder patterns (shared; do not mutate)
         """
         categories = self.get_redaction_categories()
         category_map = {}
@@ -222,54 +363,144 @@ class ConfigLoader:
             category_map[name] = placeholder
         return category_map
 
-    def get_category_options(self) -> List[str]:
+    def get_category_map(self) -> Dict[str, str]:
         """
-        Get list of category names.
+        Get mapping of category names to placeholders.
 
         Returns:
-            List of category names
+            Dictionary mapping category names to placeholder patterns (shared; do not mutate)
         """
-        return [cat.get('name') for cat in self.get_redaction_categories()]
+        return self.category_map
+
+    @cached_property
+    def category_options(self) -> Tuple[str, ...]:
+        """
+        Category names, built once.
+
+        Returns:
+            Tuple of category names
+        """
+        return tuple(cat.get('name') for cat in self.get_redaction_categories())
+
+    def get_category_options(self) -> Tuple[str, ...]:
+        """
+        Get category names.
+
+        Returns:
+            Tuple of category names
+        """
+        return self.category_options
 
     # OpenAI Processing Configuration
     def get_openai_instruction_prefix(self) -> str:
         """Get instruction prefix for OpenAI processing."""
-        return self.config.get('openai_processing', {}).get('instruction_prefix',
-                                                              'The following text has been redacted for sensitive information. Please process the text as it is provided as a PROMPT:\n')
+        return self._flat.get('openai_processing.instruction_prefix',
+                              'The following text has been redacted for sensitive information. Please process the text as it is provided as a PROMPT:\n')
 
     def is_auto_submit_enabled(self) -> bool:
         """Check if automatic OpenAI submission is enabled."""
-        return self.config.get('openai_processing', {}).get('enable_automatic_submit', False)
+        return self._flat.get('openai_processing.enable_automatic_submit', False)
+
+    # Performance Configuration
+    def get_max_batch_size(self) -> int:
+        """Get maximum number of texts combined into a single batched prompt."""
+        return self._flat.get('performance.max_batch_size', 8)
+
+    def get_batch_strategy(self) -> str:
+        """
+        Get how the Batch Redaction tab processes documents.
+
+        Returns:
+            "concurrent" (one request per document, sent in parallel) or
+            "combined" (several documents per batched prompt)
+        """
+        return self._flat.get('performance.batch_strategy', 'concurrent')
+
+    def get_batch_concurrency(self) -> int:
+        """Get maximum number of in-flight requests per concurrent batch."""
+        return self._flat.get('performance.batch_concurrency', 8)
+
+    def get_max_concurrent_requests(self) -> int:
+        """Get maximum number of concurrent async model calls."""
+        return self._flat.get('performance.max_concurrent_requests', 100)
+
+    def is_prefilter_enabled(self) -> bool:
+        """
+        Check if the regex pre-filter may skip model calls for texts with no candidate matches.
+
+        Off by default: texts whose sensitive data the regexes miss (obfuscated
+        emails, spelled-out numbers) would be returned unredacted.
+        """
+        return self._flat.get('performance.prefilter_enabled', False)
+
+    def is_deterministic_redaction_enabled(self) -> bool:
+        """Check if emails, phone numbers, SSNs and card numbers may be redacted with regexes instead of the LLM."""
+        return self._flat.get('performance.deterministic_redaction', False)
+
+    def get_concise_prompt_max_chars(self) -> int:
+        """Get the input length below which the concise detection prompt is used (0 disables it)."""
+        return self._flat.get('performance.concise_prompt_max_chars', 2048)
+
+    def get_concise_prompt_max_categories(self) -> int:
+        """Get the maximum number of selected categories for the concise detection prompt."""
+        return self._flat.get('performance.concise_prompt_max_categories', 3)
+
+    def get_redaction_cache_size(self) -> int:
+        """Get number of detection results kept in the LRU cache (0 disables caching)."""
+        return self._flat.get('performance.redaction_cache_size', 128)
+
+    def get_openai_cache_size(self) -> int:
+        """Get number of OpenAI responses kept in the LRU cache (0 disables caching)."""
+        return self._flat.get('performance.openai_cache_size', 128)
+
+    def get_queue_max_size(self) -> int:
+        """Get maximum number of events waiting in the Gradio queue."""
+        return self._flat.get('performance.queue_max_size', 100)
+
+    def get_concurrency_limit(self) -> int:
+        """
+        Get default number of concurrently running Gradio events per handler.
+
+        Defaults to 10, capped by the per-minute request limit when rate limiting is enabled.
+        """
+        default_limit = 10
+        if self.is_rate_limiting_enabled():
+            default_limit = min(default_limit, self.get_max_requests_per_minute())
+        return self._flat.get('performance.concurrency_limit', default_limit)
+
+    def get_openai_concurrency_limit(self) -> int:
+        """Get number of concurrently running OpenAI submissions (uses concurrency_limit if unset)."""
+        return self._flat.get('performance.openai_concurrency_limit', self.get_concurrency_limit())
 
     # Security Configuration
     def should_validate_api_key_on_startup(self) -> bool:
         """Check if API key validation on startup is enabled."""
-        return self.config.get('security', {}).get('validate_api_key_on_startup', True)
+        return self._flat.get('security.validate_api_key_on_startup', True)
 
     def should_sanitize_error_messages(self) -> bool:
         """Check if error message sanitization is enabled."""
-        return self.config.get('security', {}).get('sanitize_error_messages', True)
+        return self._flat.get('security.sanitize_error_messages', True)
 
     def should_log_sensitive_data(self) -> bool:
         """Check if logging sensitive data is enabled (WARNING: disable for production)."""
-        return self.config.get('security', {}).get('log_sensitive_data', False)
+        return self._flat.get('security.log_sensitive_data', False)
 
     # Feature Flags
     def is_batch_processing_enabled(self) -> bool:
         """Check if batch processing is enabled."""
-        return self.config.get('features', {}).get('batch_processing', False)
+        return self._flat.get('features.batch_processing', False)
 
     def is_custom_rules_enabled(self) -> bool:
         """Check if custom redaction rules are enabled."""
-        return self.config.get('features', {}).get('custom_rules', False)
+        return self._flat.get('features.custom_rules', False)
 
     def is_export_results_enabled(self) -> bool:
         """Check if exporting results is enabled."""
-        return self.config.get('features', {}).get('export_results', True)
+        return self._flat.get('features.export_results', True)
 
     def is_api_mode_enabled(self) -> bool:
         """Check if REST API mode is enabled."""
-        return self.config.get('features', {}).get('api_mode', False)
+        return self._flat.get('features.api_mode', False)
 
 
 # Convenience function for quick access
@@ -2,27 +2,57 @@
 Rate Limiter for Ollama Guardrail
 
 Provides rate limiting functionality to prevent API quota exhaustion.
-Uses token bucket algorithm for smooth rate limiting.
+RateLimiter counts requests over a sliding one-minute window. The rate_limited
+decorator draws from a lock-protected token bucket. In both, sync functions
+wait with time.sleep, while coroutine (and, for rate_limited, async
+generator) functions wait with asyncio.sleep, so a throttled call never
+blocks the event loop.
 
 Author: Harsh
 """
 
+import asyncio
+import inspect
 import logging
+import random
+import threading
 import time
-from typing import Callable, Any
+from collections import deque
+from contextlib import aclosing
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
 from functools import wraps
-from ratelimit import limits, sleep_and_retry
 
+# Per-call log messages pass %-style arguments, so they are only formatted
+# when the level is enabled
 logger = logging.getLogger(__name__)
 
+# Length of the RateLimiter window
+RATE_WINDOW_SECONDS = 60.0
+
+# Module-level binding skips the attribute lookup on every call; patch
+# utils.rate_limiter._monotonic to control time in tests
+_monotonic = time.monotonic
+
 
 class RateLimiter:
     """
-    Rate limiter for API calls using token bucket algorithm.
+    Rate limiter for API calls using a sliding one-minute window.
+
+    Every recorded request is kept in a log with its timestamp and token
+    count, and entries older than a minute are trimmed before each check.
+    Unlike a fixed window that resets every 60 seconds, this never allows a
+    burst of twice the limit across a window boundary, and a full limiter
+    waits until its oldest request expires, plus a random jitter so callers
+    blocked at the same time do not all wake together.
+
+    The log is guarded by a lock, and limit_requests reserves a slot in the
+    same critical section as the check, so concurrent threads cannot all
+    pass the check before any of them is recorded.
 
     Attributes:
         max_requests_per_minute: Maximum requests allowed per minute
         max_tokens_per_minute: Maximum tokens allowed per minute (for OpenAI)
+        jitter: Maximum extra wait as a fraction of the base wait
 
     Example:
         >>> limiter = RateLimiter(max_requests_per_minute=60)
@@ -31,10 +61,17 @@ class RateLimiter:
         >>>     return client.invoke(prompt)
     """
 
+    # Fixed attribute layout; the decorator reads these on every call
+    __slots__ = (
+        'max_requests_per_minute', 'max_tokens_per_minute', 'jitter', 'enabled', '_log', '_window_tokens', '_lock'
+    )
+
     def __init__(
         self,
         max_requests_per_minute: int = 60,
-        max_tokens_per_minute: int = 90000
+        max_tokens_per_minute: int = 90000,
+        jitter: float = 0.5,
+        enabled: bool = True
     ):
         """
         Initialize rate limiter.
@@ -42,87 +79,255 @@ class RateLimiter:
         Args:
             max_requests_per_minute: Maximum requests per minute
             max_tokens_per_minute: Maximum tokens per minute
+            jitter: Maximum extra wait as a fraction of the base wait (0 disables jitter)
+            enabled: Whether to enforce the limits; a disabled limiter admits
+                every request and limit_requests returns functions unwrapped
+
+        Raises:
+            ValueError: If jitter is negative
         """
+        if jitter < 0:
+            raise ValueError("jitter must not be negative")
         self.max_requests_per_minute = max_requests_per_minute
         self.max_tokens_per_minute = max_tokens_per_minute
-        self.request_count = 0
-        self.token_count = 0
-        self.window_start = time.time()
-
-        logger.info(f"Rate limiter initialized: {max_requests_per_minute} req/min, {max_tokens_per_minute} tokens/min")
-
-    def _reset_if_needed(self):
-        """Reset counters if window has elapsed."""
-        current_time = time.time()
-        elapsed = current_time - self.window_start
-
-        if elapsed >= 60:  # 1 minute window
-            self.request_count = 0
-            self.token_count = 0
-            self.window_start = current_time
-            logger.debug("Rate limiter window reset")
-
-    def check_request_limit(self) -> bool:
+        self.jitter = jitter
+        self.enabled = enabled
+        # (monotonic timestamp, tokens) per request in the last minute, oldest first
+        self._log: Deque[Tuple[float, int]] = deque()
+        self._window_tokens = 0
+        self._lock = threading.Lock()
+
+        if enabled:
+            logger.info(f"Rate limiter initialized: {max_requests_per_minute} req/min, {max_tokens_per_minute} tokens/min")
+        else:
+            logger.info("Rate limiter initialized (disabled)")
+
+    @property
+    def request_count(self) -> int:
+        """Number of requests recorded in the current window."""
+        return len(self._log)
+
+    @property
+    def token_count(self) -> int:
+        """Number of tokens recorded in the current window."""
+        return self._window_tokens
+
+    def _trim_expired(self, now: Optional[float] = None) -> None:
+        """Drop requests recorded a minute or more before ``now`` (the current time if None); caller holds the lock."""
+        cutoff = (_monotonic() if now is None else now) - RATE_WINDOW_SECONDS
+        while self._log and self._log[0][0] <= cutoff:
+            _, tokens = self._log.popleft()
+            self._window_tokens -= tokens
+
+    def check_request_limit(self, now: Optional[float] = None) -> bool:
         """
         Check if request can proceed without exceeding rate limit.
 
+        Checking and then calling record_request is not atomic; use
+        try_acquire or acquire to reserve a request under concurrency.
+
+        Args:
+            now: Current monotonic time (read from the clock if None)
+
         Returns:
             True if request can proceed, False otherwise
         """
-        self._reset_if_needed()
-
-        if self.request_count >= self.max_requests_per_minute:
-            logger.warning(f"Request rate limit exceeded: {self.request_count}/{self.max_requests_per_minute}")
+        if not self.enabled:
+            return True
+        with self._lock:
+            self._trim_expired(now)
+            request_count = len(self._log)
+
+        if request_count >= self.max_requests_per_minute:
+            logger.warning("Request rate limit exceeded: %d/%d", request_count, self.max_requests_per_minute)
             return False
 
         return True
 
-    def check_token_limit(self, tokens: int) -> bool:
+    def check_token_limit(self, tokens: int, now: Optional[float] = None) -> bool:
         """
         Check if request with given token count can proceed.
 
+        Checking and then calling record_request is not atomic; use
+        try_acquire or acquire to reserve the tokens under concurrency.
+
         Args:
             tokens: Number of tokens in the request
+            now: Current monotonic time (read from the clock if None)
 
         Returns:
             True if request can proceed, False otherwise
         """
-        self._reset_if_needed()
-
-        if self.token_count + tokens > self.max_tokens_per_minute:
-            logger.warning(f"Token rate limit would be exceeded: {self.token_count + tokens}/{self.max_tokens_per_minute}")
+        if not self.enabled:
+            return True
+        with self._lock:
+            self._trim_expired(now)
+            total = self._window_tokens + tokens
+
+        if total > self.max_tokens_per_minute:
+            logger.warning("Token rate limit would be exceeded: %d/%d", total, self.max_tokens_per_minute)
             return False
 
         return True
 
-    def record_request(self, tokens: int = 0):
+    def record_request(self, tokens: int = 0, now: Optional[float] = None) -> None:
         """
         Record a successful API request.
 
         Args:
             tokens: Number of tokens used in the request
+            now: Monotonic time the request started (read from the clock if None)
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._log.append((_monotonic() if now is None else now, tokens))
+            self._window_tokens += tokens
+        logger.debug("Request recorded: %d requests, %d tokens", len(self._log), self._window_tokens)
+
+    def wait_if_needed(self, now: Optional[float] = None) -> float:
+        """
+        Wait until the oldest request in the window expires if the limit is reached.
+
+        Args:
+            now: Current monotonic time (read from the clock if None)
+
+        Returns:
+            Monotonic time at which the request may proceed
+        """
+        return self._acquire(_monotonic() if now is None else now)
+
+    async def await_if_needed(self, now: Optional[float] = None) -> float:
+        """
+        Async counterpart of wait_if_needed; waits with asyncio.sleep so other coroutines keep running.
+
+        Args:
+            now: Current monotonic time (read from the clock if None)
+
+        Returns:
+            Monotonic time at which the request may proceed
+        """
+        return await self._aacquire(_monotonic() if now is None else now)
+
+    def try_acquire(self, tokens: int = 0, now: Optional[float] = None) -> bool:
+        """
+        Reserve a request and its tokens if both fit in the window.
+
+        The check and the reservation happen under one lock acquisition, so
+        concurrent callers cannot all pass the check before any is recorded
+        (unlike check_request_limit/check_token_limit followed by record_request).
+
+        Args:
+            tokens: Number of tokens the request will use
+            now: Current monotonic time (read from the clock if None)
+
+        Returns:
+            True if the request was reserved, False if the caller must wait
+        """
+        return self._poll(_monotonic() if now is None else now, True, tokens) is None
+
+    def acquire(self, tokens: int = 0, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until a request and its tokens fit in the window, then reserve them.
+
+        Args:
+            tokens: Number of tokens the request will use
+            timeout: Maximum seconds to wait (waits as long as needed if None)
+
+        Returns:
+            True if the request was reserved, False if the timeout expired first
         """
-        self.request_count += 1
-        self.token_count += tokens
-        logger.debug(f"Request recorded: {self.request_count} requests, {self.token_count} tokens")
+        now = _monotonic()
+        deadline = None if timeout is None else now + timeout
+        while (wait_time := self._poll(now, True, tokens)) is not None:
+            if deadline is not None and now + wait_time > deadline:
+                return False
+            time.sleep(wait_time)
+            now = _monotonic()
+        return True
 
-    def wait_if_needed(self):
-        """Wait until rate limit allows next request."""
-        self._reset_if_needed()
+    def _poll(self, now: float, reserve: bool, tokens: int = 0) -> Optional[float]:
+        """
+        Check the window once, optionally recording a request in it.
 
-        if not self.check_request_limit():
-            # Calculate wait time until next window
-            elapsed = time.time() - self.window_start
-            wait_time = 60 - elapsed
+        The check and the reservation happen under one lock acquisition. A
+        reservation is logged as ``(now, tokens)``. The token limit is only checked
+        for requests that declare tokens, and a request that exceeds it on its
+        own is admitted once the window is empty.
 
-            logger.info(f"Rate limit reached, waiting {wait_time:.2f} seconds")
+        Returns:
+            None if the request may proceed, otherwise seconds to wait before checking again
+        """
+        if not self.enabled:
+            return None
+        # Trimming only shrinks the log, so if it is under the limit before
+        # trimming there is nothing to wait for (reservations still need the lock)
+        if not reserve and not tokens and len(self._log) < self.max_requests_per_minute:
+            return None
+        with self._lock:
+            self._trim_expired(now)
+            if not self._log or (
+                len(self._log) < self.max_requests_per_minute
+                and (not tokens or self._window_tokens + tokens <= self.max_tokens_per_minute)
+            ):
+                if reserve:
+                    self._log.append((now, tokens))
+                    self._window_tokens += tokens
+                return None
+            wait_time = self._wait_time(now, tokens)
+        logger.info("Rate limit reached, waiting %.2f seconds", wait_time)
+        return wait_time
+
+    def _acquire(self, now: float, reserve: bool = False) -> float:
+        """Block until the window has a free slot (see _poll); sleeps outside the lock."""
+        while (wait_time := self._poll(now, reserve)) is not None:
             time.sleep(wait_time)
-            self._reset_if_needed()
+            now = _monotonic()
+        return now
+
+    async def _aacquire(self, now: float, reserve: bool = False) -> float:
+        """Wait without blocking the event loop until the window has a free slot (see _poll)."""
+        while (wait_time := self._poll(now, reserve)) is not None:
+            await asyncio.sleep(wait_time)
+            now = _monotonic()
+        return now
+
+    def _wait_time(self, now: float, tokens: int = 0) -> float:
+        """
+        Jittered time until enough requests expire for one more request of ``tokens`` tokens.
+
+        The caller holds the lock and the log is not empty.
+        """
+        # Expire at least the oldest request if the request limit is reached,
+        # and enough of the oldest requests to make room for the tokens
+        excess_requests = len(self._log) - self.max_requests_per_minute + 1
+        excess_tokens = self._window_tokens + tokens - self.max_tokens_per_minute if tokens else 0
+        expires_at = self._log[0][0]
+        for expired, (timestamp, request_tokens) in enumerate(self._log, 1):
+            expires_at = timestamp
+            excess_tokens -= request_tokens
+            if expired >= excess_requests and excess_tokens <= 0:
+                break
+        # Jitter only lengthens the wait: waking early would exceed the limit
+        wait_time = max(0.0, RATE_WINDOW_SECONDS - (now - expires_at))
+        return wait_time * (1.0 + random.random() * self.jitter)
+
+    def _release(self, started: float) -> None:
+        """Remove the reservation made at ``started`` for a failed request (no-op if it already expired)."""
+        with self._lock:
+            try:
+                self._log.remove((started, 0))
+            except ValueError:
+                pass
 
     def limit_requests(self, func: Callable) -> Callable:
         """
         Decorator to rate limit function calls.
 
+        Coroutine functions are wrapped with an async wrapper that waits
+        with asyncio.sleep, so a full limiter does not block the event loop.
+        A disabled limiter returns func unchanged.
+
         Args:
             func: Function to rate limit
 
@@ -135,42 +340,60 @@ class RateLimiter:
             >>> def my_api_call():
             >>>     return client.invoke(prompt)
         """
+        if not self.enabled:
+            return func
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = await self._aacquire(_monotonic(), reserve=True)
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    self._release(started)
+                    logger.error("Rate-limited function failed: %s", e)
+                    raise
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Wait if necessary
-            self.wait_if_needed()
+            # Wait if necessary and reserve a slot; the clock is read once
+            # unless a wait happens
+            started = self._acquire(_monotonic(), reserve=True)
 
-            # Execute function
+            # Execute function; a failed call gives its slot back
             try:
-                result = func(*args, **kwargs)
-                self.record_request()
-                return result
+                return func(*args, **kwargs)
             except Exception as e:
-                logger.error(f"Rate-limited function failed: {str(e)}")
+                self._release(started)
+                logger.error("Rate-limited function failed: %s", e)
                 raise
 
         return wrapper
 
 
 # Global rate limiter instance (can be configured from config)
-_global_limiter: RateLimiter = None
+_global_limiter: Optional[RateLimiter] = None
 
 
 def init_global_rate_limiter(
     max_requests_per_minute: int = 60,
-    max_tokens_per_minute: int = 90000
-):
+    max_tokens_per_minute: int = 90000,
+    enabled: bool = True
+) -> None:
     """
     Initialize global rate limiter.
 
     Args:
         max_requests_per_minute: Maximum requests per minute
         max_tokens_per_minute: Maximum tokens per minute
+        enabled: Whether to enforce the limits (e.g. rate_limiting.enabled from config)
     """
     global _global_limiter
     _global_limiter = RateLimiter(
         max_requests_per_minute=max_requests_per_minute,
-        max_tokens_per_minute=max_tokens_per_minute
+        max_tokens_per_minute=max_tokens_per_minute,
+        enabled=enabled
     )
     logger.info("Global rate limiter initialized")
 
@@ -190,28 +413,136 @@ def get_global_rate_limiter() -> RateLimiter:
     return _global_limiter
 
 
-# Simple decorator using ratelimit library for ease of use
-def rate_limited(max_calls: int = 60, period: int = 60):
+class TokenBucket:
     """
-    Simple rate limiting decorator using ratelimit library.
+    Token bucket limiter for sync and async callers.
+
+    Holds up to ``capacity`` tokens and refills at ``rate_per_sec``, so
+    bursts up to the capacity go through immediately while the long-run
+    rate stays bounded. The bucket is guarded by a threading lock and every
+    wait happens outside it, so one bucket can be shared by threads and
+    event loops alike.
+
+    Example:
+        >>> bucket = TokenBucket(rate_per_sec=1.0, capacity=60)
+        >>> bucket.acquire()
+        >>> await bucket.aacquire()
+    """
+
+    __slots__ = ('rate_per_sec', 'capacity', '_tokens', '_updated', '_lock')
+
+    def __init__(self, rate_per_sec: float, capacity: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate_per_sec: Tokens added per second
+            capacity: Maximum number of tokens (largest burst)
+
+        Raises:
+            ValueError: If rate_per_sec or capacity is not positive
+        """
+        if rate_per_sec <= 0 or capacity <= 0:
+            raise ValueError("rate_per_sec and capacity must be positive")
+        self.rate_per_sec = rate_per_sec
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = _monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens if enough are available.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            0.0 if the tokens were taken, otherwise seconds until enough have refilled
+        """
+        with self._lock:
+            now = _monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_sec)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate_per_sec
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Block the calling thread until tokens are available, then take them."""
+        while (wait_time := self.try_acquire(tokens)) > 0:
+            logger.info("Rate limit reached, waiting %.2f seconds", wait_time)
+            time.sleep(wait_time)
+
+    async def aacquire(self, tokens: float = 1) -> None:
+        """Wait without blocking the event loop until tokens are available, then take them."""
+        while (wait_time := self.try_acquire(tokens)) > 0:
+            logger.info("Rate limit reached, waiting %.2f seconds", wait_time)
+            await asyncio.sleep(wait_time)
+
+
+# Buckets shared by every function decorated with the same name
+_named_limiters: Dict[str, TokenBucket] = {}
+_named_limiters_lock = threading.Lock()
+
+
+def _shared_limiter(name: Optional[str], factory: Callable[[], TokenBucket]) -> TokenBucket:
+    """Return the bucket registered under ``name``, creating it on first use (a new one if name is None)."""
+    if name is None:
+        return factory()
+    with _named_limiters_lock:
+        if name not in _named_limiters:
+            _named_limiters[name] = factory()
+        return _named_limiters[name]
+
+
+def rate_limited(max_calls: int = 60, period: int = 60, name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Rate limiting decorator backed by a TokenBucket.
+
+    Allows bursts of up to max_calls and refills max_calls per period.
+    Sync functions wait with time.sleep; coroutine and async generator
+    functions wait with asyncio.sleep, so waiting for a token does not
+    block the event loop.
 
     Args:
         max_calls: Maximum number of calls allowed
         period: Time period in seconds
+        name: Functions decorated with the same name share one limit (e.g.
+            one per model provider, across sync and async functions); each
+            function gets its own if None
 
     Returns:
         Decorated function with rate limiting
 
     Example:
-        >>> @rate_limited(max_calls=60, period=60)
+        >>> @rate_limited(max_calls=60, period=60, name="ollama")
         >>> def my_api_call():
         >>>     return client.invoke(prompt)
     """
-    def decorator(func):
-        @sleep_and_retry
-        @limits(calls=max_calls, period=period)
+    def decorator(func: Callable) -> Callable:
+        bucket = _shared_limiter(name, lambda: TokenBucket(rate_per_sec=max_calls / period, capacity=max_calls))
+
+        if inspect.isasyncgenfunction(func):
+            @wraps(func)
+            async def agen_wrapper(*args, **kwargs):
+                await bucket.aacquire()
+                async with aclosing(func(*args, **kwargs)) as stream:
+                    async for item in stream:
+                        yield item
+            return agen_wrapper
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                await bucket.aacquire()
+                return await func(*args, **kwargs)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
+            bucket.acquire()
             return func(*args, **kwargs)
         return wrapper
     return decorator
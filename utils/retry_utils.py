@@ -1,57 +1,746 @@
 """
 Retry Utilities for Ollama Guardrail
 
-Provides retry decorators and functions for API calls with exponential backoff.
-Handles network errors, timeouts, and API errors gracefully.
+Provides retry decorators and functions for API calls with truncated
+exponential backoff. Handles network errors, timeouts, and API errors
+gracefully. Callers can limit retries to transient failures with
+``retry_on``, and waits are randomized (``jitter``) so concurrent callers
+that fail together do not retry in lockstep; a Retry-After or
+X-RateLimit-Reset header on the failed response takes precedence. A
+circuit breaker per called function fails fast while a backend keeps
+failing, and shared counters (get_retry_stats) show how often calls are
+retried, fail, or trip a breaker.
 
 Author: Harsh
 """
 
+import asyncio
+import concurrent.futures
+import inspect
 import logging
-from typing import Any, Callable
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-    before_sleep_log
-)
+import random
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Literal, Optional, Tuple, Type, Union
+
+import httpx
 
+from .cache import LRUCache
+
+# Per-call log messages pass %-style arguments, so they are only formatted
+# when the level is enabled
 logger = logging.getLogger(__name__)
 
+# Exception types to retry, or a predicate deciding whether an exception is retryable
+RetryOn = Union[Type[BaseException], Tuple[Type[BaseException], ...], Callable[[BaseException], bool]]
+
+# How the backoff cap is randomized: "full" waits uniform(0, cap), "equal"
+# waits cap/2 + uniform(0, cap/2), and "none" waits exactly cap
+Jitter = Literal["full", "equal", "none"]
+
+
+def _func_name(func: Callable) -> str:
+    """Name of a called function for log messages (functools.partial and other callables have no __name__)."""
+    return getattr(func, "__name__", None) or repr(func)
+
+
+def _should_retry(error: BaseException, retry_on: RetryOn) -> bool:
+    """Check an exception against retry_on (exception types or a predicate)."""
+    if isinstance(retry_on, tuple) or isinstance(retry_on, type):
+        return isinstance(error, retry_on)
+    return retry_on(error)
+
+
+# HTTP statuses worth retrying: request timeout, rate limiting and server errors
+_RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Check whether a call failed for a reason a retry can fix.
+
+    Timeouts, dropped connections, rate limiting and server errors are
+    transient; authentication failures, missing models, bad requests and
+    programming errors (ValueError, KeyError, ...) fail the same way on
+    every attempt. Pass as ``retry_on`` so those are raised immediately.
+
+    Args:
+        error: Exception raised by the call
+
+    Returns:
+        True if retrying may succeed
+
+    Example:
+        >>> retry_api_call(client.invoke, prompt, retry_on=is_transient_error)
+    """
+    if isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in _RETRYABLE_STATUS_CODES
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+
+    # The OpenAI SDK is imported lazily; if it is not loaded, it raised nothing
+    openai = sys.modules.get("openai")
+    if openai is None:
+        return False
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in _RETRYABLE_STATUS_CODES
+    return False
+
+
+def _backoff_delay(
+    attempt: int,
+    min_wait: float,
+    max_wait: float,
+    multiplier: float,
+    jitter: Jitter
+) -> float:
+    """
+    Compute the wait after a failed attempt.
+
+    The cap grows as min_wait * multiplier ** (attempt - 1), truncated at
+    max_wait, and is then randomized according to ``jitter``.
+    """
+    cap = min(max_wait, min_wait * multiplier ** (attempt - 1))
+    if jitter == "full":
+        return random.uniform(0, cap)
+    if jitter == "equal":
+        return cap / 2 + random.uniform(0, cap / 2)
+    return cap
+
+
+def _server_requested_delay(error: BaseException, max_wait: float) -> Optional[float]:
+    """
+    Read the wait a rate-limited or overloaded server asked for, if any.
+
+    Looks at the headers of the failed response (httpx.HTTPStatusError and
+    openai.APIStatusError both carry it as ``error.response``): Retry-After
+    as seconds or an HTTP date, then X-RateLimit-Reset as a Unix timestamp.
+    The wait is clamped to [0, max_wait] so one header cannot stall a caller
+    beyond the retry budget.
+
+    Returns:
+        Seconds to wait, or None if the response gave no usable hint
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    delay: Optional[float] = None
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                retry_at = None
+            if retry_at is not None:
+                if retry_at.tzinfo is None:
+                    retry_at = retry_at.replace(tzinfo=timezone.utc)
+                delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+
+    if delay is None:
+        reset = headers.get("x-ratelimit-reset")
+        if reset:
+            try:
+                delay = float(reset) - time.time()
+            except ValueError:
+                pass
+
+    if delay is None:
+        return None
+    return min(max(delay, 0.0), max_wait)
+
+
+@dataclass
+class RetryStats:
+    """
+    Counters for retry-protected calls, shared by every retry helper.
+
+    Calls made through retry_api_call, aretry_api_call and functions
+    decorated by create_retry_decorator are counted once each, however many
+    attempts they take. Results served from the result cache or shared by
+    collapsed calls are not counted.
+
+    Attributes:
+        calls: Calls finished (successes + failures)
+        retries: Attempts after the first, across all calls
+        successes: Calls that returned a result
+        failures: Calls that raised, including circuit breaker rejections
+        breaker_trips: Times a circuit breaker opened
+        cumulative_wait_seconds: Total time spent waiting between attempts
+    """
+
+    calls: int = 0
+    retries: int = 0
+    successes: int = 0
+    failures: int = 0
+    breaker_trips: int = 0
+    cumulative_wait_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_call(self, success: bool) -> None:
+        """Count a finished call, logging a summary every _STATS_LOG_INTERVAL calls."""
+        with self._lock:
+            self.calls += 1
+            if success:
+                self.successes += 1
+            else:
+                self.failures += 1
+            calls = self.calls
+        if calls % _STATS_LOG_INTERVAL == 0:
+            snapshot = self.snapshot()
+            logger.info(
+                "Retry stats: %d calls, %.1f%% succeeded, %.2f retries per call, %d breaker trips, %.1fs waiting",
+                snapshot["calls"], snapshot["success_rate"] * 100, snapshot["retry_rate"],
+                snapshot["breaker_trips"], snapshot["cumulative_wait_seconds"]
+            )
+
+    def record_retry(self, delay: float) -> None:
+        """Count a retry and the wait before it."""
+        with self._lock:
+            self.retries += 1
+            self.cumulative_wait_seconds += delay
+
+    def record_trip(self) -> None:
+        """Count a circuit breaker opening."""
+        with self._lock:
+            self.breaker_trips += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return the counters with success_rate and retry_rate (retries per call) added."""
+        with self._lock:
+            counters: Dict[str, float] = {
+                name: getattr(self, name) for name in (
+                    "calls", "retries", "successes", "failures", "breaker_trips", "cumulative_wait_seconds"
+                )
+            }
+        calls = counters["calls"]
+        counters["success_rate"] = counters["successes"] / calls if calls else 0.0
+        counters["retry_rate"] = counters["retries"] / calls if calls else 0.0
+        return counters
+
+    def reset(self) -> None:
+        """Set every counter back to zero."""
+        with self._lock:
+            self.calls = self.retries = self.successes = self.failures = self.breaker_trips = 0
+            self.cumulative_wait_seconds = 0.0
+
+
+# Calls between INFO summaries of the retry stats
+_STATS_LOG_INTERVAL = 1000
+
+_stats = RetryStats()
+
+
+def get_retry_stats() -> Dict[str, float]:
+    """
+    Get the shared retry counters.
+
+    Returns:
+        Dictionary with calls, retries, successes, failures, breaker_trips,
+        cumulative_wait_seconds, success_rate and retry_rate
+
+    Example:
+        >>> stats = get_retry_stats()
+        >>> print(f"{stats['retry_rate']:.2f} retries per call")
+    """
+    return _stats.snapshot()
+
+
+def reset_retry_stats() -> None:
+    """Reset the shared retry counters to zero."""
+    _stats.reset()
+
+
+class ServiceUnavailable(RuntimeError):
+    """Raised without calling the backend while its circuit breaker is open."""
+
+
+class _CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one backend call.
+
+    CLOSED lets calls through. After ``fail_threshold`` calls in a row fail,
+    the breaker turns OPEN and rejects calls for ``cooldown`` seconds, then
+    HALF_OPEN lets a single probe through: a success closes the breaker, a
+    failure reopens it for another cooldown.
+
+    Attributes:
+        state: "closed", "open", or "half_open"
+        consecutive_failures: Failed calls since the last success
+        opened_at: Monotonic time the breaker last opened, or None
+        fail_threshold: Consecutive failures that open the breaker
+        cooldown: Seconds the breaker stays open before probing
+    """
+
+    __slots__ = ('state', 'consecutive_failures', 'opened_at', 'fail_threshold', 'cooldown', '_lock')
+
+    def __init__(self, fail_threshold: int = 5, cooldown: float = 30.0):
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.fail_threshold = fail_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Check whether a call may proceed, moving OPEN to HALF_OPEN once the cooldown has passed."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                # Let exactly one probe through
+                self.state = "half_open"
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the breaker and reset the failure count."""
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self.opened_at = None
+
+    def release_probe(self) -> None:
+        """Return a HALF_OPEN breaker to OPEN after its probe was abandoned (e.g. cancelled) without an outcome."""
+        with self._lock:
+            if self.state == "half_open":
+                # opened_at is unchanged, so the next call probes again right away
+                self.state = "open"
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at the threshold or after a failed probe."""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.fail_threshold:
+                if self.state != "open":
+                    _stats.record_trip()
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+# Breakers keyed by the called function's __qualname__, so each endpoint
+# (e.g. OllamaClient.invoke, OpenAIClient.ainvoke) trips independently
+_breakers: Dict[str, _CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+# Last good result per safe_api_call cache_key, as (monotonic time, result)
+_stale_results = LRUCache(maxsize=1024)
+
+# Successful retry_api_call/aretry_api_call results per cache key, as
+# (monotonic time, result)
+_response_cache = LRUCache(maxsize=1024)
+
+
+# Futures of retry_api_call calls in flight, keyed by collapse_key, and of
+# aretry_api_call calls, keyed by (event loop, collapse_key)
+_inflight: Dict[Hashable, concurrent.futures.Future] = {}
+_ainflight: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _fresh_response(key: Hashable, ttl: float) -> Optional[Tuple[Any]]:
+    """Return (result,) if a result younger than ttl seconds is cached under key, else None."""
+    cached = _response_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] <= ttl:
+        return (cached[1],)
+    return None
+
+
+def _breaker_for(func: Callable) -> Optional[_CircuitBreaker]:
+    """Return the breaker for func, creating it on first use (None if func has no __qualname__)."""
+    key = getattr(func, "__qualname__", None)
+    if key is None:
+        return None
+    with _breakers_lock:
+        if key not in _breakers:
+            _breakers[key] = _CircuitBreaker()
+        return _breakers[key]
+
+
+def _check_breaker(breaker: Optional[_CircuitBreaker], func: Callable) -> None:
+    """Raise ServiceUnavailable if the breaker rejects the call."""
+    if breaker is not None and not breaker.allow():
+        _stats.record_call(False)
+        logger.error("Circuit open for %s, failing fast", func.__qualname__)
+        raise ServiceUnavailable(
+            f"{func.__qualname__} failed {breaker.consecutive_failures} times in a row; "
+            f"retrying after {breaker.cooldown:.0f} seconds"
+        )
+
+
+def _record_outcome(breaker: Optional[_CircuitBreaker], error: Optional[BaseException], retry_on: RetryOn) -> None:
+    """Record a finished call; a non-retryable error means the backend answered, so it counts as a success."""
+    if breaker is None:
+        return
+    if error is not None and _should_retry(error, retry_on):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+# Worker threads running sync attempts that have a per-attempt timeout,
+# created on first use
+_attempt_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_attempt_executor_lock = threading.Lock()
+
+
+def _get_attempt_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Return the shared attempt executor, creating it on first use."""
+    global _attempt_executor
+    with _attempt_executor_lock:
+        if _attempt_executor is None:
+            _attempt_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=32, thread_name_prefix="retry-attempt"
+            )
+        return _attempt_executor
+
+
+def _with_attempt_timeout(func: Callable, timeout: float) -> Callable:
+    """
+    Wrap func so each call raises TimeoutError after ``timeout`` seconds.
+
+    The call runs on the attempt executor. Python cannot interrupt a
+    blocked thread, so a call that times out keeps its worker until the
+    underlying socket gives up; the caller is released immediately.
+    """
+    @wraps(func)
+    def attempt(*args, **kwargs):
+        future = _get_attempt_executor().submit(func, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"{_func_name(func)} did not respond within {timeout} seconds") from None
+    return attempt
+
+
+def _awith_attempt_timeout(func: Callable[..., Awaitable[Any]], timeout: float) -> Callable[..., Awaitable[Any]]:
+    """Async counterpart of _with_attempt_timeout; the timed-out call is cancelled."""
+    @wraps(func)
+    async def attempt(*args, **kwargs):
+        try:
+            return await asyncio.wait_for(func(*args, **kwargs), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"{_func_name(func)} did not respond within {timeout} seconds") from None
+    return attempt
+
+
+class _AttemptWindow:
+    """
+    Rolling record of one function's recent attempt outcomes.
+
+    Attributes:
+        outcomes: 1 for each attempt that succeeded (or failed with a
+            non-retryable error), 0 for each retryable failure
+    """
+
+    __slots__ = ('outcomes', '_lock')
+
+    def __init__(self, size: int = 100):
+        self.outcomes: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, success: bool) -> None:
+        """Add an attempt outcome, dropping the oldest once the window is full."""
+        with self._lock:
+            self.outcomes.append(1 if success else 0)
+
+    def max_attempts(self, ceiling: int) -> int:
+        """Attempts to allow given the recent success rate (the ceiling until enough history exists)."""
+        with self._lock:
+            samples = len(self.outcomes)
+            if samples < _ADAPTIVE_MIN_SAMPLES:
+                return ceiling
+            success_rate = sum(self.outcomes) / samples
+        if success_rate > 0.99:
+            return 1
+        if success_rate > 0.7:
+            return min(3, ceiling)
+        return ceiling
+
+
+# Attempts recorded before adaptive_attempts trusts a function's success rate
+_ADAPTIVE_MIN_SAMPLES = 20
+
+# Attempt windows keyed by the called function's __qualname__, like _breakers
+_attempt_windows: Dict[str, _AttemptWindow] = {}
+_attempt_windows_lock = threading.Lock()
+
+
+def _attempt_window_for(func: Callable) -> _AttemptWindow:
+    """Return the attempt window for func, creating it on first use."""
+    key = getattr(func, "__qualname__", None) or _func_name(func)
+    with _attempt_windows_lock:
+        if key not in _attempt_windows:
+            _attempt_windows[key] = _AttemptWindow()
+        return _attempt_windows[key]
+
+
+def _with_attempt_tracking(func: Callable, window: _AttemptWindow, retry_on: RetryOn) -> Callable:
+    """Wrap func so each call's outcome is recorded in window."""
+    @wraps(func)
+    def attempt(*args, **kwargs):
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            window.record(not _should_retry(e, retry_on))
+            raise
+        window.record(True)
+        return result
+    return attempt
+
+
+def _awith_attempt_tracking(
+    func: Callable[..., Awaitable[Any]],
+    window: _AttemptWindow,
+    retry_on: RetryOn
+) -> Callable[..., Awaitable[Any]]:
+    """Async counterpart of _with_attempt_tracking."""
+    @wraps(func)
+    async def attempt(*args, **kwargs):
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            window.record(not _should_retry(e, retry_on))
+            raise
+        window.record(True)
+        return result
+    return attempt
+
+
+def _retry_after_failure(
+    func: Callable,
+    args: Tuple,
+    kwargs: Dict[str, Any],
+    error: Exception,
+    max_attempts: int,
+    min_wait: float,
+    max_wait: float,
+    multiplier: float,
+    retry_on: RetryOn,
+    jitter: Jitter,
+    deadline_at: Optional[float] = None
+) -> Any:
+    """
+    Back off and retry after the first attempt failed with ``error``; the slow path of _call_with_retries.
+
+    Gives up early, raising the last error, if the next wait would end
+    after ``deadline_at`` (a time.monotonic() value).
+    """
+    for attempt in range(1, max_attempts + 1):
+        if attempt == max_attempts or not _should_retry(error, retry_on):
+            _stats.record_call(False)
+            raise error
+        delay = _server_requested_delay(error, max_wait)
+        if delay is None:
+            delay = _backoff_delay(attempt, min_wait, max_wait, multiplier, jitter)
+        if deadline_at is not None and time.monotonic() + delay > deadline_at:
+            logger.warning("Giving up on %s: waiting %.2f seconds would pass its deadline", _func_name(func), delay)
+            _stats.record_call(False)
+            raise error
+        logger.warning("Retrying %s in %.2f seconds after attempt %d failed: %s", _func_name(func), delay, attempt, error)
+        _stats.record_retry(delay)
+        time.sleep(delay)
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            error = e
+
+
+def _call_with_retries(
+    func: Callable,
+    args: Tuple,
+    kwargs: Dict[str, Any],
+    max_attempts: int,
+    min_wait: float,
+    max_wait: float,
+    multiplier: float,
+    retry_on: RetryOn,
+    jitter: Jitter,
+    deadline_seconds: Optional[float] = None
+) -> Any:
+    """
+    Call func, retrying failures with backoff; shared by the retry decorator and retry_api_call.
+
+    The first attempt is a plain call, so a call that succeeds first time
+    computes no backoff and enters no retry loop.
+    """
+    deadline_at = None if deadline_seconds is None else time.monotonic() + deadline_seconds
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        result = _retry_after_failure(
+            func, args, kwargs, e, max_attempts, min_wait, max_wait, multiplier, retry_on, jitter, deadline_at
+        )
+    _stats.record_call(True)
+    return result
+
+
+async def _aretry_after_failure(
+    func: Callable[..., Awaitable[Any]],
+    args: Tuple,
+    kwargs: Dict[str, Any],
+    error: Exception,
+    max_attempts: int,
+    min_wait: float,
+    max_wait: float,
+    multiplier: float,
+    retry_on: RetryOn,
+    jitter: Jitter,
+    deadline_at: Optional[float] = None
+) -> Any:
+    """Async counterpart of _retry_after_failure; waits with asyncio.sleep."""
+    for attempt in range(1, max_attempts + 1):
+        if attempt == max_attempts or not _should_retry(error, retry_on):
+            _stats.record_call(False)
+            raise error
+        delay = _server_requested_delay(error, max_wait)
+        if delay is None:
+            delay = _backoff_delay(attempt, min_wait, max_wait, multiplier, jitter)
+        if deadline_at is not None and time.monotonic() + delay > deadline_at:
+            logger.warning("Giving up on %s: waiting %.2f seconds would pass its deadline", _func_name(func), delay)
+            _stats.record_call(False)
+            raise error
+        logger.warning("Retrying %s in %.2f seconds after attempt %d failed: %s", _func_name(func), delay, attempt, error)
+        _stats.record_retry(delay)
+        await asyncio.sleep(delay)
+        try:
+            return await func(*args, **kwargs)
+        except Exception as e:
+            error = e
+
+
+async def _acall_with_retries(
+    func: Callable[..., Awaitable[Any]],
+    args: Tuple,
+    kwargs: Dict[str, Any],
+    max_attempts: int,
+    min_wait: float,
+    max_wait: float,
+    multiplier: float,
+    retry_on: RetryOn,
+    jitter: Jitter,
+    deadline_seconds: Optional[float] = None
+) -> Any:
+    """Async counterpart of _call_with_retries."""
+    deadline_at = None if deadline_seconds is None else time.monotonic() + deadline_seconds
+    try:
+        result = await func(*args, **kwargs)
+    except Exception as e:
+        result = await _aretry_after_failure(
+            func, args, kwargs, e, max_attempts, min_wait, max_wait, multiplier, retry_on, jitter, deadline_at
+        )
+    _stats.record_call(True)
+    return result
+
 
 def create_retry_decorator(
     max_attempts: int = 3,
     min_wait: int = 2,
     max_wait: int = 10,
-    multiplier: int = 2
-):
+    multiplier: int = 2,
+    retry_on: RetryOn = Exception,
+    jitter: Jitter = "full",
+    deadline_seconds: Optional[float] = None
+) -> Callable[[Callable], Callable]:
     """
     Create a retry decorator with exponential backoff for API operations.
 
+    Coroutine functions get an async wrapper that waits with asyncio.sleep,
+    so backing off does not block the event loop.
+
     Args:
         max_attempts: Maximum number of retry attempts
-        min_wait: Minimum wait time in seconds
+        min_wait: Wait cap after the first failure in seconds
         max_wait: Maximum wait time in seconds
         multiplier: Multiplier for exponential backoff
+        retry_on: Exception types to retry, or a predicate returning True for
+            retryable exceptions (default: retry every exception)
+        jitter: How to randomize each wait ("full", "equal", or "none")
+        deadline_seconds: Wall-clock budget for a call in seconds; no retry
+            is started whose wait would end after it (no limit if None)
 
     Returns:
         Retry decorator configured with specified parameters
 
+    Raises:
+        ValueError: If max_attempts is less than 1
+
     Example:
         >>> @create_retry_decorator(max_attempts=3)
         >>> def my_api_call():
         >>>     return client.invoke(prompt)
     """
-    return retry(
-        stop=stop_after_attempt(max_attempts),
-        wait=wait_exponential(multiplier=multiplier, min=min_wait, max=max_wait),
-        retry=retry_if_exception_type((
-            Exception,  # Retry on all exceptions for now
-        )),
-        before_sleep=before_sleep_log(logger, logging.WARNING),
-        reraise=True
-    )
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be at least 1")
+
+    def decorator(func: Callable) -> Callable:
+        # The first attempt is inlined; the retry loop only runs after a failure
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                deadline_at = None if deadline_seconds is None else time.monotonic() + deadline_seconds
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    result = await _aretry_after_failure(
+                        func, args, kwargs, e, max_attempts, min_wait, max_wait, multiplier, retry_on, jitter,
+                        deadline_at
+                    )
+                _stats.record_call(True)
+                return result
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            deadline_at = None if deadline_seconds is None else time.monotonic() + deadline_seconds
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                result = _retry_after_failure(
+                    func, args, kwargs, e, max_attempts, min_wait, max_wait, multiplier, retry_on, jitter,
+                    deadline_at
+                )
+            _stats.record_call(True)
+            return result
+        return wrapper
+    return decorator
+
+
+def hashable_args(func: Callable, *args, **kwargs) -> Tuple:
+    """
+    Build a retry_api_call collapse_key from a function and its arguments.
+
+    Bound methods compare equal only for the same instance, so calls to two
+    clients with different models never share a key.
+
+    Args:
+        func: Function to call
+        *args: Positional arguments for the function (must be hashable)
+        **kwargs: Keyword arguments for the function (values must be hashable)
+
+    Returns:
+        Hashable key, independent of keyword argument order
+
+    Example:
+        >>> hashable_args(ollama_model.invoke, prompt) == hashable_args(ollama_model.invoke, prompt)
+        True
+    """
+    return (func, args, tuple(sorted(kwargs.items())))
 
 
 def retry_api_call(
@@ -60,62 +749,309 @@ def retry_api_call(
     max_attempts: int = 3,
     min_wait: int = 2,
     max_wait: int = 10,
+    retry_on: RetryOn = Exception,
+    jitter: Jitter = "full",
+    collapse_key: Optional[Hashable] = None,
+    per_attempt_timeout: Optional[float] = None,
+    adaptive_attempts: bool = False,
+    deadline_seconds: Optional[float] = None,
+    cache_ttl: Optional[float] = None,
+    cache_key: Optional[Hashable] = None,
     **kwargs
 ) -> Any:
     """
     Execute an API call with automatic retry logic.
 
-    Uses exponential backoff strategy to handle temporary issues:
+    Uses exponential backoff strategy to handle temporary issues (the wait
+    caps below are randomized according to ``jitter``):
     - Attempt 1: Immediate
-    - Attempt 2: Wait min_wait seconds
-    - Attempt 3: Wait min_wait * multiplier seconds
+    - Attempt 2: Wait up to min_wait seconds
+    - Attempt 3: Wait up to min_wait * 2 seconds
     - Maximum wait: max_wait seconds
 
+    Calls share a circuit breaker per function (by ``__qualname__``): after
+    5 consecutive calls exhaust their retries, calls fail fast with
+    ServiceUnavailable for 30 seconds before a single probe is let through.
+
+    With a ``collapse_key``, identical calls that arrive while one is in
+    flight wait for it and share its result (the same object) or exception
+    instead of calling the backend again.
+
+    With a ``per_attempt_timeout``, an attempt that hangs (e.g. a server
+    that accepted the connection but never answers) fails with
+    TimeoutError, which is retried and counts towards the circuit breaker
+    like any transient error, so a call takes at most roughly
+    max_attempts * per_attempt_timeout plus the waits.
+
+    With ``deadline_seconds``, the call also stops retrying once the next
+    wait would end more than deadline_seconds (by time.monotonic()) after
+    the first attempt started, raising the last error, so the caller's
+    wall-clock budget holds however fast or slow individual attempts are.
+
+    With ``adaptive_attempts``, max_attempts becomes a ceiling: once func
+    has a history of recent attempts, a healthy backend (over 99% of
+    attempts succeeding) gets a single attempt, a mostly healthy one (over
+    70%) up to 3, and a degraded one the full max_attempts.
+
+    With a ``cache_ttl``, a successful result is remembered and returned for
+    identical calls during the next ``cache_ttl`` seconds without calling
+    the backend; failures are never cached.
+
     Args:
         func: Function to call
         *args: Positional arguments for the function
         max_attempts: Maximum number of retry attempts
         min_wait: Minimum wait time between retries (seconds)
         max_wait: Maximum wait time between retries (seconds)
+        retry_on: Exception types to retry, or a predicate returning True for
+            retryable exceptions (default: retry every exception)
+        jitter: How to randomize each wait ("full", "equal", or "none")
+        collapse_key: Key identifying identical calls (e.g. from hashable_args);
+            concurrent calls are not collapsed if None
+        per_attempt_timeout: Seconds after which an attempt that has not
+            returned fails with TimeoutError (no limit if None)
+        adaptive_attempts: Scale the attempts between 1 and max_attempts by
+            func's recent attempt success rate
+        deadline_seconds: Wall-clock budget for the call in seconds; no retry
+            is started whose wait would end after it (no limit if None)
+        cache_ttl: Seconds a successful result is reused for identical calls
+            (results are not cached if None)
+        cache_key: Key identifying identical calls for the result cache
+            (uses hashable_args(func, *args, **kwargs) if None)
         **kwargs: Keyword arguments for the function
 
     Returns:
         Result of the function call
 
     Raises:
-        Exception: If function fails after all retries
+        ValueError: If max_attempts is less than 1
+        ServiceUnavailable: If func's circuit breaker is open
+        Exception: If function fails after all retries, or with a non-retryable error
 
     Example:
         >>> result = retry_api_call(
         >>>     ollama_model.invoke,
         >>>     prompt,
+        >>>     max_attempts=3,
+        >>>     collapse_key=hashable_args(ollama_model.invoke, prompt)
+        >>> )
+    """
+    if cache_ttl is not None:
+        if cache_key is None:
+            cache_key = hashable_args(func, *args, **kwargs)
+        cached = _fresh_response(cache_key, cache_ttl)
+        if cached is not None:
+            return cached[0]
+        result = retry_api_call(
+            func, *args, max_attempts=max_attempts, min_wait=min_wait, max_wait=max_wait, retry_on=retry_on,
+            jitter=jitter, collapse_key=collapse_key, per_attempt_timeout=per_attempt_timeout,
+            adaptive_attempts=adaptive_attempts, deadline_seconds=deadline_seconds, **kwargs
+        )
+        _response_cache.set(cache_key, (time.monotonic(), result))
+        return result
+
+    if collapse_key is not None:
+        with _inflight_lock:
+            future = _inflight.get(collapse_key)
+            leader = future is None
+            if leader:
+                future = _inflight[collapse_key] = concurrent.futures.Future()
+        if not leader:
+            logger.info("Joining in-flight API call: %s", _func_name(func))
+            return future.result()
+
+        try:
+            future.set_result(retry_api_call(
+                func, *args, max_attempts=max_attempts, min_wait=min_wait, max_wait=max_wait,
+                retry_on=retry_on, jitter=jitter, per_attempt_timeout=per_attempt_timeout,
+                adaptive_attempts=adaptive_attempts, deadline_seconds=deadline_seconds, **kwargs
+            ))
+        except Exception as e:
+            future.set_exception(e)
+        except BaseException:
+            # Interrupted leader (e.g. KeyboardInterrupt): waiting callers get CancelledError
+            future.cancel()
+            raise
+        finally:
+            with _inflight_lock:
+                del _inflight[collapse_key]
+        return future.result()
+
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be at least 1")
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Executing API call with retry protection: %s", _func_name(func))
+
+    breaker = _breaker_for(func)
+    _check_breaker(breaker, func)
+    attempt = func if per_attempt_timeout is None else _with_attempt_timeout(func, per_attempt_timeout)
+    if adaptive_attempts:
+        window = _attempt_window_for(func)
+        max_attempts = window.max_attempts(max_attempts)
+        attempt = _with_attempt_tracking(attempt, window, retry_on)
+    try:
+        # Run the retry loop directly instead of building a decorator per call
+        result = _call_with_retries(
+            attempt, args, kwargs, max_attempts, min_wait, max_wait, 2, retry_on, jitter, deadline_seconds
+        )
+        _record_outcome(breaker, None, retry_on)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("API call successful: %s", _func_name(func))
+        return result
+    except Exception as e:
+        _record_outcome(breaker, e, retry_on)
+        logger.error("API call failed: %s", e)
+        raise
+    except BaseException:
+        # Interrupted (e.g. KeyboardInterrupt): no outcome, but free a half-open probe slot
+        if breaker is not None:
+            breaker.release_probe()
+        raise
+
+
+async def aretry_api_call(
+    func: Callable[..., Awaitable[Any]],
+    *args,
+    max_attempts: int = 3,
+    min_wait: int = 2,
+    max_wait: int = 10,
+    retry_on: RetryOn = Exception,
+    jitter: Jitter = "full",
+    collapse_key: Optional[Hashable] = None,
+    per_attempt_timeout: Optional[float] = None,
+    adaptive_attempts: bool = False,
+    deadline_seconds: Optional[float] = None,
+    cache_ttl: Optional[float] = None,
+    cache_key: Optional[Hashable] = None,
+    **kwargs
+) -> Any:
+    """
+    Await an async API call with automatic retry logic.
+
+    Async counterpart of retry_api_call using the same exponential backoff
+    strategy, circuit breakers, request collapsing and result cache. Waits
+    between attempts use asyncio.sleep, so other coroutines keep running on
+    the event loop while a call is backing off. Calls are only collapsed with
+    identical calls on the same event loop.
+
+    Args:
+        func: Coroutine function to call
+        *args: Positional arguments for the function
+        max_attempts: Maximum number of retry attempts
+        min_wait: Minimum wait time between retries (seconds)
+        max_wait: Maximum wait time between retries (seconds)
+        retry_on: Exception types to retry, or a predicate returning True for
+            retryable exceptions (default: retry every exception)
+        jitter: How to randomize each wait ("full", "equal", or "none")
+        collapse_key: Key identifying identical calls (e.g. from hashable_args);
+            concurrent calls are not collapsed if None
+        per_attempt_timeout: Seconds after which an attempt that has not
+            returned fails with TimeoutError (no limit if None)
+        adaptive_attempts: Scale the attempts between 1 and max_attempts by
+            func's recent attempt success rate
+        deadline_seconds: Wall-clock budget for the call in seconds; no retry
+            is started whose wait would end after it (no limit if None)
+        cache_ttl: Seconds a successful result is reused for identical calls
+            (results are not cached if None)
+        cache_key: Key identifying identical calls for the result cache
+            (uses hashable_args(func, *args, **kwargs) if None)
+        **kwargs: Keyword arguments for the function
+
+    Returns:
+        Result of the awaited function call
+
+    Raises:
+        ValueError: If max_attempts is less than 1
+        ServiceUnavailable: If func's circuit breaker is open
+        Exception: If function fails after all retries, or with a non-retryable error
+
+    Example:
+        >>> result = await aretry_api_call(
+        >>>     ollama_model.ainvoke,
+        >>>     prompt,
         >>>     max_attempts=3
         >>> )
     """
-    logger.info(f"Executing API call with retry protection: {func.__name__}")
+    if cache_ttl is not None:
+        if cache_key is None:
+            cache_key = hashable_args(func, *args, **kwargs)
+        cached = _fresh_response(cache_key, cache_ttl)
+        if cached is not None:
+            return cached[0]
+        result = await aretry_api_call(
+            func, *args, max_attempts=max_attempts, min_wait=min_wait, max_wait=max_wait, retry_on=retry_on,
+            jitter=jitter, collapse_key=collapse_key, per_attempt_timeout=per_attempt_timeout,
+            adaptive_attempts=adaptive_attempts, deadline_seconds=deadline_seconds, **kwargs
+        )
+        _response_cache.set(cache_key, (time.monotonic(), result))
+        return result
+
+    if collapse_key is not None:
+        key = (asyncio.get_running_loop(), collapse_key)
+        with _inflight_lock:
+            future = _ainflight.get(key)
+            leader = future is None
+            if leader:
+                future = _ainflight[key] = asyncio.get_running_loop().create_future()
+        if not leader:
+            logger.info("Joining in-flight async API call: %s", _func_name(func))
+            # Shielded so a cancelled waiter does not cancel the shared call
+            return await asyncio.shield(future)
 
-    decorator = create_retry_decorator(
-        max_attempts=max_attempts,
-        min_wait=min_wait,
-        max_wait=max_wait
-    )
+        try:
+            future.set_result(await aretry_api_call(
+                func, *args, max_attempts=max_attempts, min_wait=min_wait, max_wait=max_wait,
+                retry_on=retry_on, jitter=jitter, per_attempt_timeout=per_attempt_timeout,
+                adaptive_attempts=adaptive_attempts, deadline_seconds=deadline_seconds, **kwargs
+            ))
+        except Exception as e:
+            future.set_exception(e)
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            with _inflight_lock:
+                del _ainflight[key]
+        return future.result()
 
-    @decorator
-    def wrapped_func():
-        return func(*args, **kwargs)
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be at least 1")
 
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Executing async API call with retry protection: %s", _func_name(func))
+
+    breaker = _breaker_for(func)
+    _check_breaker(breaker, func)
+    attempt = func if per_attempt_timeout is None else _awith_attempt_timeout(func, per_attempt_timeout)
+    if adaptive_attempts:
+        window = _attempt_window_for(func)
+        max_attempts = window.max_attempts(max_attempts)
+        attempt = _awith_attempt_tracking(attempt, window, retry_on)
     try:
-        result = wrapped_func()
-        logger.info(f"API call successful: {func.__name__}")
+        result = await _acall_with_retries(
+            attempt, args, kwargs, max_attempts, min_wait, max_wait, 2, retry_on, jitter, deadline_seconds
+        )
+        _record_outcome(breaker, None, retry_on)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Async API call successful: %s", _func_name(func))
         return result
     except Exception as e:
-        logger.error(f"API call failed after {max_attempts} attempts: {str(e)}")
+        _record_outcome(breaker, e, retry_on)
+        logger.error("Async API call failed: %s", e)
+        raise
+    except BaseException:
+        # Cancelled (e.g. the Gradio event was cancelled): no outcome, but free a half-open probe slot
+        if breaker is not None:
+            breaker.release_probe()
         raise
 
 
 def safe_api_call(
     func: Callable,
     *args,
+    cache_key: Optional[Hashable] = None,
+    cache_ttl: float = 60.0,
     fallback_value: Any = None,
     log_errors: bool = True,
     **kwargs
@@ -124,32 +1060,54 @@ def safe_api_call(
     Safely call an API function with error handling and optional fallback.
 
     Wraps API calls to catch and log exceptions, returning a fallback value
-    instead of crashing the application.
+    instead of crashing the application. With a ``cache_key``, successful
+    results are remembered, and a failing call returns the last good result
+    for that key if it is younger than ``cache_ttl`` seconds.
 
     Args:
         func: The function to call
         *args: Positional arguments for the function
-        fallback_value: Value to return if the function fails
-        log_errors: Whether to log errors (default: True)
+        cache_key: Key under which to remember successful results (no
+            stale fallback if None)
+        cache_ttl: Maximum age in seconds of a remembered result returned on error
+        fallback_value: Value to return if the function fails and no
+            remembered result is available
+        log_errors: Whether to log errors (default: True); the traceback is
+            included only when DEBUG logging is enabled
         **kwargs: Keyword arguments for the function
 
     Returns:
-        Result of the function call, or fallback_value on error
+        Result of the function call, or the last good result / fallback_value on error
 
     Example:
         >>> result = safe_api_call(
         >>>     ollama_model.invoke,
         >>>     prompt,
+        >>>     cache_key=prompt,
         >>>     fallback_value={"error": "Service unavailable"}
         >>> )
     """
     try:
-        return func(*args, **kwargs)
+        result = func(*args, **kwargs)
     except Exception as e:
         if log_errors:
-            logger.error(f"API call failed: {str(e)}", exc_info=True)
+            # Formatting the traceback is costly during a failure storm, so it
+            # is only attached when debugging
+            logger.error("API call failed: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+        if cache_key is not None:
+            cached = _stale_results.get(cache_key)
+            if cached is not None:
+                stored_at, stale_result = cached
+                age = time.monotonic() - stored_at
+                if age <= cache_ttl:
+                    logger.warning("Returning stale response, age=%.1fs", age)
+                    return stale_result
         return fallback_value
 
+    if cache_key is not None:
+        _stale_results.set(cache_key, (time.monotonic(), result))
+    return result
+
 
 # Pre-configured retry decorator with standard settings
 # Use this for most API calls